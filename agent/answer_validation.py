@@ -1,16 +1,12 @@
 # agent/answer_validation.py
 
-import json
 from typing import Dict, Optional
-from agent.llm_vertex import llm_generate
+from agent.llm_vertex import llm_generate_json
 
 
-def validate_answer(expected_field: str, user_message: str) -> Dict[str, Optional[float]]:
-    system_prompt = f"""
+ANSWER_VALIDATION_SYSTEM_PROMPT = """
 You are validating whether a user message answers a specific question.
 
-Expected field: {expected_field}
-
 Rules:
 - Respond ONLY in valid JSON.
 - Do NOT guess.
@@ -18,26 +14,34 @@ Rules:
 - If it answers, extract and normalize the value.
 
 JSON format:
-{{
+{
   "is_answer": false,
   "value": null
-}}
+}
 """
 
+ANSWER_VALIDATION_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "is_answer": {"type": "boolean"},
+        "value": {"type": "number", "nullable": True},
+    },
+    "required": ["is_answer", "value"],
+}
+
+
+def validate_answer(expected_field: str, user_message: str) -> Dict[str, Optional[float]]:
+    # the expected field varies per turn, so it travels with the user message
     prompt = f"""
-{system_prompt}
+Expected field: {expected_field}
 
 User message:
 "{user_message}"
 """
 
-    try:
-        raw = llm_generate(prompt)
-        data = json.loads(raw)
-    except Exception:
-        return {"is_answer": False, "value": None}
-
-    if not data.get("is_answer"):
+    data = llm_generate_json(prompt, ANSWER_VALIDATION_RESPONSE_SCHEMA, call_site="answer_validation",
+                             system_instruction=ANSWER_VALIDATION_SYSTEM_PROMPT)
+    if data is None or not data.get("is_answer"):
         return {"is_answer": False, "value": None}
 
     value = data.get("value")
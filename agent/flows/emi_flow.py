@@ -6,13 +6,21 @@ from agent.state import ConversationState
 from agent.slot_extraction.emi_slot_extraction import extract_emi_slots
 from agent.answer_validation import validate_answer
 
-from tools.emi import emi_tool
+from tools.emi import emi_tool, emi_sweep, MAX_RATE_PCT, MAX_TENURE_MONTHS
 
 import re
 
 # Order matters — this defines the question sequence
 REQUIRED_SLOTS = ["principal", "rate", "tenure_months"]
 
+# Scenario sweep ("8.5% vs 9% over 15/20/25 years")
+MAX_SWEEP_VALUES = 10
+# Grouped numbers ("5,00,000", "1,500,000") are one value, never a list
+_NUM = r"\d{1,2}(?:,\d{2})+,\d{3}(?!\d)|\d{1,3}(?:,\d{3})+(?!\d)|\d+(?:\.\d+)?"
+_SWEEP_ITEM = re.compile(rf"({_NUM})\s*(%|percent|years?|yrs?|months?)?(?![a-z0-9])")
+_SWEEP_SEP = re.compile(r"\s*(?:,|/|vs\.?|versus|or|and|to|-)\s*")
+_SWEEP_STEP = re.compile(rf"\s*,?\s*(?:in\s+)?(?:steps?|increments?)\s+(?:of\s+)?({_NUM})")
+
 
 
 def handle_emi_turn(
@@ -40,6 +48,13 @@ def handle_emi_turn(
         if value is not None:
             state.slots[field] = value
 
+    # Several rates / tenures in one message → compare them all at once
+    sweep = _parse_sweep(user_message)
+    if sweep:
+        state.slots["sweep"] = sweep
+        if state.awaiting_field in ("rate", "tenure_months"):
+            state.awaiting_field = None
+
     # -------------------------------------------------
     # 2. If awaiting a field → validate answer
     # -------------------------------------------------
@@ -89,7 +104,12 @@ def handle_emi_turn(
     # -------------------------------------------------
     # 3. Check for missing slots
     # -------------------------------------------------
+    sweep = state.slots.get("sweep") or {}
     for field in REQUIRED_SLOTS:
+        if field == "rate" and sweep.get("rates"):
+            continue
+        if field == "tenure_months" and sweep.get("tenures_months"):
+            continue
         if field not in state.slots:
             state.awaiting_field = field
             return {
@@ -98,6 +118,24 @@ def handle_emi_turn(
                 "interrupt": False
             }
 
+    # -------------------------------------------------
+    # 4a. Sweep requested → EMI grid in one shot
+    # -------------------------------------------------
+    if sweep:
+        del state.slots["sweep"]
+        result = emi_sweep(
+            principal=state.slots["principal"],
+            rates=sweep.get("rates") or [state.slots["rate"]],
+            tenures_months=sweep.get("tenures_months") or [state.slots["tenure_months"]],
+        )
+        state.awaiting_field = None
+
+        return {
+            "response": _format_sweep_result(result),
+            "tool_output": result,
+            "interrupt": False
+        }
+
     # -------------------------------------------------
     # 4. All slots present → run EMI tool
     # -------------------------------------------------
@@ -164,6 +202,126 @@ def _format_emi_result(result: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
+def _format_sweep_result(result: Dict[str, Any]) -> str:
+    if "error" in result:
+        return f"Error: {result['error']}"
+
+    rates = result["rates"]
+    tenures = result["tenures_months"]
+    cells = {(row["tenure_months"], row["rate"]): row for row in result["grid"]}
+
+    def table(title, key, fmt):
+        lines = [title, "Tenure  " + "".join(f"{r:>15g}%" for r in rates)]
+        for tenure in tenures:
+            label = f"{tenure // 12} yrs" if tenure % 12 == 0 else f"{tenure} mo"
+            values = ["₹" + format(cells[(tenure, r)][key], fmt) for r in rates]
+            lines.append(f"{label:<8}" + "".join(f"{v:>16}" for v in values))
+        return lines
+
+    lines = [f"EMI comparison for a loan of ₹{result['principal']}:\n"]
+    lines += table("Monthly EMI", "emi", ",.2f")
+    lines.append("")
+    lines += table("Total Interest", "total_interest", ",.0f")
+
+    return "\n".join(lines)
+
+
+def _parse_sweep(text: str):
+    """
+    Detect several rates and/or tenures in one message.
+    Supports lists ("8.5% vs 9%", "15/20/25 years", "8.5, 9 and 9.5%")
+    and ranges with a stated step ("8 to 10% in steps of 0.5",
+    "10-20 years step 5").
+
+    A list only joins values of one unit: a separator never crosses a
+    unit token ("9%, 20 years" is a rate and a tenure), and unit-less
+    items take the unit that closes the list only when they are plausible
+    values of it ("1500000, 9.5%" is a principal and a rate).
+
+    Returns {"rates": [...], "tenures_months": [...]} or None when the
+    message does not list more than one value for any dimension.
+    """
+    text = text.lower()
+    rates, tenures = [], []
+    is_sweep = False
+
+    for values, unit, joiner, end in _sweep_lists(text):
+        is_rate = unit in ("%", "percent")
+
+        step = _SWEEP_STEP.match(text, end)
+        if len(values) == 2 and re.search(r"\bto\b|-", joiner) and step:
+            low, high = sorted(values)
+            step = _to_float(step.group(1))
+            values = []
+            while step > 0 and low <= high + 1e-9 and len(values) < MAX_SWEEP_VALUES:
+                values.append(round(low, 2))
+                low += step
+
+        if is_rate:
+            values = [v for v in values if 0 < v <= MAX_RATE_PCT]
+            rates += values
+        else:
+            months = [int(v * 12) if unit.startswith(("year", "yr")) else int(v) for v in values]
+            values = [m for m in months if 0 < m <= MAX_TENURE_MONTHS]
+            tenures += values
+
+        if len(values) > 1:
+            is_sweep = True
+
+    if not is_sweep:
+        return None
+
+    sweep = {}
+    if rates:
+        sweep["rates"] = sorted(set(rates))[:MAX_SWEEP_VALUES]
+    if tenures:
+        sweep["tenures_months"] = sorted(set(tenures))[:MAX_SWEEP_VALUES]
+    return sweep
+
+
+def _sweep_lists(text: str):
+    """
+    Yield (values, unit, joiner, end) for every run of numbers that share
+    one unit. `joiner` is the text between the first two values and `end`
+    the offset just past the run.
+    """
+    items = list(_SWEEP_ITEM.finditer(text))
+    run = []
+
+    for i, item in enumerate(items):
+        run.append(item)
+        unit = item.group(2)
+        nxt = items[i + 1] if i + 1 < len(items) else None
+        joined = nxt is not None and _SWEEP_SEP.fullmatch(text, item.end(), nxt.start())
+
+        # A unit closes the run unless the next item repeats it ("8.5% vs 9%")
+        if joined and (unit is None or nxt.group(2) == unit):
+            continue
+
+        if unit is not None:
+            yield _sweep_run(run, unit, text)
+        run = []
+
+
+def _sweep_run(run, unit, text):
+    values = [_to_float(m.group(1)) for m in run]
+    is_rate = unit in ("%", "percent")
+    limit = MAX_RATE_PCT if is_rate else (
+        MAX_TENURE_MONTHS / 12 if unit.startswith(("year", "yr")) else MAX_TENURE_MONTHS
+    )
+
+    # Unit-less leading items must be plausible values of the closing unit
+    if any(m.group(2) is None and not 0 < v <= limit for m, v in zip(run, values)):
+        run, values = run[-1:], values[-1:]
+
+    joiner = text[run[0].end():run[1].start()] if len(run) > 1 else ""
+    return values, unit, joiner, run[-1].end()
+
+
+def _to_float(number: str) -> float:
+    return float(number.replace(",", ""))
+
+
 def _is_pure_number(text: str) -> bool:
     try:
         float(text.strip())
@@ -130,47 +130,32 @@ def handle_loan_turn(state: ConversationState, user_message: str) -> Dict[str, A
 
 
 # -------------------------------------------------
-# Eligibility calculation (with employment type logic)
+# Eligibility calculation (shared rule engine, EMI-capacity method)
 # -------------------------------------------------
 def _calculate_eligibility(slots: Dict[str, Any]) -> Dict[str, Any]:
-    age = slots["age"]
-    tenure = slots["tenure_years"]
-
-    if age < 21 or age > 65:
-        return {"eligible": False, "reason": "Age not eligible"}
-
-    if tenure > (65 - age):
-        return {"eligible": False, "reason": "Tenure exceeds retirement age"}
-
-    net_income = slots["monthly_income"] - slots["monthly_expenses"]
-    if net_income <= 0:
-        return {"eligible": False, "reason": "Insufficient income"}
-
-    # Employment type multiplier: salaried gets full amount, self-employed gets 85%
-    employment_type = slots.get("employment_type", "").lower()
-    if "self" in employment_type or "self-employed" in employment_type:
-        income_multiplier = 0.85  # 85% for self-employed
-    else:
-        income_multiplier = 1.0  # 100% for salaried
-
-    eligible_emi = net_income * 0.5 * income_multiplier
-
-    annual_rate = 8.75
-    monthly_rate = annual_rate / (12 * 100)
-    months = tenure * 12
-
-    principal = (
-        eligible_emi
-        * ((1 + monthly_rate) ** months - 1)
-        / (monthly_rate * (1 + monthly_rate) ** months)
+    # imported here: the rule engine loads NumPy (~100 ms), needed only once a flow completes
+    from tools.eligibility import evaluate
+
+    decision = evaluate(
+        {
+            "age": slots["age"],
+            "employment_type": slots.get("employment_type", ""),
+            "monthly_income": slots["monthly_income"],
+            "monthly_expenses": slots["monthly_expenses"],
+            "tenure_years": slots["tenure_years"],
+        },
+        method="emi_capacity",
     )
 
+    if not decision["eligible"]:
+        return {"eligible": False, "reason": decision["reason"]}
+
     return {
         "eligible": True,
-        "eligible_amount": round(principal),
-        "net_income": round(net_income),
-        "eligible_emi": round(eligible_emi),
-        "tenure_years": tenure,
+        "eligible_amount": round(decision["eligible_amount"]),
+        "net_income": round(decision["net_income"]),
+        "eligible_emi": round(decision["eligible_emi"]),
+        "tenure_years": slots["tenure_years"],
         "employment_type": slots["employment_type"],
     }
 
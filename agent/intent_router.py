@@ -1,8 +1,7 @@
 # agent/intent_router.py
 
-import json
 from typing import Literal
-from agent.llm_vertex import llm_generate
+from agent.llm_vertex import llm_generate_json
 from agent.state import ConversationState
 
 RouterDecision = Literal[
@@ -13,8 +12,7 @@ RouterDecision = Literal[
 ]
 
 
-def route_intent(state: ConversationState, user_message: str) -> RouterDecision:
-    system_prompt = """
+ROUTER_SYSTEM_PROMPT = """
 You are an intent routing engine for a banking chatbot.
 
 Decide ONE action:
@@ -31,32 +29,23 @@ Return ONLY JSON:
 { "action": "START_EMI | START_LOAN | USE_RAG" }
 """
 
-    prompt = f"""
-{system_prompt}
+ROUTER_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "action": {"type": "string", "enum": ["START_EMI", "START_LOAN", "USE_RAG"]},
+    },
+    "required": ["action"],
+}
+
 
+def route_intent(state: ConversationState, user_message: str) -> RouterDecision:
+    prompt = f"""
 User message:
 "{user_message}"
 """
 
-    try:
-        raw = llm_generate(prompt)
-
-        # 🔒 Robust JSON extraction (THIS IS THE FIX)
-        start = raw.find("{")
-        end = raw.rfind("}")
-
-        if start == -1 or end == -1:
-            raise ValueError("No JSON found")
-
-        data = json.loads(raw[start:end + 1])
-
-        action = data.get("action")
-
-        if action in ("START_EMI", "START_LOAN", "USE_RAG"):
-            return action
-
-        raise ValueError("Invalid action")
-
-    except Exception as e:
-        print("[INTENT ROUTER ERROR]", raw)
-        return "USE_RAG"
\ No newline at end of file
+    data = llm_generate_json(prompt, ROUTER_RESPONSE_SCHEMA, call_site="intent_router",
+                             system_instruction=ROUTER_SYSTEM_PROMPT)
+    if data is None or data["action"] is None:
+        return "USE_RAG"
+    return data["action"]
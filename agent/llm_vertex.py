@@ -1,11 +1,21 @@
 # agent/llm_vertex.py
 
-import vertexai
-from vertexai.generative_models import GenerativeModel
+import inspect
+import json
 import os
+import re
+import threading
+import time
+
+from agent.telemetry import describe, inc, span
+
+# The Vertex AI SDK takes seconds to import: it is loaded on first use,
+# so benchmarks / offline replays with a stub backend never pay for it.
 
 # Initialize Vertex AI ONCE
 def init_vertex():
+    import vertexai
+
     project = os.getenv("GCP_PROJECT_ID")
     region = os.getenv("GCP_REGION")
 
@@ -19,15 +29,322 @@ def init_vertex():
 MODEL_NAME = "gemini-2.5-flash"
 _model = None
 
+# Static instructions are sent as a system instruction, separately from the
+# per-turn prompt, so every call site sends an identical prefix. Gemini
+# caches repeated prefixes implicitly; with LLM_CONTEXT_CACHE=1 instructions
+# of at least CONTEXT_CACHE_MIN_TOKENS are also stored as explicit Vertex AI
+# cached content (billed at the cached-token rate, never re-processed).
+LLM_CONTEXT_CACHE = os.getenv("LLM_CONTEXT_CACHE", "0") == "1"
+CONTEXT_CACHE_MIN_TOKENS = 1024      # smallest cached content Vertex accepts for this model
+CONTEXT_CACHE_TTL_S = int(os.getenv("LLM_CONTEXT_CACHE_TTL_S", "3600"))
+CHARS_PER_TOKEN = 4                  # estimate used before a cache is created
+
+# system instruction -> (GenerativeModel, cache expiry or None)
+_models = {}
+_models_lock = threading.Lock()
+
+# JSON call sites (llm_generate_json) ask Gemini for schema-constrained
+# output: application/json matching the call site's response schema.
+LLM_STRUCTURED_OUTPUT = os.getenv("LLM_STRUCTURED_OUTPUT", "1") == "1"
+
+# Optional replacement for the Gemini call (benchmarks / offline runs).
+# A backend is any callable: backend(prompt: str) -> str. Backends that
+# accept `system_instruction` / `response_schema` keywords get the static
+# instructions / JSON schema separately; they may also return a response
+# object with `.text` and `.usage_metadata` (prompt_token_count,
+# cached_content_token_count), like Vertex AI does.
+_backend = None
+_backend_params = frozenset()
+
 
 def get_llm():
     global _model
     if _model is None:
+        from vertexai.generative_models import GenerativeModel
         _model = GenerativeModel(MODEL_NAME)
     return _model
 
 
-def llm_generate(prompt: str) -> str:
-    model = get_llm()
-    response = model.generate_content(prompt)
-    return response.text
+def _create_cached_model(system_instruction):
+    """Model reading `system_instruction` from Vertex AI cached content, or None."""
+    import datetime
+
+    from vertexai.preview import caching
+    from vertexai.preview.generative_models import GenerativeModel
+
+    try:
+        cached = caching.CachedContent.create(
+            model_name=MODEL_NAME,
+            system_instruction=system_instruction,
+            ttl=datetime.timedelta(seconds=CONTEXT_CACHE_TTL_S),
+        )
+    except Exception as e:
+        print("[LLM CONTEXT CACHE UNAVAILABLE]", e)
+        return None
+    return GenerativeModel.from_cached_content(cached_content=cached)
+
+
+def get_llm_for(system_instruction=None):
+    """
+    Gemini model for a system instruction (one per distinct instruction).
+    Returns (model, cache) where cache is "explicit", "system_instruction" or "none".
+    """
+    if not system_instruction:
+        return get_llm(), "none"
+
+    entry = _models.get(system_instruction)
+    if entry is None or (entry[1] is not None and time.time() >= entry[1]):
+        with _models_lock:
+            entry = _models.get(system_instruction)
+            if entry is None or (entry[1] is not None and time.time() >= entry[1]):
+                model, expires = None, None
+                if LLM_CONTEXT_CACHE and len(system_instruction) // CHARS_PER_TOKEN >= CONTEXT_CACHE_MIN_TOKENS:
+                    model = _create_cached_model(system_instruction)
+                    # recreate shortly before Vertex drops the cached content
+                    expires = time.time() + 0.9 * CONTEXT_CACHE_TTL_S if model is not None else None
+                if model is None:
+                    from vertexai.generative_models import GenerativeModel
+                    model = GenerativeModel(MODEL_NAME, system_instruction=system_instruction)
+                entry = _models[system_instruction] = (model, expires)
+
+    return entry[0], "explicit" if entry[1] is not None else "system_instruction"
+
+
+def set_llm_backend(backend):
+    """
+    Route every llm_generate call to `backend` instead of Gemini.
+    Pass None to restore the Vertex AI model.
+    """
+    global _backend, _backend_params
+    _backend = backend
+    _backend_params = frozenset()
+    if backend is not None:
+        try:
+            _backend_params = frozenset(inspect.signature(backend).parameters)
+        except (TypeError, ValueError):
+            pass
+
+
+def get_llm_backend():
+    """The replacement backend, or None when Gemini is used."""
+    return _backend
+
+
+# LLM calls made by each thread (per-turn accounting in replays)
+_thread_calls = threading.local()
+
+
+def thread_llm_calls() -> int:
+    """Number of llm_generate calls made so far by the current thread."""
+    return getattr(_thread_calls, "count", 0)
+
+
+describe("llm_calls_total", "LLM calls per call site")
+describe("llm_prompt_chars_total", "Prompt characters sent per call site (system instruction included)")
+describe("llm_system_instruction_chars_total", "Static system instruction characters sent per call site")
+describe("llm_response_chars_total", "Response characters received per call site")
+describe("llm_input_tokens_total", "Input tokens billed per call site (as reported by the backend)")
+describe("llm_cached_input_tokens_total", "Input tokens served from the prompt cache per call site")
+describe("llm_json_parse_total", "JSON calls per call site by outcome (ok, repaired, partial, failed, error)")
+describe("llm_json_invalid_fields_total", "JSON reply fields missing or not matching the schema, per call site and field")
+
+
+def _call_backend(prompt, system_instruction, response_schema):
+    kwargs, cache = {}, "none"
+    if system_instruction and "system_instruction" not in _backend_params:
+        prompt = f"{system_instruction}\n{prompt}"
+    elif system_instruction:
+        kwargs["system_instruction"], cache = system_instruction, "system_instruction"
+    if response_schema is not None and "response_schema" in _backend_params:
+        kwargs["response_schema"] = response_schema
+    return _backend(prompt, **kwargs), cache
+
+
+def _generation_config(response_schema):
+    from vertexai.generative_models import GenerationConfig
+    return GenerationConfig(response_mime_type="application/json", response_schema=response_schema)
+
+
+def llm_generate(prompt: str, call_site: str = "unknown", system_instruction: str | None = None,
+                 response_schema: dict | None = None) -> str:
+    """
+    Generate text for `prompt`.
+    `call_site` labels the call in traces and metrics (e.g. "intent_router").
+    `system_instruction` holds the call site's static instructions (a module
+    constant): it is sent apart from the per-turn prompt so it can be cached.
+    `response_schema` (OpenAPI subset, see llm_generate_json) constrains the
+    output to JSON of that shape.
+    """
+    system_chars = len(system_instruction or "")
+    _thread_calls.count = thread_llm_calls() + 1
+    inc("llm_calls_total", call_site=call_site)
+    inc("llm_prompt_chars_total", len(prompt) + system_chars, call_site=call_site)
+    if system_chars:
+        inc("llm_system_instruction_chars_total", system_chars, call_site=call_site)
+
+    with span("llm.generate", call_site=call_site, model=MODEL_NAME,
+              prompt_chars=len(prompt), system_chars=system_chars) as s:
+        if _backend is not None:
+            response, cache = _call_backend(prompt, system_instruction, response_schema)
+        else:
+            model, cache = get_llm_for(system_instruction)
+            if response_schema is not None:
+                response = model.generate_content(prompt, generation_config=_generation_config(response_schema))
+            else:
+                response = model.generate_content(prompt)
+
+        text = response if isinstance(response, str) else response.text
+        usage = getattr(response, "usage_metadata", None)
+        s.set("cache", cache)
+        s.set("response_chars", len(text))
+        if usage is not None:
+            cached = getattr(usage, "cached_content_token_count", 0) or 0
+            inc("llm_input_tokens_total", usage.prompt_token_count, call_site=call_site)
+            inc("llm_cached_input_tokens_total", cached, call_site=call_site)
+            s.set("input_tokens", usage.prompt_token_count)
+            s.set("cached_tokens", cached)
+
+    inc("llm_response_chars_total", len(text), call_site=call_site)
+    return text
+
+
+# ---------------------------
+# Structured (JSON) output
+# ---------------------------
+_JSON_TYPES = {
+    "object": dict, "array": list, "string": str, "boolean": bool,
+    "integer": (int, float), "number": (int, float),   # 240.0 is a valid integer
+}
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.I)
+
+
+def parse_json_object(text: str):
+    """
+    (data, outcome) for a model reply that should be one JSON object.
+    outcome is "ok" (the reply is exactly JSON), "repaired" (code fences or
+    surrounding prose removed) or "failed" (data is None).
+    """
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return data, "ok"
+    except ValueError:
+        pass
+
+    text = _FENCE.sub("", text.strip())
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r"\{", text):
+        try:
+            data, _ = decoder.raw_decode(text, match.start())
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            return data, "repaired"
+    return None, "failed"
+
+
+def _canonical(text: str) -> str:
+    return re.sub(r"[\s-]+", "_", text.strip().lower())
+
+
+def coerce_value(value, schema):
+    """
+    (ok, value) for one field of a response_schema. Values are converted
+    the way the call sites did before schemas ("20" -> 20.0 for a number,
+    "Salaried" -> "salaried" for an enum); ok is False when that fails.
+    """
+    if value is None:
+        return bool(schema.get("nullable")), None
+
+    kind = schema["type"].lower()
+    if kind in ("number", "integer"):
+        if isinstance(value, bool):
+            return False, None
+        try:
+            number = float(value.replace(",", "") if isinstance(value, str) else value)
+        except (TypeError, ValueError):
+            return False, None
+        if kind == "integer":
+            if not number.is_integer():
+                return False, None
+            return True, int(number)
+        return True, number
+
+    if kind == "boolean":
+        if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+            return True, value.strip().lower() == "true"
+        return isinstance(value, bool), value if isinstance(value, bool) else None
+
+    if kind == "string":
+        if not isinstance(value, str):
+            return False, None
+        if "enum" in schema:
+            options = {_canonical(option): option for option in schema["enum"]}
+            value = options.get(_canonical(value))
+            return value is not None, value
+        return True, value
+
+    if kind == "object":
+        if not isinstance(value, dict):
+            return False, None
+        data, invalid = coerce_to_schema(value, schema)
+        return not invalid, data
+
+    if kind == "array":
+        if not isinstance(value, list):
+            return False, None
+        items = [coerce_value(item, schema["items"]) for item in value] if "items" in schema else [(True, v) for v in value]
+        return all(ok for ok, _ in items), [v for ok, v in items if ok]
+
+    return True, value
+
+
+def coerce_to_schema(data: dict, schema: dict):
+    """
+    (fields, invalid) for a parsed reply: every property of `schema`, with
+    values that do not fit it (or are missing) set to None, and the names
+    of those that did not fit. One bad field never discards the others.
+    """
+    fields, invalid = {}, []
+    for key, sub in schema.get("properties", {}).items():
+        ok, value = coerce_value(data.get(key), sub)
+        if not ok and (key in data or key in schema.get("required", ())):
+            invalid.append(key)
+        fields[key] = value if ok else None
+    return fields, invalid
+
+
+def llm_generate_json(prompt: str, response_schema: dict, call_site: str = "unknown",
+                      system_instruction: str | None = None):
+    """
+    Generate a JSON object matching `response_schema`; returns a dict with
+    every schema property (None where the reply lacks it or it does not
+    fit the schema), or None when the call fails or the reply cannot be
+    parsed at all (the caller's fallback). With LLM_STRUCTURED_OUTPUT the
+    schema is sent to the model, so replies are constrained to it;
+    otherwise fields are coerced and checked one by one here.
+
+    Schemas use the OpenAPI subset Vertex AI accepts:
+        {"type": "object", "properties": {"action": {"type": "string", "enum": [...]}},
+         "required": ["action"]}
+    """
+    try:
+        raw = llm_generate(prompt, call_site=call_site, system_instruction=system_instruction,
+                           response_schema=response_schema if LLM_STRUCTURED_OUTPUT else None)
+    except Exception as e:
+        inc("llm_json_parse_total", call_site=call_site, outcome="error")
+        print(f"[LLM ERROR] {call_site}: {e}")
+        return None
+
+    data, outcome = parse_json_object(raw)
+    if data is not None:
+        data, invalid = coerce_to_schema(data, response_schema)
+        for field in invalid:
+            inc("llm_json_invalid_fields_total", call_site=call_site, field=field)
+        if invalid:
+            outcome = "partial"
+
+    inc("llm_json_parse_total", call_site=call_site, outcome=outcome)
+    if outcome in ("failed", "partial"):
+        print(f"[LLM JSON {outcome.upper()}] {call_site}: {raw[:200]!r}")
+    return data
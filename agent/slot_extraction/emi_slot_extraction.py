@@ -1,12 +1,10 @@
 # agent/slot_extraction/emi_slot_extraction.py
 
-import json
 from typing import Dict, Optional
-from agent.llm_vertex import llm_generate
+from agent.llm_vertex import llm_generate_json
 
 
-def extract_emi_slots(user_message: str) -> Dict[str, Optional[float]]:
-    system_prompt = """
+EMI_SLOTS_SYSTEM_PROMPT = """
 You are a strict information extraction engine.
 
 Extract EMI-related values ONLY if explicitly present.
@@ -29,26 +27,26 @@ Return ONLY valid JSON:
 }
 """
 
-    prompt = f"""
-{system_prompt}
+EMI_SLOTS_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "principal": {"type": "number", "nullable": True},
+        "rate": {"type": "number", "nullable": True},
+        "tenure_months": {"type": "integer", "nullable": True},
+    },
+    "required": ["principal", "rate", "tenure_months"],
+}
 
+
+def extract_emi_slots(user_message: str) -> Dict[str, Optional[float]]:
+    prompt = f"""
 User message:
 "{user_message}"
 """
 
-    try:
-        raw = llm_generate(prompt)
-
-        # --- Extract JSON safely ---
-        start = raw.find("{")
-        end = raw.rfind("}")
-
-        if start == -1 or end == -1:
-            raise ValueError("No JSON found in LLM output")
-
-        data = json.loads(raw[start:end + 1])
-    except Exception as e:
-        print("[EMI SLOT EXTRACTION FAILED]", e)
+    data = llm_generate_json(prompt, EMI_SLOTS_RESPONSE_SCHEMA, call_site="emi_slot_extraction",
+                             system_instruction=EMI_SLOTS_SYSTEM_PROMPT)
+    if data is None:
         return {"principal": None, "rate": None, "tenure_months": None}
 
     return {
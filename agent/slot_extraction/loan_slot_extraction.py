@@ -1,26 +1,10 @@
 # agent/slot_extraction/loan_slot_extraction.py
 
-import json
 from typing import Dict, Optional
-from agent.llm_vertex import llm_generate
+from agent.llm_vertex import llm_generate_json
 
 
-def extract_loan_slots(user_message: str) -> Dict[str, Optional[object]]:
-    """
-    Extract loan-related slots if explicitly present.
-
-    Slots:
-    - loan_type: "fresh" | "balance_transfer"
-    - age: int 
-    - employment_type: "salaried" | "self_employed"
-    - monthly_income: float
-    - monthly_expenses: float
-    - tenure_years: int
-
-    Returns None for missing fields.
-    """
-
-    system_prompt = """
+LOAN_SLOTS_SYSTEM_PROMPT = """
 You are a strict information extraction engine.
 
 Extract loan-related information ONLY if explicitly present.
@@ -45,25 +29,42 @@ Return ONLY valid JSON in this format:
 }
 """
 
-    prompt = f"""
-{system_prompt}
-
-User message:
-"{user_message}"
-"""
+LOAN_SLOTS_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "loan_type": {"type": "string", "enum": ["fresh", "balance_transfer"], "nullable": True},
+        "age": {"type": "integer", "nullable": True},
+        "employment_type": {"type": "string", "enum": ["salaried", "self_employed"], "nullable": True},
+        "monthly_income": {"type": "number", "nullable": True},
+        "monthly_expenses": {"type": "number", "nullable": True},
+        "tenure_years": {"type": "integer", "nullable": True},
+    },
+    "required": ["loan_type", "age", "employment_type", "monthly_income", "monthly_expenses", "tenure_years"],
+}
 
-    try:
-        raw = llm_generate(prompt)
 
-        start = raw.find("{")
-        end = raw.rfind("}")
+def extract_loan_slots(user_message: str) -> Dict[str, Optional[object]]:
+    """
+    Extract loan-related slots if explicitly present.
 
-        if start == -1 or end == -1:
-            raise ValueError("No JSON found")
+    Slots:
+    - loan_type: "fresh" | "balance_transfer"
+    - age: int 
+    - employment_type: "salaried" | "self_employed"
+    - monthly_income: float
+    - monthly_expenses: float
+    - tenure_years: int
 
-        data = json.loads(raw[start:end + 1])
+    Returns None for missing fields.
+    """
+    prompt = f"""
+User message:
+"{user_message}"
+"""
 
-    except Exception:
+    data = llm_generate_json(prompt, LOAN_SLOTS_RESPONSE_SCHEMA, call_site="loan_slot_extraction",
+                             system_instruction=LOAN_SLOTS_SYSTEM_PROMPT)
+    if data is None:
         return {
             "loan_type": None,
             "age": None,
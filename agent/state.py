@@ -1,10 +1,196 @@
 # agent/state.py
 
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 
-@dataclass
+# Every slot any flow can fill, in a fixed order
+EMI_SLOT_FIELDS = ("principal", "rate", "tenure_months", "sweep")
+LOAN_SLOT_FIELDS = (
+    "loan_type",
+    "age",
+    "employment_type",
+    "monthly_income",
+    "monthly_expenses",
+    "tenure_years",
+)
+SLOT_FIELDS = EMI_SLOT_FIELDS + LOAN_SLOT_FIELDS
+
+# Value of a slot that has not been filled
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<missing>"
+
+    def __reduce__(self):
+        # pickle / deepcopy keep the singleton
+        return "_MISSING"
+
+
+_MISSING = _Missing()
+
+
+# Position of each slot in Slots._values / frozen snapshots
+_SLOT_INDEX = {name: i for i, name in enumerate(SLOT_FIELDS)}
+_EMPTY = (_MISSING,) * len(SLOT_FIELDS)
+
+
+class Slots:
+    """
+    Typed slot storage for EMI and loan values.
+
+    Values live in one fixed-size list (no per-session dict), read and
+    written either as typed attributes (slots.principal, None if unset)
+    or through the dict interface the flows rely on (slots[k], k in slots,
+    get, items, clear, copy, ...). A slot that was never set is absent.
+
+    Snapshots are plain tuples: freeze() and restore() are a single
+    C-level copy each, so pausing or completing a flow is cheap.
+    """
+
+    __slots__ = ("_values",)
+
+    # EMI
+    principal: Optional[float]
+    rate: Optional[float]
+    tenure_months: Optional[int]
+    sweep: Optional[Dict[str, Any]]       # {"rates": [...], "tenures_months": [...]}
+
+    # Loan
+    loan_type: Optional[str]
+    age: Optional[int]
+    employment_type: Optional[str]
+    monthly_income: Optional[float]
+    monthly_expenses: Optional[float]
+    tenure_years: Optional[int]
+
+    def __init__(self, values: Optional[Dict[str, Any]] = None):
+        self._values = list(_EMPTY)
+        if values:
+            self.update(values)
+
+    # --- dict interface ---
+    def __getitem__(self, key):
+        value = self._values[_SLOT_INDEX[key]] if key in _SLOT_INDEX else _MISSING
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in _SLOT_INDEX:
+            raise KeyError(f"Unknown slot: {key}")
+        self._values[_SLOT_INDEX[key]] = value
+
+    def __delitem__(self, key):
+        self[key]
+        self._values[_SLOT_INDEX[key]] = _MISSING
+
+    def __contains__(self, key):
+        return key in _SLOT_INDEX and self._values[_SLOT_INDEX[key]] is not _MISSING
+
+    def __iter__(self):
+        return (name for name, value in zip(SLOT_FIELDS, self._values) if value is not _MISSING)
+
+    def __len__(self):
+        return len(self._values) - self._values.count(_MISSING)
+
+    def __eq__(self, other):
+        if isinstance(other, (Slots, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Slots({dict(self.items())})"
+
+    def get(self, key, default=None):
+        value = self._values[_SLOT_INDEX[key]] if key in _SLOT_INDEX else _MISSING
+        return default if value is _MISSING else value
+
+    def pop(self, key, *default):
+        try:
+            value = self[key]
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        self._values[_SLOT_INDEX[key]] = _MISSING
+        return value
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [value for value in self._values if value is not _MISSING]
+
+    def items(self):
+        return [(name, value) for name, value in zip(SLOT_FIELDS, self._values) if value is not _MISSING]
+
+    def update(self, values):
+        for key, value in dict(values).items():
+            self[key] = value
+
+    def clear(self):
+        self._values[:] = _EMPTY
+
+    def copy(self):
+        return Slots.thaw(self._values)
+
+    # --- snapshots ---
+    def freeze(self) -> Tuple[Any, ...]:
+        """Immutable snapshot: one tuple aligned with SLOT_FIELDS."""
+        return tuple(self._values)
+
+    def restore(self, frozen: Tuple[Any, ...]):
+        """Overwrite every slot from a frozen snapshot."""
+        self._values[:] = frozen
+
+    @classmethod
+    def thaw(cls, frozen: Tuple[Any, ...]) -> "Slots":
+        slots = cls.__new__(cls)
+        slots._values = list(frozen)
+        return slots
+
+
+def _slot_property(index: int) -> property:
+    def fget(self):
+        value = self._values[index]
+        return None if value is _MISSING else value
+
+    def fset(self, value):
+        self._values[index] = value
+
+    return property(fget, fset)
+
+
+for _name, _index in _SLOT_INDEX.items():
+    setattr(Slots, _name, _slot_property(_index))
+
+
+class FlowSnapshot:
+    """
+    Read-only snapshot of a flow (paused or completed).
+    Slot values are a frozen tuple, so the snapshot can be shared and
+    kept without copying anything.
+    """
+
+    __slots__ = ("flow", "awaiting_field", "values")
+
+    def __init__(self, flow: Optional[str], awaiting_field: Optional[str], values: Tuple[Any, ...]):
+        self.flow = flow
+        self.awaiting_field = awaiting_field
+        self.values = values
+
+    @property
+    def slots(self) -> Dict[str, Any]:
+        """Slot values as a plain dict (for display / debugging)."""
+        return dict(Slots.thaw(self.values).items())
+
+    def __repr__(self):
+        return f"FlowSnapshot(flow={self.flow!r}, awaiting_field={self.awaiting_field!r}, slots={self.slots})"
+
+
+@dataclass(slots=True)
 class ConversationState:
     """
     Central state object for the chatbot.
@@ -25,15 +211,15 @@ class ConversationState:
     awaiting_field: Optional[str] = None
 
     # Collected slot values (mutable at all times)
-    slots: Dict[str, Any] = field(default_factory=dict)
+    slots: Slots = field(default_factory=Slots)
 
     # Used when user interrupts a flow
     # Stores a snapshot of the previous flow state
-    paused_flow: Optional[Dict[str, Any]] = None
+    paused_flow: Optional[FlowSnapshot] = None
 
     # Used after a flow is completed
     # Stores a snapshot of the completed flow state
-    last_completed_flow: Optional[Dict[str, Any]] = None
+    last_completed_flow: Optional[FlowSnapshot] = None
 
     def reset_flow(self):
         """
@@ -49,11 +235,9 @@ class ConversationState:
         """
         Save current flow state before interruption.
         """
-        self.paused_flow = {
-            "active_flow": self.active_flow,
-            "awaiting_field": self.awaiting_field,
-            "slots": self.slots.copy(),
-        }
+        self.paused_flow = FlowSnapshot(
+            self.active_flow, self.awaiting_field, self.slots.freeze()
+        )
         self.active_flow = None
         self.awaiting_field = None
 
@@ -64,7 +248,28 @@ class ConversationState:
         if not self.paused_flow:
             return
 
-        self.active_flow = self.paused_flow["active_flow"]
-        self.awaiting_field = self.paused_flow["awaiting_field"]
-        self.slots = self.paused_flow["slots"]
+        self.active_flow = self.paused_flow.flow
+        self.awaiting_field = self.paused_flow.awaiting_field
+        self.slots.restore(self.paused_flow.values)
         self.paused_flow = None
+
+    def complete_flow(self):
+        """
+        Remember the finished flow (for later corrections)
+        and release the conversation.
+        """
+        self.last_completed_flow = FlowSnapshot(self.active_flow, None, self.slots.freeze())
+        self.active_flow = None
+        self.awaiting_field = None
+
+    def reopen_completed_flow(self):
+        """
+        Make the last completed flow active again with its slot values,
+        e.g. when the user corrects one value after seeing the result.
+        """
+        if not self.last_completed_flow:
+            return
+
+        self.active_flow = self.last_completed_flow.flow
+        self.slots.restore(self.last_completed_flow.values)
+        self.last_completed_flow = None
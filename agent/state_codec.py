@@ -0,0 +1,298 @@
+# agent/state_codec.py
+"""
+Compact binary encoding of ConversationState
+(external session stores, checkpoints, transcript replay).
+
+Layout:
+    byte 0       schema version
+    records      tag (1 byte) | payload length (varint) | payload
+
+Records:
+    ACTIVE_FLOW, AWAITING_FIELD   value
+    SLOTS                         (slot id (1 byte) | value)*
+    PAUSED_FLOW, COMPLETED_FLOW   nested records (ACTIVE_FLOW, AWAITING_FIELD, SLOTS)
+
+Values are self-describing: type byte + payload
+(None / bool / zigzag varint int / float64 / utf-8 str / list / dict).
+
+Forward compatibility: a decoder skips record tags and slot ids it does
+not know, so fields can be added without bumping the version. The version
+only changes for incompatible layouts; older and newer ones are rejected.
+
+Tag and slot id numbers are part of the format: never reuse or renumber them.
+"""
+import struct
+
+from agent.state import SLOT_FIELDS, _MISSING, ConversationState, FlowSnapshot, Slots
+
+SCHEMA_VERSION = 1
+MIN_SCHEMA_VERSION = 1
+
+# Record tags
+TAG_ACTIVE_FLOW = 1
+TAG_AWAITING_FIELD = 2
+TAG_SLOTS = 3
+TAG_PAUSED_FLOW = 4
+TAG_COMPLETED_FLOW = 5
+
+# Slot ids on the wire (independent of the SLOT_FIELDS order)
+SLOT_IDS = {
+    "principal": 1,
+    "rate": 2,
+    "tenure_months": 3,
+    "sweep": 4,
+    "loan_type": 5,
+    "age": 6,
+    "employment_type": 7,
+    "monthly_income": 8,
+    "monthly_expenses": 9,
+    "tenure_years": 10,
+}
+
+# Value types
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT = range(8)
+
+_EMPTY_VALUES = (_MISSING,) * len(SLOT_FIELDS)
+
+_FLOAT64 = struct.Struct("<d")
+
+# slot id -> position in SLOT_FIELDS, and the reverse
+_ID_TO_INDEX = {SLOT_IDS[name]: i for i, name in enumerate(SLOT_FIELDS)}
+_INDEX_TO_ID = [SLOT_IDS[name] for name in SLOT_FIELDS]
+
+
+# ---------------------------
+# Primitives
+# ---------------------------
+def _write_uvarint(buf: bytearray, n: int):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _read_uvarint(data, pos: int):
+    byte = data[pos]
+    if byte < 0x80:  # fast path: values < 128 are one byte
+        return byte, pos + 1
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+# Strings every session repeats, pre-encoded (flows, field names, slot labels)
+_COMMON_STRINGS = ("EMI", "LOAN", "salaried", "self_employed", "fresh", "balance_transfer") + SLOT_FIELDS
+_ENCODED_STRINGS = {}
+for _text in _COMMON_STRINGS:
+    _raw = _text.encode("utf-8")
+    _ENCODED_STRINGS[_text] = bytes((_STR, len(_raw))) + _raw
+_DECODED_STRINGS = {text.encode("utf-8"): text for text in _COMMON_STRINGS}
+
+
+def _write_value(buf: bytearray, value):
+    if value.__class__ is str:
+        encoded = _ENCODED_STRINGS.get(value)
+        if encoded is not None:
+            buf += encoded
+            return
+        raw = value.encode("utf-8")
+        buf.append(_STR)
+        _write_uvarint(buf, len(raw))
+        buf += raw
+    elif value.__class__ is float:
+        buf.append(_FLOAT)
+        buf += _FLOAT64.pack(value)
+    elif value is None:
+        buf.append(_NONE)
+    elif value is True or value is False:
+        buf.append(_TRUE if value else _FALSE)
+    elif isinstance(value, int):
+        buf.append(_INT)
+        _write_uvarint(buf, (value << 1) if value >= 0 else ((-value << 1) - 1))  # zigzag
+    elif isinstance(value, float):
+        buf.append(_FLOAT)
+        buf += _FLOAT64.pack(value)
+    elif isinstance(value, str):
+        _write_value(buf, str(value))
+    elif isinstance(value, (list, tuple)):
+        buf.append(_LIST)
+        _write_uvarint(buf, len(value))
+        for item in value:
+            _write_value(buf, item)
+    elif isinstance(value, dict):
+        buf.append(_DICT)
+        _write_uvarint(buf, len(value))
+        for key, item in value.items():
+            _write_value(buf, str(key))
+            _write_value(buf, item)
+    else:
+        raise TypeError(f"Cannot encode slot value of type {type(value).__name__}")
+
+
+def _read_value(data: bytes, pos: int):
+    kind = data[pos]
+    pos += 1
+    if kind == _STR:
+        size = data[pos]
+        if size < 0x80:
+            pos += 1
+        else:
+            size, pos = _read_uvarint(data, pos)
+        end = pos + size
+        if end > len(data):
+            raise ValueError("Truncated string")
+        raw = data[pos:end]
+        text = _DECODED_STRINGS.get(raw)
+        return (raw.decode("utf-8") if text is None else text), end
+    if kind == _FLOAT:
+        return _FLOAT64.unpack_from(data, pos)[0], pos + 8
+    if kind == _INT:
+        n, pos = _read_uvarint(data, pos)
+        return (n >> 1) ^ -(n & 1), pos
+    if kind == _NONE:
+        return None, pos
+    if kind == _FALSE:
+        return False, pos
+    if kind == _TRUE:
+        return True, pos
+    if kind == _LIST:
+        count, pos = _read_uvarint(data, pos)
+        items = []
+        for _ in range(count):
+            item, pos = _read_value(data, pos)
+            items.append(item)
+        return items, pos
+    if kind == _DICT:
+        count, pos = _read_uvarint(data, pos)
+        result = {}
+        for _ in range(count):
+            key, pos = _read_value(data, pos)
+            result[key], pos = _read_value(data, pos)
+        return result, pos
+    raise ValueError(f"Unknown value type: {kind}")
+
+
+def _write_record(buf: bytearray, tag: int, payload: bytearray):
+    buf.append(tag)
+    _write_uvarint(buf, len(payload))
+    buf += payload
+
+
+# ---------------------------
+# Flow (state or snapshot)
+# ---------------------------
+def _encode_flow(buf: bytearray, flow, awaiting_field, values):
+    if flow is not None:
+        payload = bytearray()
+        _write_value(payload, flow)
+        _write_record(buf, TAG_ACTIVE_FLOW, payload)
+
+    if awaiting_field is not None:
+        payload = bytearray()
+        _write_value(payload, awaiting_field)
+        _write_record(buf, TAG_AWAITING_FIELD, payload)
+
+    payload = bytearray()
+    for slot_id, value in zip(_INDEX_TO_ID, values):
+        if value is not _MISSING:
+            payload.append(slot_id)
+            _write_value(payload, value)
+    if payload:
+        _write_record(buf, TAG_SLOTS, payload)
+
+
+def _decode_slots(data: bytes, pos: int, end: int):
+    values = [_MISSING] * len(SLOT_FIELDS)
+    while pos < end:
+        index = _ID_TO_INDEX.get(data[pos])
+        value, pos = _read_value(data, pos + 1)
+        if index is not None:  # unknown slot from a newer writer → skip
+            values[index] = value
+    return values
+
+
+def _decode_flow(data: bytes, pos: int, end: int, snapshots: dict = None):
+    """
+    Decode the records in data[pos:end].
+    Returns (flow, awaiting_field, slot values); nested snapshot records are
+    decoded into `snapshots` (tag -> FlowSnapshot) when it is given.
+    """
+    flow = awaiting_field = None
+    values = _EMPTY_VALUES
+    while pos < end:
+        tag = data[pos]
+        size = data[pos + 1]
+        if size < 0x80:
+            pos += 2
+        else:
+            size, pos = _read_uvarint(data, pos + 1)
+        stop = pos + size
+        if stop > end:
+            raise ValueError("Truncated record")
+
+        if tag == TAG_SLOTS:
+            values = _decode_slots(data, pos, stop)
+        elif tag == TAG_ACTIVE_FLOW:
+            flow = _read_value(data, pos)[0]
+        elif tag == TAG_AWAITING_FIELD:
+            awaiting_field = _read_value(data, pos)[0]
+        elif snapshots is not None and tag in (TAG_PAUSED_FLOW, TAG_COMPLETED_FLOW):
+            snapshot = _decode_flow(data, pos, stop)
+            snapshots[tag] = FlowSnapshot(snapshot[0], snapshot[1], tuple(snapshot[2]))
+        # unknown tag (newer writer) → skip
+        pos = stop
+
+    return flow, awaiting_field, values
+
+
+# ---------------------------
+# Public API
+# ---------------------------
+def encode_state(state: ConversationState) -> bytes:
+    """Serialize a ConversationState (including paused / completed flows)."""
+    buf = bytearray((SCHEMA_VERSION,))
+    _encode_flow(buf, state.active_flow, state.awaiting_field, state.slots.freeze())
+
+    for tag, snapshot in (
+        (TAG_PAUSED_FLOW, state.paused_flow),
+        (TAG_COMPLETED_FLOW, state.last_completed_flow),
+    ):
+        if snapshot is not None:
+            payload = bytearray()
+            _encode_flow(payload, snapshot.flow, snapshot.awaiting_field, snapshot.values)
+            _write_record(buf, tag, payload)
+
+    return bytes(buf)
+
+
+def decode_state(data: bytes) -> ConversationState:
+    """
+    Rebuild a ConversationState from encode_state() output.
+    Raises ValueError for empty, corrupt or unsupported data.
+    """
+    if not data:
+        raise ValueError("Empty state data")
+
+    version = data[0]
+    if not MIN_SCHEMA_VERSION <= version <= SCHEMA_VERSION:
+        # newer versions come from a newer codec: their records may not parse here
+        raise ValueError(f"Unsupported state schema version: {version}")
+
+    data = bytes(data)
+    snapshots = {}
+    try:
+        flow, awaiting_field, values = _decode_flow(data, 1, len(data), snapshots)
+        return ConversationState(
+            active_flow=flow,
+            awaiting_field=awaiting_field,
+            slots=Slots.thaw(values),
+            paused_flow=snapshots.get(TAG_PAUSED_FLOW),
+            last_completed_flow=snapshots.get(TAG_COMPLETED_FLOW),
+        )
+    except (IndexError, KeyError, TypeError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Corrupt state data: {e}") from e
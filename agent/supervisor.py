@@ -27,12 +27,7 @@ def handle_turn(state: ConversationState, user_message: str) -> dict:
         # Normal continuation
         if not result["interrupt"]:
             if result.get("tool_output"):
-                state.last_completed_flow = {
-                    "flow": "EMI",
-                    "slots": state.slots.copy()
-                }
-                state.active_flow = None
-                state.awaiting_field = None
+                state.complete_flow()
 
             return {
                 "reply": result.get("response", ""),
@@ -47,12 +42,7 @@ def handle_turn(state: ConversationState, user_message: str) -> dict:
 
         # If loan flow produced output → normal continuation
         if result.get("tool_output"):
-            state.last_completed_flow = {
-                "flow": "LOAN",
-                "slots": state.slots.copy()
-            }
-            state.active_flow = None
-            state.awaiting_field = None
+            state.complete_flow()
 
             return {
                 "reply": result.get("response", ""),
@@ -74,15 +64,13 @@ def handle_turn(state: ConversationState, user_message: str) -> dict:
     if (
         state.active_flow is None
         and state.last_completed_flow
-        and state.last_completed_flow["flow"] == "EMI"
+        and state.last_completed_flow.flow == "EMI"
     ):
         extracted = extract_emi_slots(user_message)
 
         # If user provided ANY EMI-related value
         if any(v is not None for v in extracted.values()):
-            state.active_flow = "EMI"
-            state.slots = state.last_completed_flow["slots"].copy()
-            state.last_completed_flow = None
+            state.reopen_completed_flow()
 
             result = handle_emi_turn(state, user_message)
 
@@ -117,7 +105,8 @@ def handle_turn(state: ConversationState, user_message: str) -> dict:
     # -----------------------------
     # 4. Default → RAG
     # -----------------------------
-    rag_result = rag_tool(user_message)
+    flow = state.paused_flow.flow if state.paused_flow else state.active_flow
+    rag_result = rag_tool(user_message, flow=flow)
 
     # Resume paused flow if any
     if state.paused_flow:
@@ -0,0 +1,317 @@
+# agent/telemetry.py
+"""
+Lightweight tracing and metrics for the chatbot pipeline.
+
+Spans
+    with span("rag.retrieve", k=4) as s:
+        ...
+        s.set("results", len(chunks))
+
+    Spans are only recorded when tracing is enabled (TRACING_ENABLED=1 or
+    enable_tracing()). When disabled, span() returns a shared no-op object,
+    so instrumented code pays one flag check per call.
+
+    Finished spans feed the `span_duration_seconds` histogram and every
+    registered exporter. TRACE_EXPORT_FILE=<path> adds a file exporter that
+    writes one OTLP/JSON `resourceSpans` document per line.
+
+Metrics
+    inc(), observe() and set_gauge() keep counters, histograms and gauges
+    in-process (always on, they are plain dict updates).
+    render_prometheus() returns them in the Prometheus text format.
+"""
+import json
+import os
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+SERVICE_NAME = "agentic-rag-loan-chatbot"
+
+# Histogram buckets (seconds) used for latency metrics
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_enabled = False
+_exporters = []
+_current_span: ContextVar = ContextVar("current_span", default=None)
+
+
+# ============================================================
+# Metrics registry
+# ============================================================
+_lock = threading.Lock()
+_types = {}        # metric name -> "counter" | "gauge" | "histogram"
+_help = {}         # metric name -> help text
+_values = {}       # (name, labels) -> float               (counters, gauges)
+_histograms = {}   # (name, labels) -> [bucket_counts, sum, count, buckets]
+
+
+def _labels_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def describe(name: str, help_text: str):
+    """Attach a HELP line to a metric."""
+    _help[name] = help_text
+
+
+def inc(name: str, value: float = 1, **labels):
+    key = (name, _labels_key(labels))
+    with _lock:
+        _types.setdefault(name, "counter")
+        _values[key] = _values.get(key, 0) + value
+
+
+def set_gauge(name: str, value: float, **labels):
+    key = (name, _labels_key(labels))
+    with _lock:
+        _types.setdefault(name, "gauge")
+        _values[key] = value
+
+
+def observe(name: str, value: float, buckets=LATENCY_BUCKETS, **labels):
+    key = (name, _labels_key(labels))
+    with _lock:
+        _types.setdefault(name, "histogram")
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [[0] * len(buckets), 0.0, 0, buckets]
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                hist[0][i] += 1
+        hist[1] += value
+        hist[2] += 1
+
+
+def get_value(name: str, **labels) -> float:
+    """Current value of a counter or gauge (0 if never set)."""
+    return _values.get((name, _labels_key(labels)), 0)
+
+
+def reset_metrics():
+    with _lock:
+        _values.clear()
+        _histograms.clear()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels) + (extra or [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        values = sorted(_values.items())
+        histograms = sorted(
+            (key, (list(h[0]), h[1], h[2], h[3])) for key, h in _histograms.items()
+        )
+
+    seen = set()
+
+    def header(name):
+        if name in seen:
+            return
+        seen.add(name)
+        if name in _help:
+            lines.append(f"# HELP {name} {_help[name]}")
+        lines.append(f"# TYPE {name} {_types[name]}")
+
+    for (name, labels), value in values:
+        header(name)
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    for (name, labels), (bucket_counts, total, count, buckets) in histograms:
+        header(name)
+        for bound, bucket_count in zip(buckets, bucket_counts):
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {bucket_count}")
+        lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+describe("span_duration_seconds", "Duration of traced pipeline steps")
+
+
+# ============================================================
+# Spans
+# ============================================================
+class Span:
+    __slots__ = ("name", "attributes", "trace_id", "span_id", "parent_id",
+                 "start_ns", "end_ns", "error", "_token", "_perf_ns")
+
+    def __init__(self, name, attributes):
+        parent = _current_span.get()
+        self.name = name
+        self.attributes = attributes
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error = None
+        self._token = None
+        self._perf_ns = 0
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds."""
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        # wall clock only for the start timestamp; the duration comes from the
+        # monotonic counter, so clock adjustments cannot skew it
+        self.start_ns = time.time_ns()
+        self._perf_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = self.start_ns + (time.perf_counter_ns() - self._perf_ns)
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.error = repr(exc)
+
+        observe("span_duration_seconds", self.duration, span=self.name)
+        for exporter in list(_exporters):
+            try:
+                exporter(self)
+            except Exception as e:
+                print("[TELEMETRY EXPORT ERROR]", e)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **attributes):
+    if not _enabled:
+        return _NOOP_SPAN
+    return Span(name, attributes)
+
+
+def traced(name: str):
+    """Decorator: run the function inside span(name)."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def tracing_enabled() -> bool:
+    return _enabled
+
+
+def add_span_exporter(exporter):
+    """exporter(span) is called for every finished span."""
+    _exporters.append(exporter)
+
+
+def remove_span_exporter(exporter):
+    if exporter in _exporters:
+        _exporters.remove(exporter)
+
+
+def enable_tracing(export_file: str = None):
+    global _enabled
+    _enabled = True
+    if export_file:
+        add_span_exporter(OTLPFileExporter(export_file))
+
+
+def disable_tracing():
+    global _enabled
+    _enabled = False
+
+
+# ============================================================
+# OTLP/JSON file exporter
+# ============================================================
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OTLPFileExporter:
+    """
+    Appends each span as an OTLP/JSON `resourceSpans` line, the format read
+    by the OpenTelemetry collector's `otlpjsonfile` receiver.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, s: Span):
+        otlp_span = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 1,
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [
+                {"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()
+            ],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+        }
+        if s.parent_id:
+            otlp_span["parentSpanId"] = s.parent_id
+
+        record = {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": SERVICE_NAME}}
+                ]},
+                "scopeSpans": [{
+                    "scope": {"name": "agent.telemetry"},
+                    "spans": [otlp_span],
+                }],
+            }]
+        }
+        line = json.dumps(record)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+# Enable from environment at import time
+if os.getenv("TRACING_ENABLED", "").lower() in ("1", "true", "yes"):
+    enable_tracing(os.getenv("TRACE_EXPORT_FILE"))
@@ -0,0 +1,149 @@
+# backend/admission.py
+"""
+Admission control / load shedding for /chat.
+
+At most ADMISSION_MAX_IN_FLIGHT turns run at once. Further turns wait in
+a bounded queue; when a slot frees up, turns inside an active flow
+("flow" priority: cheap, mostly deterministic) go before new queries
+("new" priority: routing + RAG, several LLM calls), and both go before
+/chat/batch turns ("batch" priority: bulk replay, nobody waiting live).
+
+A turn is rejected quickly instead of piling up:
+  - 503 queue_full    the wait queue is full
+  - 503 deadline      it waited longer than ADMISSION_QUEUE_TIMEOUT_S
+  - 429 session_busy  the same session already has a turn in flight or queued
+                      (double submits / client retries)
+Every rejection carries a Retry-After estimate (seconds).
+
+Decisions are exported as metrics:
+  admission_decisions_total{priority, decision}
+  admission_in_flight, admission_queued
+  admission_queue_wait_seconds
+"""
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from agent.telemetry import describe, inc, observe, set_gauge
+
+# /chat is a sync endpoint served from AnyIO's worker threads (40 by default):
+# in-flight + queued must stay below that, or requests wait invisibly there.
+MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "16"))
+MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "16"))
+QUEUE_TIMEOUT_S = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_S", "5"))
+
+PRIORITIES = ("flow", "new", "batch")   # highest first
+
+describe("admission_decisions_total", "Admission decisions per priority (admitted or shed reason)")
+describe("admission_in_flight", "Chat turns currently running")
+describe("admission_queued", "Chat turns waiting for a slot")
+describe("admission_queue_wait_seconds", "Time admitted turns waited in the queue")
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    def __init__(self, max_in_flight=MAX_IN_FLIGHT, max_queue=MAX_QUEUE,
+                 queue_timeout_s=QUEUE_TIMEOUT_S):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = {p: 0 for p in PRIORITIES}
+        self._sessions = set()          # sessions with a turn in flight or queued
+        self._service_time = 1.0        # EWMA of turn duration (s), for Retry-After
+
+    # --- internals (call with the lock held) ---
+    def _queued(self):
+        return sum(self._waiting.values())
+
+    def _can_run(self, priority):
+        if self._in_flight >= self.max_in_flight:
+            return False
+        # a free slot goes to the highest waiting priority first
+        for p in PRIORITIES:
+            if p == priority:
+                return True
+            if self._waiting[p]:
+                return False
+        return True
+
+    def _retry_after(self):
+        # time for the current backlog to drain through all slots
+        backlog = self._in_flight + self._queued()
+        return max(1, math.ceil(backlog * self._service_time / self.max_in_flight))
+
+    def _publish(self):
+        set_gauge("admission_in_flight", self._in_flight)
+        set_gauge("admission_queued", self._queued())
+
+    def _reject(self, status_code, reason, priority):
+        inc("admission_decisions_total", priority=priority, decision=reason)
+        return AdmissionRejected(status_code, reason, self._retry_after())
+
+    # --- public API ---
+    @contextmanager
+    def admit(self, session_id: str, priority: str = "new"):
+        """
+        Hold a slot while the turn runs.
+        Raises AdmissionRejected when the turn is shed.
+        """
+        if priority not in self._waiting:
+            raise ValueError(f"Unknown priority: {priority}")
+
+        with self._cond:
+            if session_id in self._sessions:
+                raise self._reject(429, "session_busy", priority)
+
+            queued_at = time.monotonic()
+            if not self._can_run(priority):
+                if self._queued() >= self.max_queue:
+                    raise self._reject(503, "queue_full", priority)
+
+                deadline = queued_at + self.queue_timeout_s
+                self._waiting[priority] += 1
+                self._sessions.add(session_id)
+                self._publish()
+                try:
+                    while not self._can_run(priority):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._sessions.discard(session_id)
+                            raise self._reject(503, "deadline", priority)
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting[priority] -= 1
+                    self._publish()
+                    # a waiter that gave up may unblock lower priorities
+                    self._cond.notify_all()
+
+            self._in_flight += 1
+            self._sessions.add(session_id)
+            inc("admission_decisions_total", priority=priority, decision="admitted")
+            observe("admission_queue_wait_seconds", time.monotonic() - queued_at)
+            self._publish()
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._sessions.discard(session_id)
+                self._service_time = 0.8 * self._service_time + 0.2 * (time.monotonic() - started)
+                self._publish()
+                self._cond.notify_all()
+
+
+# Shared controller for the API process
+controller = AdmissionController()
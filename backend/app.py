@@ -1,12 +1,51 @@
 # backend/app.py
-from fastapi import FastAPI
-from pydantic import BaseModel
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from itertools import islice
+from typing import Dict, List, Literal
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from fastapi.middleware.cors import CORSMiddleware
 
-from backend.session_store import get_session
-from backend.graph import build_graph
+from backend.admission import AdmissionRejected, controller as admission
+from backend.rate_limit import RATE_LIMIT_ENABLED, TENANT_HEADER, RateLimited, client_ip, limiter
+from backend.session_store import get_session, peek_active_flow, persist_session, session_exists, session_lock
+from backend.graph import build_graph, discard_speculation
+from backend import warmup
+from agent.llm_vertex import thread_llm_calls
+from agent.telemetry import describe, inc, render_prometheus, span
+from tools.emi import MAX_RATE_PCT, MAX_TENURE_MONTHS, iter_amortization, iter_schedule_csv
+
+# Compiled agent graph: built during startup warm-up, or on first use
+_graph = None
+_graph_lock = threading.Lock()
+
+
+def get_graph():
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                _graph = build_graph()
+    return _graph
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm Vertex, the LLM, Chroma, embeddings and the graph in the background;
+    # /readyz turns 200 once everything is warm.
+    if warmup.WARMUP_ON_STARTUP:
+        warmup.start_background(get_graph)
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,11 +53,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],  # read by fetchWithRetry in frontend.html
 )
 
-graph = build_graph()
-
-
 class ChatRequest(BaseModel):
     session_id: str
     message: str
@@ -30,21 +67,262 @@ class ChatResponse(BaseModel):
     awaiting_field: str | None = None
 
 
+def _chat_turn(session_id: str, message: str) -> ChatResponse:
+    # Turns of one session are serialized (concurrent /chat or /chat/batch)
+    with session_lock(session_id):
+        # 1. Load session-bound conversation state
+        convo_state = get_session(session_id)
+
+        # 2. Invoke agent graph
+        with span("chat.turn", message_chars=len(message)) as s:
+            try:
+                result = get_graph().invoke({
+                    "session_id": session_id,
+                    "convo_state": convo_state,
+                    "user_input": message,
+                    "bot_reply": "",
+                })
+            finally:
+                # a prefetch rag_node did not take (e.g. the turn raised) is dropped
+                discard_speculation(session_id)
+            s.set("reply_chars", len(result["bot_reply"]))
+
+        # 3. Save the updated state (external session backend only)
+        persist_session(session_id, convo_state)
+
+        # 4. Return minimal agent-aware response
+        return ChatResponse(
+            reply=result["bot_reply"],
+            active_flow=convo_state.active_flow,
+            awaiting_field=convo_state.awaiting_field,
+        )
+
+
+def _identity(request: Request | None):
+    # (client IP, tenant key); `request` is None when called directly (benchmarks)
+    if request is None:
+        return None, None
+    peer = request.client.host if request.client else None
+    ip = client_ip(peer, request.headers.get("X-Forwarded-For"))
+    return ip, request.headers.get(TENANT_HEADER)
+
+
+def _rate_limited(e: RateLimited) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=f"Rate limit exceeded ({e.scope}), retry after {e.retry_after}s",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
 @app.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest):
-    # 1. Load session-bound conversation state
-    convo_state = get_session(req.session_id)
-
-    # 2. Invoke agent graph
-    result = graph.invoke({
-        "convo_state": convo_state,
-        "user_input": req.message,
-        "bot_reply": "",
-    })
-
-    # 3. Return minimal agent-aware response
-    return ChatResponse(
-        reply=result["bot_reply"],
-        active_flow=convo_state.active_flow,
-        awaiting_field=convo_state.awaiting_field,
+def chat(req: ChatRequest, request: Request = None):
+    ip, tenant = _identity(request)
+    is_new = not session_exists(req.session_id)
+
+    # 1. Rate limits (per session / IP / tenant, LLM budget)
+    if RATE_LIMIT_ENABLED:
+        try:
+            limiter.check_request(req.session_id, ip, tenant, new_session=is_new)
+        except RateLimited as e:
+            raise _rate_limited(e)
+
+    # 2. Admission: turns inside an active flow are cheap → admitted before new queries
+    # (read-only peek: this runs outside session_lock, a turn may be in flight)
+    priority = "flow" if not is_new and peek_active_flow(req.session_id) else "new"
+    try:
+        with admission.admit(req.session_id, priority):
+            calls_before = thread_llm_calls()
+            try:
+                return _chat_turn(req.session_id, req.message)
+            finally:
+                if RATE_LIMIT_ENABLED:
+                    limiter.charge_llm(ip, tenant, thread_llm_calls() - calls_before)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=f"Service busy ({e.reason}), retry after {e.retry_after}s",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+# -------------------------
+# Bulk replay (QA / regression / analytics)
+# -------------------------
+MAX_BATCH_MESSAGES = 10_000
+BATCH_WORKERS = int(os.getenv("CHAT_BATCH_WORKERS", "32"))
+BATCH_ADMISSION_ATTEMPTS = 3      # tries per turn when admission sheds it
+
+describe("chat_batch_messages_total", "Messages received through /chat/batch")
+
+
+class BatchChatRequest(BaseModel):
+    messages: List[ChatRequest] = Field(..., min_length=1, max_length=MAX_BATCH_MESSAGES)
+
+
+class BatchChatResult(ChatResponse):
+    session_id: str
+    error: str | None = None
+
+
+class BatchChatResponse(BaseModel):
+    results: List[BatchChatResult]      # same order as the request
+    sessions: int
+    elapsed_ms: float
+
+
+@app.post("/chat/batch", response_model=BatchChatResponse)
+def chat_batch(req: BatchChatRequest, request: Request = None):
+    """
+    Run many (session_id, message) pairs in one call.
+    Sessions run in parallel (up to CHAT_BATCH_WORKERS threads);
+    messages of the same session run strictly in request order.
+    A failing turn is reported in its result and does not stop the batch.
+
+    Every message is charged to the caller's IP / tenant rate limits up
+    front (all or nothing), and every turn goes through admission control
+    at "batch" priority, behind interactive /chat turns.
+    """
+    started = time.perf_counter()
+    ip, tenant = _identity(request)
+
+    # session_id -> message positions, in order
+    by_session: Dict[str, List[int]] = {}
+    for i, m in enumerate(req.messages):
+        by_session.setdefault(m.session_id, []).append(i)
+
+    # 1. Rate limits: one request per message, one new session per unseen session_id
+    if RATE_LIMIT_ENABLED:
+        new_sessions = sum(not session_exists(sid) for sid in by_session)
+        scope = limiter.exceeds_burst(ip, tenant, len(req.messages), new_sessions)
+        if scope:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch exceeds the {scope} rate limit burst; split it into smaller batches",
+            )
+        try:
+            limiter.check_request(None, ip, tenant, new_session=new_sessions, count=len(req.messages))
+        except RateLimited as e:
+            raise _rate_limited(e)
+
+    inc("chat_batch_messages_total", len(req.messages))
+    results: List[BatchChatResult | None] = [None] * len(req.messages)
+
+    def turn(session_id: str, message: str) -> ChatResponse:
+        # 2. Admission per turn; a shed turn waits its Retry-After and tries again
+        for attempt in range(BATCH_ADMISSION_ATTEMPTS):
+            try:
+                with admission.admit(session_id, "batch"):
+                    calls_before = thread_llm_calls()
+                    try:
+                        return _chat_turn(session_id, message)
+                    finally:
+                        if RATE_LIMIT_ENABLED:
+                            limiter.charge_llm(ip, tenant, thread_llm_calls() - calls_before)
+            except AdmissionRejected as e:
+                if attempt + 1 == BATCH_ADMISSION_ATTEMPTS:
+                    raise
+                time.sleep(e.retry_after)
+
+    def replay(session_id: str, positions: List[int]):
+        for i in positions:
+            try:
+                reply = turn(session_id, req.messages[i].message)
+                results[i] = BatchChatResult(session_id=session_id, **reply.model_dump())
+            except Exception as e:
+                print("[BATCH TURN FAILED]", session_id, e)
+                results[i] = BatchChatResult(session_id=session_id, reply="", error=str(e))
+
+    with span("chat.batch", messages=len(req.messages), sessions=len(by_session)):
+        # more workers than admission slots would only queue (and be shed)
+        workers = max(1, min(BATCH_WORKERS, admission.max_in_flight, len(by_session)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chat-batch") as pool:
+            futures = [
+                # each task gets its own context copy so turn spans nest under chat.batch
+                pool.submit(contextvars.copy_context().run, replay, session_id, positions)
+                for session_id, positions in by_session.items()
+            ]
+            for future in futures:
+                future.result()
+
+    return BatchChatResponse(
+        results=results,
+        sessions=len(by_session),
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+    )
+
+
+@app.get("/healthz")
+def healthz():
+    # Liveness: the process is up and serving
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+def readyz():
+    # Readiness: 200 only once every component is warm
+    state = warmup.readiness()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus scrape endpoint (span latencies, LLM call counters, ...)
+    return PlainTextResponse(
+        render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+# -------------------------
+# Full amortization schedule (streamed / paginated)
+# -------------------------
+class ScheduleRequest(BaseModel):
+    principal: float = Field(gt=0)
+    rate: float = Field(gt=0, le=MAX_RATE_PCT)
+    tenure_months: int = Field(gt=0, le=MAX_TENURE_MONTHS)  # also bounds the schedule length
+    prepayments: Dict[int, float] = {}     # month -> amount
+    rate_changes: Dict[int, float] = {}    # month -> new annual rate
+    reduce: Literal["tenure", "emi"] = "tenure"
+
+
+def _schedule_rows(req: ScheduleRequest):
+    try:
+        return iter_amortization(
+            req.principal,
+            req.rate,
+            req.tenure_months,
+            prepayments=req.prepayments,
+            rate_changes=req.rate_changes,
+            reduce=req.reduce,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/emi/schedule")
+def emi_schedule(
+    req: ScheduleRequest,
+    offset: int = Query(0, ge=0, le=MAX_TENURE_MONTHS),
+    limit: int = Query(60, ge=1, le=1200),
+):
+    # One page of rows; only offset + limit + 1 rows are ever computed
+    rows = list(islice(_schedule_rows(req), offset, offset + limit + 1))
+    has_more = len(rows) > limit
+
+    return {
+        "offset": offset,
+        "limit": limit,
+        "rows": rows[:limit],
+        "next_offset": offset + limit if has_more else None,
+    }
+
+
+@app.post("/emi/schedule.csv")
+def emi_schedule_csv(req: ScheduleRequest):
+    # Streams the whole schedule as CSV, row by row
+    return StreamingResponse(
+        iter_schedule_csv(_schedule_rows(req)),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=amortization_schedule.csv"},
     )
@@ -1,24 +1,95 @@
 # backend/graph.py
 
-from langgraph.graph import StateGraph, END
+import os
+import threading
 from typing import TypedDict, Optional
 
 from agent.state import ConversationState
+from agent.telemetry import describe, inc, span, traced
 from agent.intent_router import route_intent
 from agent.flows.emi_flow import handle_emi_turn
 from agent.flows.loan_flow import handle_loan_turn
-from tools.rag import rag_tool
+from tools.rag import prefetch, rag_answer, rag_retrieve
 from agent.slot_extraction.emi_slot_extraction import extract_emi_slots
-from agent.intent_router import route_intent
 
 # -------------------------
 # LangGraph State
 # -------------------------
 class GraphState(TypedDict):
+    session_id: str
     convo_state: ConversationState
     user_input: str
     bot_reply: str
 
+# -------------------------
+# Speculative RAG retrieval
+# -------------------------
+# While route_intent's LLM call is in flight, the message is embedded and
+# its chunks retrieved on a background thread. rag_node uses the result;
+# any other route discards it (counted as "wasted").
+RAG_SPECULATION = os.getenv("RAG_SPECULATION", "1") == "1"
+
+# session_id -> (user_input, flow, Future), from policy to rag_node.
+# The caller clears its session's entry after every turn
+# (discard_speculation), so a turn that fails mid-graph leaves nothing behind.
+_prefetched = {}
+_prefetched_lock = threading.Lock()
+
+describe("rag_speculation_total",
+         "Speculative RAG retrievals by outcome (used, wasted, failed, not_started, skipped)")
+
+
+def _rag_flow(cs: ConversationState):
+    # a paused flow tells which product the question is about
+    return cs.paused_flow.flow if cs.paused_flow else cs.active_flow
+
+
+def _start_speculation(session_id: str, cs: ConversationState, user_input: str):
+    discard_speculation(session_id)
+    flow = _rag_flow(cs)
+    future = prefetch(user_input, flow)
+    if future is None:      # prefetch threads all busy: retrieve inline if needed
+        inc("rag_speculation_total", outcome="skipped")
+        return
+    with _prefetched_lock:
+        _prefetched[session_id] = (user_input, flow, future)
+
+
+def discard_speculation(session_id: str):
+    """Drop the session's pending prefetch (route was not RAG, or the turn ended)."""
+    with _prefetched_lock:
+        entry = _prefetched.pop(session_id, None)
+    if entry is not None:
+        entry[2].cancel()   # only stops it if it has not started yet
+        inc("rag_speculation_total", outcome="wasted")
+
+
+def _take_speculation(session_id: str, user_input: str, flow):
+    """Chunks prefetched for this message, or None (retrieve inline)."""
+    with _prefetched_lock:
+        entry = _prefetched.pop(session_id, None)
+    if entry is None:
+        return None
+    future = entry[2]
+    if entry[:2] != (user_input, flow):
+        future.cancel()
+        inc("rag_speculation_total", outcome="wasted")
+        return None
+    # still queued behind other prefetches: inline retrieval is faster than waiting
+    if future.cancel():
+        inc("rag_speculation_total", outcome="not_started")
+        return None
+    try:
+        with span("rag.speculation.wait", done=future.done()):
+            chunks = future.result()
+    except Exception as e:
+        print("[RAG SPECULATION FAILED]", e)
+        inc("rag_speculation_total", outcome="failed")
+        return None
+    inc("rag_speculation_total", outcome="used")
+    return chunks
+
+
 # -------------------------
 # Nodes (ONLY business logic)
 # -------------------------
@@ -28,12 +99,7 @@ def emi_node(state: GraphState) -> GraphState:
 
     if not result["interrupt"]:
         if result.get("tool_output"):
-            cs.last_completed_flow = {
-                "flow": "EMI",
-                "slots": cs.slots.copy()
-            }
-            cs.active_flow = None
-            cs.awaiting_field = None
+            cs.complete_flow()
         state["bot_reply"] = result.get("response", "")
         return state
 
@@ -47,19 +113,18 @@ def loan_node(state: GraphState) -> GraphState:
     result = handle_loan_turn(cs, state["user_input"])
 
     if result.get("tool_output"):
-        cs.last_completed_flow = {
-            "flow": "LOAN",
-            "slots": cs.slots.copy()
-        }
-        cs.active_flow = None
-        cs.awaiting_field = None
+        cs.complete_flow()
 
     state["bot_reply"] = result.get("response", "")
     return state
 
 def rag_node(state: GraphState) -> GraphState:
     cs = state["convo_state"]
-    rag_result = rag_tool(state["user_input"])
+    flow = _rag_flow(cs)
+    chunks = _take_speculation(state["session_id"], state["user_input"], flow)
+    if chunks is None:
+        chunks = rag_retrieve(state["user_input"], flow)
+    rag_result = rag_answer(state["user_input"], chunks)
     state["bot_reply"] = rag_result["answer"]
 
     if cs.paused_flow:
@@ -95,23 +160,25 @@ def policy(state: GraphState) -> str:
     # 3. Resume completed EMI if user updates values
     if (
         cs.last_completed_flow
-        and cs.last_completed_flow["flow"] == "EMI"
+        and cs.last_completed_flow.flow == "EMI"
     ):
         extracted = extract_emi_slots(state["user_input"])
         if any(v is not None for v in extracted.values()):
-            cs.active_flow = "EMI"
-            cs.slots = cs.last_completed_flow["slots"].copy()
-            cs.last_completed_flow = None
+            cs.reopen_completed_flow()
             return "emi"
 
-    # 4. Fresh intent routing
+    # 4. Fresh intent routing (RAG retrieval runs speculatively meanwhile)
+    if RAG_SPECULATION:
+        _start_speculation(state["session_id"], cs, state["user_input"])
     action = route_intent(cs, state["user_input"])
     if action == "START_EMI":
+        discard_speculation(state["session_id"])
         cs.reset_flow()
         cs.active_flow = "EMI"
         return "emi"
 
     if action == "START_LOAN":
+        discard_speculation(state["session_id"])
         cs.reset_flow()
         cs.active_flow = "LOAN"
         return "loan"
@@ -123,13 +190,16 @@ def policy(state: GraphState) -> str:
 # Build Graph
 # -------------------------
 def build_graph():
+    # LangGraph is imported here, not at module level: only compiling needs it
+    from langgraph.graph import StateGraph, END
+
     graph = StateGraph(GraphState)
 
-    # Add actual processing nodes
-    graph.add_node("emi", emi_node)
-    graph.add_node("loan", loan_node)
-    graph.add_node("rag", rag_node)
-    graph.add_node("reset", reset_node)
+    # Add actual processing nodes (each wrapped in a tracing span)
+    graph.add_node("emi", traced("node.emi")(emi_node))
+    graph.add_node("loan", traced("node.loan")(loan_node))
+    graph.add_node("rag", traced("node.rag")(rag_node))
+    graph.add_node("reset", traced("node.reset")(reset_node))
 
     # Set entry point and route directly using policy function
     graph.set_entry_point("router")
@@ -139,7 +209,7 @@ def build_graph():
     
     graph.add_conditional_edges(
         "router",
-        policy,
+        traced("node.policy")(policy),
         {
             "emi": "emi",
             "loan": "loan",
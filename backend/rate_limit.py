@@ -0,0 +1,302 @@
+# backend/rate_limit.py
+"""
+Token-bucket rate limiting for /chat.
+
+Identities and default limits (per minute / burst), override with
+RATE_LIMIT_<SCOPE>="<per_minute>/<burst>" (e.g. RATE_LIMIT_IP="60/20"):
+
+  session        requests per session_id                       30 / 10
+  ip             requests per client IP                       120 / 30
+  tenant         requests per tenant key (X-Tenant-Key)      1200 / 200
+                 (tenant scopes apply only when the header is sent)
+  new_session    new session_ids per client IP                 10 / 5
+  llm_ip         LLM calls per client IP                      120 / 40
+  llm_tenant     LLM calls per tenant key                    1200 / 400
+
+Request buckets are charged before the turn runs. LLM buckets are checked
+before the turn (at least one call must be affordable) and charged with
+the actual number of calls afterwards, so one expensive client runs into
+debt and waits while the others keep their share.
+
+A request's buckets are checked together and charged all or nothing, so
+a rejection by one scope never uses up another scope's budget.
+
+Behind a load balancer, list it in TRUSTED_PROXIES so the IP scopes use
+the client address from X-Forwarded-For (see client_ip()).
+
+Each bucket is O(1): tokens and last-refill time, refilled lazily on
+access. Buckets live in process memory (LRU-bounded) or, for
+multi-worker deployments, in a shared store:
+
+    set_bucket_store(RedisBucketStore(redis.Redis(...)))
+"""
+import ipaddress
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from agent.telemetry import describe, inc
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+TENANT_HEADER = "X-Tenant-Key"
+
+# Load balancers / reverse proxies whose X-Forwarded-For is believed
+# (comma-separated addresses or CIDRs, e.g. "10.0.0.0/8,127.0.0.1")
+TRUSTED_PROXIES = [
+    ipaddress.ip_network(p.strip(), strict=False)
+    for p in os.getenv("TRUSTED_PROXIES", "").split(",") if p.strip()
+]
+
+describe("rate_limit_rejections_total", "Requests rejected by the rate limiter per scope")
+describe("rate_limit_llm_calls_charged_total", "LLM calls charged to rate limit budgets")
+
+
+@dataclass(frozen=True)
+class Limit:
+    per_minute: float
+    burst: float
+
+    @property
+    def rate(self) -> float:
+        """Tokens per second."""
+        return self.per_minute / 60.0
+
+
+def _limit(scope: str, per_minute: float, burst: float) -> Limit:
+    value = os.getenv(f"RATE_LIMIT_{scope.upper()}")
+    if value:
+        per_minute, burst = (float(v) for v in value.split("/"))
+    return Limit(per_minute, burst)
+
+
+LIMITS: Dict[str, Limit] = {
+    "session": _limit("session", 30, 10),
+    "ip": _limit("ip", 120, 30),
+    "tenant": _limit("tenant", 1200, 200),
+    "new_session": _limit("new_session", 10, 5),
+    "llm_ip": _limit("llm_ip", 120, 40),
+    "llm_tenant": _limit("llm_tenant", 1200, 400),
+}
+
+
+class RateLimited(Exception):
+    def __init__(self, scope: str, retry_after: int):
+        super().__init__(f"Rate limit exceeded ({scope})")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+def _trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+
+def client_ip(peer: Optional[str], forwarded_for: Optional[str]) -> Optional[str]:
+    """
+    Client address for the IP scopes. `peer` is the socket address; when it
+    is a trusted proxy, X-Forwarded-For is walked from the right (the hop
+    our proxy appended) and the first address not in TRUSTED_PROXIES is
+    the client. Addresses left of it are client-supplied and ignored.
+    """
+    if not peer or not forwarded_for or not _trusted(peer):
+        return peer
+    hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _trusted(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+# ---------------------------
+# Bucket stores
+# ---------------------------
+# A take is a list of (key, limit, cost, require) entries, applied all or
+# nothing: every bucket is refilled and checked first, and only when each
+# holds at least its `require` tokens is every `cost` subtracted. A request
+# rejected by its tenant bucket therefore keeps its session and IP tokens.
+# Result: (index of the first rejecting entry or None, seconds to wait).
+
+class InMemoryBucketStore:
+    """
+    Buckets in a dict: key -> [tokens, last_refill].
+    At most `max_keys` buckets are kept; the least recently used is
+    dropped (it comes back full, like a client that has been idle).
+    """
+
+    def __init__(self, max_keys: int = 600_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _refill(self, key: str, limit: Limit, now: float) -> list:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [limit.burst, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+        return bucket
+
+    def take_all(self, entries) -> Tuple[Optional[int], float]:
+        now = time.monotonic()
+        with self._lock:
+            buckets = [self._refill(key, limit, now) for key, limit, _, _ in entries]
+
+            rejected, wait = None, 0.0
+            for i, (bucket, (_, limit, _, require)) in enumerate(zip(buckets, entries)):
+                if bucket[0] < require:
+                    rejected = i if rejected is None else rejected
+                    wait = max(wait, (require - bucket[0]) / limit.rate)
+            if rejected is not None:
+                return rejected, wait
+
+            for bucket, (_, _, cost, _) in zip(buckets, entries):
+                bucket[0] -= cost
+            return None, 0.0
+
+
+_REDIS_TAKE_ALL = """
+local now = tonumber(ARGV[1])
+local tokens, rejected, wait = {}, -1, 0
+for i, key in ipairs(KEYS) do
+  local base = 1 + (i - 1) * 4
+  local rate, burst, require = tonumber(ARGV[base + 1]), tonumber(ARGV[base + 2]), tonumber(ARGV[base + 4])
+  local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+  local t = tonumber(bucket[1]) or burst
+  local ts = tonumber(bucket[2]) or now
+  t = math.min(burst, t + math.max(0, now - ts) * rate)
+  tokens[i] = t
+  if t < require then
+    if rejected < 0 then rejected = i - 1 end
+    wait = math.max(wait, (require - t) / rate)
+  end
+end
+if rejected >= 0 then
+  return {rejected, tostring(wait)}
+end
+for i, key in ipairs(KEYS) do
+  local base = 1 + (i - 1) * 4
+  local rate, burst, cost = tonumber(ARGV[base + 1]), tonumber(ARGV[base + 2]), tonumber(ARGV[base + 3])
+  local t = tokens[i] - cost
+  redis.call('HSET', key, 'tokens', t, 'ts', now)
+  redis.call('EXPIRE', key, math.ceil((burst - t) / rate) + 1)
+end
+return {-1, '0'}
+"""
+
+
+class RedisBucketStore:
+    """
+    Shared buckets for several workers / instances. `client` is a
+    redis.Redis (or compatible) client; each take_all() is one atomic
+    script call over all its keys (so a single Redis node, not a cluster).
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    def take_all(self, entries) -> Tuple[Optional[int], float]:
+        args = [time.time()]
+        for _, limit, cost, require in entries:
+            args += [limit.rate, limit.burst, cost, require]
+        rejected, wait = self.client.eval(
+            _REDIS_TAKE_ALL, len(entries), *(self.prefix + key for key, _, _, _ in entries), *args,
+        )
+        rejected = int(rejected)
+        return (None if rejected < 0 else rejected), float(wait)
+
+
+# ---------------------------
+# Limiter
+# ---------------------------
+class RateLimiter:
+    def __init__(self, limits: Dict[str, Limit] = LIMITS, store=None):
+        self.limits = limits
+        self.set_store(store)
+
+    def set_store(self, store=None):
+        """Shared store for all scopes, or None for an in-memory store."""
+        self._store = store or InMemoryBucketStore()
+
+    def _take_all(self, takes):
+        """takes: (scope, identity, cost, require) tuples, charged all or nothing."""
+        entries = [(f"{scope}:{identity}", self.limits[scope], cost, require)
+                   for scope, identity, cost, require in takes]
+        rejected, wait = self._store.take_all(entries)
+        if rejected is not None:
+            scope = takes[rejected][0]
+            inc("rate_limit_rejections_total", scope=scope)
+            raise RateLimited(scope, max(1, math.ceil(wait)))
+
+    def check_request(self, session_id: Optional[str], ip: Optional[str], tenant: Optional[str],
+                      new_session: int, count: int = 1):
+        """
+        Charge `count` requests (and `new_session` new sessions) to every
+        identity, or nothing when any of them is over its limit; raises
+        RateLimited.
+        """
+        takes = []
+        if session_id:
+            takes.append(("session", session_id, count, count))
+        if ip:
+            if new_session:
+                takes.append(("new_session", ip, int(new_session), int(new_session)))
+            takes.append(("ip", ip, count, count))
+        if tenant:
+            takes.append(("tenant", tenant, count, count))
+
+        # LLM budget: at least one call must be affordable (charged after the turn)
+        if tenant:
+            takes.append(("llm_tenant", tenant, 0, 1))
+        if ip:
+            takes.append(("llm_ip", ip, 0, 1))
+        if takes:
+            self._take_all(takes)
+
+    def exceeds_burst(self, ip: Optional[str], tenant: Optional[str], count: int,
+                      new_sessions: int = 0) -> Optional[str]:
+        """
+        Scope whose burst is smaller than a check_request() of this size
+        (it could never be accepted, however long the client waits), or None.
+        """
+        sizes = []
+        if ip:
+            sizes += [("ip", count), ("new_session", new_sessions)]
+        if tenant:
+            sizes.append(("tenant", count))
+        for scope, size in sizes:
+            if size > self.limits[scope].burst:
+                return scope
+        return None
+
+    def charge_llm(self, ip: Optional[str], tenant: Optional[str], calls: int):
+        """Charge the LLM calls a turn actually made (may go into debt)."""
+        if calls <= 0:
+            return
+        inc("rate_limit_llm_calls_charged_total", calls)
+        if tenant:
+            self._take_all([("llm_tenant", tenant, calls, _ALWAYS)])
+        if ip:
+            self._take_all([("llm_ip", ip, calls, _ALWAYS)])
+
+
+# `require` that always passes (finite, so it also works in the Redis script)
+_ALWAYS = -1e18
+
+limiter = RateLimiter()
+
+
+def set_bucket_store(store):
+    """Use a shared bucket store (e.g. RedisBucketStore) for all workers."""
+    limiter.set_store(store)
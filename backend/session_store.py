@@ -6,16 +6,100 @@
 # - single-instance deployments
 #
 # In production, this can be replaced with Redis
-# without changing any agent logic.
+# without changing any agent logic:
+#
+#     set_session_backend(redis.Redis(...))
+#
+# Any object with get(key) -> bytes | None and set(key, bytes) works.
+# Sessions are stored with agent/state_codec.py (compact binary).
 
-from typing import Dict
+import threading
+import weakref
+from typing import Dict, Optional, Protocol
 from agent.state import ConversationState
+from agent.state_codec import decode_state, encode_state
 
 # In-memory session store (OK for local / demo)
 _SESSIONS: Dict[str, ConversationState] = {}
 
+SESSION_KEY_PREFIX = "session:"
+
+# One lock per session: turns of the same session never run concurrently.
+# Weak values: a lock lives only while a turn holds or waits for it, so
+# the map does not grow with every session id ever seen.
+_LOCKS: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+_LOCKS_GUARD = threading.Lock()
+
+
+class SessionBackend(Protocol):
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    def set(self, key: str, value: bytes): ...
+
+
+# Optional external backend (None = in-memory only)
+_BACKEND: Optional[SessionBackend] = None
+
+
+def set_session_backend(backend: Optional[SessionBackend]):
+    """Persist sessions to an external key/value store (None to disable)."""
+    global _BACKEND
+    _BACKEND = backend
+    _SESSIONS.clear()
+
 
 def get_session(session_id: str) -> ConversationState:
+    # With an external backend it is the source of truth (several app
+    # instances may serve the same session), so it is read every turn.
+    if _BACKEND is not None:
+        data = _BACKEND.get(SESSION_KEY_PREFIX + session_id)
+        if data:
+            try:
+                _SESSIONS[session_id] = decode_state(data)
+            except ValueError as e:
+                print("[SESSION DECODE FAILED]", session_id, e)
+
     if session_id not in _SESSIONS:
         _SESSIONS[session_id] = ConversationState()
     return _SESSIONS[session_id]
+
+
+def session_exists(session_id: str) -> bool:
+    if session_id in _SESSIONS:
+        return True
+    return _BACKEND is not None and bool(_BACKEND.get(SESSION_KEY_PREFIX + session_id))
+
+
+def peek_active_flow(session_id: str) -> Optional[str]:
+    """
+    The session's active flow, read-only: nothing is created or replaced in
+    _SESSIONS, so it is safe outside session_lock (a turn may be in flight).
+    """
+    if _BACKEND is not None:
+        data = _BACKEND.get(SESSION_KEY_PREFIX + session_id)
+        if data:
+            try:
+                return decode_state(data).active_flow
+            except ValueError:
+                return None
+    state = _SESSIONS.get(session_id)
+    return state.active_flow if state is not None else None
+
+
+def persist_session(session_id: str, state: ConversationState):
+    """
+    Write `state`, the object the turn mutated, to the external backend
+    (no-op without one). Call with the session's lock held.
+    """
+    if _BACKEND is None:
+        return
+    _BACKEND.set(SESSION_KEY_PREFIX + session_id, encode_state(state))
+
+
+def session_lock(session_id: str) -> threading.Lock:
+    """Lock held while a turn of this session is processed."""
+    with _LOCKS_GUARD:
+        lock = _LOCKS.get(session_id)
+        if lock is None:
+            lock = _LOCKS[session_id] = threading.Lock()
+    return lock
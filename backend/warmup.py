@@ -0,0 +1,164 @@
+# backend/warmup.py
+"""
+Startup warm-up and readiness.
+
+Cold-start costs are paid before traffic arrives, in parallel:
+
+    vertex        vertexai.init()
+    graph         LangGraph compile()                     ┐ start immediately
+    vector_store  Chroma collection load                  ┘
+    llm           GenerativeModel + one throwaway call     ┐ after vertex
+    embedding     one throwaway query embedding            ┘ (first TLS handshakes)
+
+Each component is retried a few times. /readyz reports ready only once every
+component is "ready" (or "skipped": Vertex steps with a replacement LLM
+backend such as the benchmark stub), so the load balancer sends traffic to
+warm workers only. /healthz is plain liveness.
+
+WARMUP_ON_STARTUP=0 disables warm-up; components are then initialized on
+first use and the worker reports ready immediately.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agent.telemetry import describe, set_gauge, span
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1") == "1"
+WARMUP_ATTEMPTS = int(os.getenv("WARMUP_ATTEMPTS", "3"))
+WARMUP_RETRY_DELAY_S = float(os.getenv("WARMUP_RETRY_DELAY_S", "2"))
+
+COMPONENTS = ("vertex", "graph", "vector_store", "llm", "embedding")
+READY_STATES = ("ready", "skipped")
+
+describe("warmup_component_ready", "1 when a startup component is warm (ready or skipped)")
+describe("warmup_component_seconds", "Time spent warming a startup component")
+
+_lock = threading.Lock()
+_status = {name: {"status": "pending", "duration_ms": None, "error": None} for name in COMPONENTS}
+_started = False
+
+
+# ---------------------------
+# Components
+# ---------------------------
+def _uses_vertex():
+    from agent.llm_vertex import get_llm_backend
+    return get_llm_backend() is None
+
+
+def _warm_vertex():
+    if not _uses_vertex():
+        return "skipped"
+    from agent.llm_vertex import init_vertex
+    init_vertex()
+
+
+def _warm_llm():
+    from agent.llm_vertex import get_llm, get_llm_for, llm_generate
+    if _uses_vertex():
+        get_llm()
+        # one model per static system instruction (creates context caches when enabled)
+        for instruction in _system_prompts():
+            get_llm_for(instruction)
+    llm_generate("Reply with the single word OK.", call_site="warmup")
+
+
+def _system_prompts():
+    from agent.answer_validation import ANSWER_VALIDATION_SYSTEM_PROMPT
+    from agent.intent_router import ROUTER_SYSTEM_PROMPT
+    from agent.slot_extraction.emi_slot_extraction import EMI_SLOTS_SYSTEM_PROMPT
+    from agent.slot_extraction.loan_slot_extraction import LOAN_SLOTS_SYSTEM_PROMPT
+    from tools.rag import CONSOLIDATE_SYSTEM_PROMPT
+    return (ROUTER_SYSTEM_PROMPT, EMI_SLOTS_SYSTEM_PROMPT, LOAN_SLOTS_SYSTEM_PROMPT,
+            ANSWER_VALIDATION_SYSTEM_PROMPT, CONSOLIDATE_SYSTEM_PROMPT)
+
+
+def _warm_graph(get_graph):
+    get_graph()
+    # modules the graph imports lazily (NumPy-backed rule engine)
+    import tools.eligibility  # noqa: F401
+
+
+def _warm_vector_store():
+    from tools.rag import get_collection
+    get_collection()
+
+
+def _warm_embedding():
+    from rag.rag_query import embed_query
+    embed_query("home loan interest rate")
+
+
+# ---------------------------
+# Runner
+# ---------------------------
+def _set(name, **fields):
+    with _lock:
+        _status[name].update(fields)
+    set_gauge("warmup_component_ready", 1 if _status[name]["status"] in READY_STATES else 0, component=name)
+
+
+def _run(name, fn):
+    _set(name, status="running")
+    started = time.perf_counter()
+    for attempt in range(1, WARMUP_ATTEMPTS + 1):
+        try:
+            with span(f"warmup.{name}", attempt=attempt):
+                result = fn()
+            status = result if result == "skipped" else "ready"
+            _set(name, status=status, error=None)
+            break
+        except Exception as e:
+            print(f"[WARMUP FAILED] {name} (attempt {attempt}/{WARMUP_ATTEMPTS}):", e)
+            _set(name, status="failed", error=str(e))
+            if attempt < WARMUP_ATTEMPTS:
+                time.sleep(WARMUP_RETRY_DELAY_S * attempt)
+
+    elapsed = time.perf_counter() - started
+    _set(name, duration_ms=round(elapsed * 1000, 1))
+    set_gauge("warmup_component_seconds", elapsed, component=name)
+    return _status[name]["status"] in READY_STATES
+
+
+def run_warmup(get_graph):
+    """Warm every component (blocking); `get_graph` builds / returns the compiled graph."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(COMPONENTS), thread_name_prefix="warmup") as pool:
+        vertex = pool.submit(_run, "vertex", _warm_vertex)
+        pool.submit(_run, "graph", lambda: _warm_graph(get_graph))
+        pool.submit(_run, "vector_store", _warm_vector_store)
+
+        # LLM and embedding calls need an initialized Vertex client
+        if vertex.result():
+            pool.submit(_run, "llm", _warm_llm)
+            pool.submit(_run, "embedding", _warm_embedding)
+        else:
+            for name in ("llm", "embedding"):
+                _set(name, status="failed", error="vertex initialization failed")
+
+    print(f"✓ Warm-up finished in {time.perf_counter() - started:.2f}s (ready={is_ready()})")
+
+
+def start_background(get_graph):
+    """Run warm-up in a background thread (the server keeps answering probes)."""
+    global _started
+    with _lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=run_warmup, args=(get_graph,), name="warmup", daemon=True).start()
+
+
+def is_ready() -> bool:
+    if not WARMUP_ON_STARTUP:
+        return True
+    with _lock:
+        return all(c["status"] in READY_STATES for c in _status.values())
+
+
+def readiness() -> dict:
+    with _lock:
+        components = {name: dict(c) for name, c in _status.items()}
+    return {"ready": is_ready(), "warmup_enabled": WARMUP_ON_STARTUP, "components": components}
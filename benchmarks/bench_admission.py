@@ -0,0 +1,101 @@
+# benchmarks/bench_admission.py
+"""
+Traffic spike against /chat with and without admission control.
+
+`--clients` threads each send one new RAG question at the same moment
+(stub LLM with a fixed latency). Without admission control every request
+is started at once; with it, at most ADMISSION_MAX_IN_FLIGHT run, a
+bounded number wait, and the rest are shed immediately with Retry-After.
+Reports latency of the served requests and how many were shed.
+
+Usage:
+    python -m benchmarks.bench_admission --clients 200 --llm-latency-ms 50
+"""
+import argparse
+import threading
+import time
+from collections import Counter, defaultdict
+
+from fastapi import HTTPException
+
+from benchmarks.bench_chat import _load_app
+from benchmarks.common import default_output, summarize, write_results
+from benchmarks.stub_llm import StubLLM
+
+QUESTION = "What is the processing fee for home loans?"
+
+
+def spike(app_module, clients: int, label: str):
+    barrier = threading.Barrier(clients)
+    latencies, outcomes, retry_after = [], Counter(), []
+    lock = threading.Lock()
+
+    def client(i):
+        barrier.wait()
+        t0 = time.perf_counter()
+        try:
+            app_module.chat(app_module.ChatRequest(session_id=f"{label}-{i}", message=QUESTION))
+            outcome = "200"
+        except HTTPException as e:
+            outcome = str(e.status_code)
+            with lock:
+                retry_after.append(int(e.headers["Retry-After"]))
+        elapsed = (time.perf_counter() - t0) * 1000
+        with lock:
+            outcomes[outcome] += 1
+            if outcome == "200":
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    return {
+        "wall_s": round(time.perf_counter() - started, 3),
+        "outcomes": dict(outcomes),
+        "served_latency_ms": summarize(latencies),
+        "max_retry_after_s": max(retry_after, default=0),
+    }
+
+
+def run(clients: int, llm_latency_ms: float, max_in_flight: int, max_queue: int):
+    app_module = _load_app(StubLLM(latency_ms=llm_latency_ms), defaultdict(list), tracing=False)
+    controller = app_module.admission
+
+    results = {"benchmark": "admission",
+               "config": {"clients": clients, "llm_latency_ms": llm_latency_ms,
+                          "max_in_flight": max_in_flight, "max_queue": max_queue}}
+
+    # Unlimited: everything is admitted at once
+    controller.max_in_flight, controller.max_queue = clients, clients
+    results["unlimited"] = spike(app_module, clients, "unlimited")
+
+    controller.max_in_flight, controller.max_queue = max_in_flight, max_queue
+    results["admission"] = spike(app_module, clients, "admission")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Admission control spike benchmark")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0)
+    parser.add_argument("--max-in-flight", type=int, default=16)
+    parser.add_argument("--max-queue", type=int, default=16)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.clients, args.llm_latency_ms, args.max_in_flight, args.max_queue)
+    write_results(args.output or default_output("admission"), results)
+
+    for mode in ("unlimited", "admission"):
+        r = results[mode]
+        lat = r["served_latency_ms"]
+        print(f"{mode:<10} outcomes={r['outcomes']}  served p50={lat['p50']}ms p95={lat['p95']}ms  "
+              f"max Retry-After={r['max_retry_after_s']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# benchmarks/bench_ann_index.py
+"""
+IVF index vs brute force at 10k / 100k / 1M synthetic vectors.
+
+For every corpus size:
+  - build time (k-means + insert) and index memory
+  - brute-force top-k latency (exact baseline)
+  - recall@k and p50/p95 latency for each nprobe
+  - incremental updates: inserts/sec (document-sized batches) and deletes/sec
+  - save / load time
+
+Vectors are clustered (like real embeddings of many documents); queries
+are perturbed corpus vectors.
+
+Usage:
+    python -m benchmarks.bench_ann_index --sizes 10000 100000
+    python -m benchmarks.bench_ann_index --sizes 1000000 --dim 256 --queries 100
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import default_output, summarize, write_results
+from rag.ann_index import IVFIndex
+
+DOC_BATCH = 20   # chunks per document update
+
+
+def synthetic_vectors(n, dim, clusters, seed=7, block=100_000):
+    """Clustered unit vectors, generated in blocks to bound peak memory."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    vectors = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, block):
+        size = min(block, n - start)
+        labels = rng.integers(0, clusters, size)
+        vectors[start:start + size] = centers[labels] + 0.8 * rng.normal(size=(size, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def timed_queries(fn, queries):
+    latencies, results = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        results.append(fn(q))
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return results, summarize(latencies)
+
+
+def run_size(n, dim, queries, k, nprobes, seed=7):
+    vectors = synthetic_vectors(n, dim, clusters=max(10, n // 500), seed=seed)
+    ids = [str(i) for i in range(n)]
+    rng = np.random.default_rng(seed + 1)
+    query_vectors = vectors[rng.integers(0, n, queries)] + 0.3 * rng.normal(size=(queries, dim)).astype(np.float32) / np.sqrt(dim)
+
+    t0 = time.perf_counter()
+    index = IVFIndex.build(ids, vectors)
+    build_s = time.perf_counter() - t0
+
+    # exact baseline
+    def brute(q):
+        scores = vectors @ q
+        top = np.argpartition(-scores, k - 1)[:k]
+        return set(top.tolist())
+
+    truth, brute_latency = timed_queries(brute, query_vectors)
+
+    points = []
+    for nprobe in nprobes:
+        if nprobe > len(index.centroids):
+            continue
+        results, latency = timed_queries(lambda q: index.search(q, k, nprobe=nprobe), query_vectors)
+        hits = sum(len({int(r["id"]) for r in res} & exact) for res, exact in zip(results, truth))
+        points.append({"nprobe": nprobe, f"recall_at_{k}": round(hits / (k * queries), 4),
+                       "p50_ms": latency["p50"], "p95_ms": latency["p95"],
+                       "speedup_p50": round(brute_latency["p50"] / latency["p50"], 1)})
+
+    # incremental updates
+    updates = 2_000
+    new_vectors = synthetic_vectors(updates, dim, clusters=max(10, n // 500), seed=seed + 2)
+    new_ids = [f"new-{i}" for i in range(updates)]
+    t0 = time.perf_counter()
+    for start in range(0, updates, DOC_BATCH):
+        index.add(new_ids[start:start + DOC_BATCH], new_vectors[start:start + DOC_BATCH])
+    insert_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for start in range(0, updates, DOC_BATCH):
+        index.remove(new_ids[start:start + DOC_BATCH])
+    delete_s = time.perf_counter() - t0
+
+    workdir = tempfile.mkdtemp(prefix="bench_ann_")
+    try:
+        t0 = time.perf_counter()
+        index.save(workdir)
+        save_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        IVFIndex.load(workdir)
+        load_s = time.perf_counter() - t0
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "vectors": n,
+        "nlist": len(index.centroids),
+        "build_s": round(build_s, 2),
+        "vector_mb": round(n * dim * 4 / 1e6, 1),
+        "brute_force_p50_ms": brute_latency["p50"],
+        "brute_force_p95_ms": brute_latency["p95"],
+        "nprobe": points,
+        "inserts_per_sec": round(updates / insert_s),
+        "deletes_per_sec": round(updates / delete_s),
+        "save_s": round(save_s, 2),
+        "load_s": round(load_s, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IVF ANN index benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    runs = [run_size(n, args.dim, args.queries, args.k, args.nprobe) for n in args.sizes]
+    write_results(args.output or default_output("ann_index"), {
+        "benchmark": "ann_index",
+        "config": {"dim": args.dim, "queries": args.queries, "k": args.k},
+        "runs": runs,
+    })
+
+    for r in runs:
+        print(f"\n{r['vectors']:,} vectors, {r['nlist']} lists: build {r['build_s']} s, "
+              f"brute force p50 {r['brute_force_p50_ms']:.2f} ms")
+        for p in r["nprobe"]:
+            print(f"  nprobe {p['nprobe']:>3}  recall@{args.k} {p[f'recall_at_{args.k}']:.3f}  "
+                  f"p50 {p['p50_ms']:>7.3f} ms  p95 {p['p95_ms']:>7.3f} ms  (x{p['speedup_p50']})")
+        print(f"  inserts/sec {r['inserts_per_sec']:,}  deletes/sec {r['deletes_per_sec']:,}  "
+              f"save {r['save_s']} s  load {r['load_s']} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# benchmarks/bench_chat.py
+"""
+End-to-end benchmark for the /chat service.
+
+Replays the scripted conversations in benchmarks/scenarios.py through
+backend.app.chat with a stub LLM and the fixture vector store, then
+reports:
+  - throughput (turns/sec)
+  - turn latency and per graph node latency (p50/p95/p99, ms)
+  - LLM calls per turn
+  - LLM input tokens per call site, and how many were served from the
+    prompt cache (the stub reports usage like Gemini does)
+  - JSON parse outcomes per call site and wasted turns (turns in which a
+    router / extractor / validator reply was unusable and its fallback ran)
+  - memory per session
+
+--json-noise makes the stub's free-form JSON replies untidy (code fences,
+prose, Python dicts); --no-structured-output stops sending response
+schemas, to compare against schema-constrained generation.
+
+--embed-latency-ms adds an embedding round trip to the fixture RAG;
+--no-speculation turns off the RAG prefetch that runs alongside the
+intent router (backend/graph.py). The results list how many prefetches
+were used and how many were wasted.
+
+Usage:
+    python -m benchmarks.bench_chat --iterations 50 --llm-latency-ms 5
+    python -m benchmarks.bench_chat --json-noise 0.2 [--no-structured-output]
+    python -m benchmarks.compare old.json new.json
+"""
+import argparse
+import time
+from collections import defaultdict
+
+from benchmarks.common import deep_sizeof, default_output, summarize, write_results
+from benchmarks.fixtures import install_fixture_rag
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.stub_llm import StubLLM
+
+CALL_SITES = ("intent_router", "emi_slot_extraction", "loan_slot_extraction",
+              "answer_validation", "rag_generate", "rag_consolidate")
+JSON_CALL_SITES = CALL_SITES[:4]
+JSON_OUTCOMES = ("ok", "repaired", "partial", "failed", "error")
+
+
+# ------------------------------------------------------------
+# Setup
+# ------------------------------------------------------------
+def _load_app(stub, span_timings, tracing=True, trace_file=None, embed_latency_ms=0.0):
+    from agent.llm_vertex import set_llm_backend
+    from agent import telemetry
+
+    set_llm_backend(stub)
+    install_fixture_rag(embed_latency_ms)
+
+    if tracing:
+        telemetry.enable_tracing(trace_file)
+        telemetry.add_span_exporter(
+            lambda s: span_timings[s.name].append(s.duration * 1000)
+        )
+
+    import backend.app as app_module
+    return app_module
+
+
+# ------------------------------------------------------------
+# Run
+# ------------------------------------------------------------
+def run(iterations: int, llm_latency_ms: float, tracing=True, trace_file=None,
+        json_noise=0.0, structured_output=True, embed_latency_ms=0.0, speculation=True):
+    stub = StubLLM(latency_ms=llm_latency_ms, json_noise=json_noise)
+    span_timings = defaultdict(list)
+    app_module = _load_app(stub, span_timings, tracing, trace_file, embed_latency_ms)
+
+    from agent import llm_vertex, telemetry
+    from backend import graph
+    llm_vertex.LLM_STRUCTURED_OUTPUT = structured_output
+    graph.RAG_SPECULATION = speculation
+    from backend.session_store import _SESSIONS
+
+    telemetry.reset_metrics()
+
+    turn_latencies = []
+    llm_calls = []
+    wasted_turns = 0
+    llm_calls_by_scenario = defaultdict(list)
+
+    started = time.perf_counter()
+
+    for i in range(iterations):
+        for name, messages in SCENARIOS:
+            session_id = f"bench-{name}-{i}"
+            for message in messages:
+                calls_before = stub.calls
+                failures_before = _json_failures(telemetry)
+                t0 = time.perf_counter()
+                app_module.chat(app_module.ChatRequest(session_id=session_id, message=message))
+                turn_latencies.append((time.perf_counter() - t0) * 1000)
+                wasted_turns += _json_failures(telemetry) > failures_before
+
+                calls = stub.calls - calls_before
+                llm_calls.append(calls)
+                llm_calls_by_scenario[name].append(calls)
+
+    elapsed = time.perf_counter() - started
+
+    session_sizes = [deep_sizeof(state) for state in _SESSIONS.values()]
+
+    return {
+        "benchmark": "chat",
+        "config": {
+            "iterations": iterations,
+            "llm_latency_ms": llm_latency_ms,
+            "tracing": tracing,
+            "json_noise": json_noise,
+            "structured_output": structured_output,
+            "embed_latency_ms": embed_latency_ms,
+            "speculation": speculation,
+            "scenarios": [name for name, _ in SCENARIOS],
+        },
+        "turns": len(turn_latencies),
+        "throughput_turns_per_sec": round(len(turn_latencies) / elapsed, 2),
+        "turn_latency_ms": summarize(turn_latencies),
+        "node_latency_ms": {
+            name: summarize(values)
+            for name, values in sorted(span_timings.items())
+            if name.startswith("node.")
+        },
+        "step_latency_ms": {
+            name: summarize(values)
+            for name, values in sorted(span_timings.items())
+            if not name.startswith("node.")
+        },
+        "llm_calls_per_turn": {
+            "mean": round(sum(llm_calls) / len(llm_calls), 3),
+            "max": max(llm_calls),
+            "by_scenario": {
+                name: round(sum(v) / len(v), 3)
+                for name, v in llm_calls_by_scenario.items()
+            },
+        },
+        "llm_input_tokens": _token_usage(telemetry),
+        "json_parse": _json_outcomes(telemetry),
+        "rag_speculation": {
+            outcome: int(telemetry.get_value("rag_speculation_total", outcome=outcome))
+            for outcome in ("used", "wasted", "failed", "not_started", "skipped")
+        },
+        "wasted_turns": {"count": wasted_turns, "pct": round(100 * wasted_turns / len(turn_latencies), 2)},
+        "memory_per_session_bytes": {
+            "sessions": len(session_sizes),
+            "mean": round(sum(session_sizes) / len(session_sizes), 1),
+            "max": max(session_sizes),
+        },
+    }
+
+
+def _token_usage(telemetry):
+    usage = {}
+    for site in CALL_SITES:
+        total = telemetry.get_value("llm_input_tokens_total", call_site=site)
+        if not total:
+            continue
+        cached = telemetry.get_value("llm_cached_input_tokens_total", call_site=site)
+        usage[site] = {"total": int(total), "cached": int(cached), "cached_pct": round(100 * cached / total, 1)}
+    return usage
+
+
+def _json_failures(telemetry):
+    return sum(
+        telemetry.get_value("llm_json_parse_total", call_site=site, outcome=outcome)
+        for site in JSON_CALL_SITES for outcome in ("failed", "error")
+    )
+
+
+def _json_outcomes(telemetry):
+    outcomes = {}
+    for site in JSON_CALL_SITES:
+        counts = {o: int(telemetry.get_value("llm_json_parse_total", call_site=site, outcome=o)) for o in JSON_OUTCOMES}
+        total = sum(counts.values())
+        if total:
+            failed = counts["failed"] + counts["error"]
+            outcomes[site] = {**counts, "failure_rate_pct": round(100 * failed / total, 2)}
+    return outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end /chat benchmark")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--no-tracing", action="store_true",
+                        help="Run with tracing disabled (measures instrumentation overhead)")
+    parser.add_argument("--trace-file", default=None,
+                        help="Also write spans as OTLP/JSON lines to this file")
+    parser.add_argument("--json-noise", type=float, default=0.0,
+                        help="Share of free-form JSON replies the stub makes untidy")
+    parser.add_argument("--no-structured-output", action="store_true",
+                        help="Do not send response schemas (free-form JSON, parsed leniently)")
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0)
+    parser.add_argument("--no-speculation", action="store_true",
+                        help="Retrieve only after intent routing (no RAG prefetch)")
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.llm_latency_ms,
+                  tracing=not args.no_tracing, trace_file=args.trace_file,
+                  json_noise=args.json_noise, structured_output=not args.no_structured_output,
+                  embed_latency_ms=args.embed_latency_ms, speculation=not args.no_speculation)
+    write_results(args.output or default_output("chat"), results)
+
+    print(f"Turns: {results['turns']}  "
+          f"Throughput: {results['throughput_turns_per_sec']} turns/sec")
+    print(f"Turn latency p50/p95/p99 (ms): "
+          f"{results['turn_latency_ms']['p50']} / "
+          f"{results['turn_latency_ms']['p95']} / "
+          f"{results['turn_latency_ms']['p99']}")
+    for node, stats in {**results["node_latency_ms"], **results["step_latency_ms"]}.items():
+        print(f"  {node:<16} p50={stats['p50']}  p95={stats['p95']}  p99={stats['p99']}  n={stats['count']}")
+    print(f"LLM calls/turn: {results['llm_calls_per_turn']['mean']}")
+    for site, usage in results["llm_input_tokens"].items():
+        print(f"  {site:<21} input tokens {usage['total']:>8,}  cached {usage['cached']:>8,} ({usage['cached_pct']}%)")
+    for site, outcome in results["json_parse"].items():
+        print(f"  {site:<21} JSON ok {outcome['ok']:>5}  repaired {outcome['repaired']:>4}  "
+              f"failed {outcome['failed'] + outcome['error']:>4} ({outcome['failure_rate_pct']}%)")
+    print(f"Wasted turns: {results['wasted_turns']['count']} ({results['wasted_turns']['pct']}%)")
+    speculation = results["rag_speculation"]
+    if any(speculation.values()):
+        print(f"RAG speculation: used {speculation['used']}  wasted {speculation['wasted']}  "
+              f"failed {speculation['failed']}  not started {speculation['not_started']}  "
+              f"skipped {speculation['skipped']}")
+    print(f"Memory/session: {results['memory_per_session_bytes']['mean']} bytes")
+
+
+if __name__ == "__main__":
+    main()
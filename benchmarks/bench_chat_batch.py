@@ -0,0 +1,99 @@
+# benchmarks/bench_chat_batch.py
+"""
+Bulk transcript replay: one /chat call per message vs /chat/batch.
+
+Every scenario in benchmarks/scenarios.py is replayed `--transcripts`
+times (one session each), first sequentially through chat(), then in a
+single chat_batch() call. Replies must be identical; the benchmark
+reports throughput, speedup and the projected time for a 10k-transcript
+suite.
+
+Usage:
+    python -m benchmarks.bench_chat_batch --transcripts 50 --llm-latency-ms 20
+"""
+import argparse
+import time
+from collections import defaultdict
+
+from benchmarks.bench_chat import _load_app
+from benchmarks.common import default_output, write_results
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.stub_llm import StubLLM
+
+
+def make_messages(transcripts: int, prefix: str):
+    """(session_id, message) pairs, interleaved across sessions like a recorded log."""
+    sessions = [
+        (f"{prefix}-{name}-{i}", messages)
+        for i in range(transcripts // len(SCENARIOS) + 1)
+        for name, messages in SCENARIOS
+    ][:transcripts]
+
+    pairs = []
+    for turn in range(max(len(messages) for _, messages in sessions)):
+        for session_id, messages in sessions:
+            if turn < len(messages):
+                pairs.append((session_id, messages[turn]))
+    return pairs
+
+
+def run(transcripts: int, llm_latency_ms: float, workers: int):
+    stub = StubLLM(latency_ms=llm_latency_ms)
+    app_module = _load_app(stub, defaultdict(list), tracing=False)
+    app_module.BATCH_WORKERS = workers
+
+    # --- sequential: one call per message ---
+    sequential = make_messages(transcripts, "seq")
+    t0 = time.perf_counter()
+    sequential_replies = [
+        app_module.chat(app_module.ChatRequest(session_id=sid, message=msg)).reply
+        for sid, msg in sequential
+    ]
+    sequential_time = time.perf_counter() - t0
+
+    # --- one batch call ---
+    batch = make_messages(transcripts, "batch")
+    request = app_module.BatchChatRequest(
+        messages=[app_module.ChatRequest(session_id=sid, message=msg) for sid, msg in batch]
+    )
+    t0 = time.perf_counter()
+    response = app_module.chat_batch(request)
+    batch_time = time.perf_counter() - t0
+
+    batch_replies = [r.reply for r in response.results]
+    mismatches = sum(a != b for a, b in zip(sequential_replies, batch_replies))
+    errors = sum(r.error is not None for r in response.results)
+
+    turns_per_transcript = len(batch) / transcripts
+    return {
+        "benchmark": "chat_batch",
+        "config": {"transcripts": transcripts, "messages": len(batch),
+                   "llm_latency_ms": llm_latency_ms, "workers": workers},
+        "sequential_turns_per_sec": round(len(sequential) / sequential_time, 2),
+        "batch_turns_per_sec": round(len(batch) / batch_time, 2),
+        "speedup": round(sequential_time / batch_time, 2),
+        "projected_10k_transcripts_min": round(10_000 * turns_per_transcript / (len(batch) / batch_time) / 60, 1),
+        "reply_mismatches": mismatches,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/chat/batch replay benchmark")
+    parser.add_argument("--transcripts", type=int, default=70)
+    parser.add_argument("--llm-latency-ms", type=float, default=20.0)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.transcripts, args.llm_latency_ms, args.workers)
+    write_results(args.output or default_output("chat_batch"), results)
+
+    print(f"Sequential: {results['sequential_turns_per_sec']:>10.1f} turns/sec")
+    print(f"Batch:      {results['batch_turns_per_sec']:>10.1f} turns/sec  (x{results['speedup']})")
+    print(f"Projected 10k-transcript replay: {results['projected_10k_transcripts_min']} min")
+    print(f"Reply mismatches: {results['reply_mismatches']}  errors: {results['errors']}")
+
+
+if __name__ == "__main__":
+    main()
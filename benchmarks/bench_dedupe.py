@@ -0,0 +1,100 @@
+# benchmarks/bench_dedupe.py
+"""
+Near-duplicate chunk elimination on a synthetic bank-PDF corpus.
+
+Every page gets a few unique paragraphs plus the boilerplate real bank
+PDFs repeat (T&C paragraph, disclaimer, footer with the page number);
+pages are chunked with rag.chunker.create_chunks (CHUNK_SIZE /
+CHUNK_OVERLAP as configured) and then passed through dedupe_chunks.
+
+Reports the dedupe_report() savings, run time and a precision check:
+the exact word-shingle Jaccard between each removed chunk and the
+canonical chunk that replaced it (the minimum should stay near THRESHOLD).
+
+Usage:
+    python -m benchmarks.bench_dedupe --pdfs 10 --pages 30
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import default_output, write_results
+from rag.chunker import create_chunks
+from rag.dedupe import THRESHOLD, dedupe_chunks, dedupe_report, jaccard, shingles
+
+BOILERPLATE = (
+    "Terms and conditions apply. The bank reserves the right to revise interest rates, fees and "
+    "charges at its sole discretion. Loans are sanctioned subject to credit appraisal, verification "
+    "of documents and the bank's internal policies, which may change without prior notice.",
+    "Disclaimer: the information in this document is indicative and for general guidance only. "
+    "It does not constitute an offer or a commitment to lend. Please contact your nearest branch "
+    "or visit the official website for the latest product features and eligibility criteria.",
+)
+
+VOCABULARY = (
+    "loan tenure interest rate processing fee prepayment foreclosure borrower applicant income "
+    "salary property valuation margin collateral repayment instalment floating fixed repo linked "
+    "spread credit score documents branch sanction disbursement insurance penalty schedule account"
+).split()
+
+
+def make_corpus(pdfs: int, pages: int, seed: int = 7):
+    rng = random.Random(seed)
+    raw_data = []
+    for p in range(pdfs):
+        pdf_pages = []
+        for page_num in range(1, pages + 1):
+            unique = [
+                " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(40, 90))).capitalize() + "."
+                for _ in range(rng.randint(1, 3))
+            ]
+            text = "\n\n".join(unique + list(BOILERPLATE) + [f"Page {page_num} of {pages} | Retail Lending"])
+            pdf_pages.append({"page_num": page_num, "text": text, "tables": []})
+        raw_data.append({"pdf_name": f"product-{p}.pdf", "pages": pdf_pages})
+    return raw_data
+
+
+def run(pdfs: int, pages: int):
+    chunks = create_chunks(make_corpus(pdfs, pages))
+
+    t0 = time.perf_counter()
+    deduped = dedupe_chunks(chunks)
+    elapsed = time.perf_counter() - t0
+
+    by_id = {c["id"]: c for c in chunks}
+    similarities = [
+        jaccard(shingles(by_id[dup]["content"]), shingles(canonical["content"]))
+        for canonical in deduped
+        for dup in canonical.get("duplicate_ids", ())
+    ]
+
+    return {
+        "benchmark": "dedupe",
+        "config": {"pdfs": pdfs, "pages": pages, "threshold": THRESHOLD},
+        **dedupe_report(chunks, deduped),
+        "dedupe_ms": round(elapsed * 1000, 1),
+        "chunks_per_sec": round(len(chunks) / elapsed, 1),
+        "merged_min_jaccard": round(min(similarities), 3) if similarities else None,
+        "max_source_pages": max(len(c["source_pages"]) for c in deduped),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MinHash chunk dedupe benchmark")
+    parser.add_argument("--pdfs", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=30)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.pdfs, args.pages)
+    write_results(args.output or default_output("dedupe"), results)
+
+    print(f"Chunks: {results['chunks_before']} -> {results['chunks_after']} "
+          f"({results['removed_pct']}% removed) in {results['dedupe_ms']} ms")
+    print(f"Embedding calls saved: {results['embedding_calls_saved']}   "
+          f"index saved: {results['index_bytes_saved'] / 1e6:.1f} MB")
+    print(f"Lowest exact Jaccard among merged chunks: {results['merged_min_jaccard']}")
+
+
+if __name__ == "__main__":
+    main()
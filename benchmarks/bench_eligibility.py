@@ -0,0 +1,113 @@
+# benchmarks/bench_eligibility.py
+"""
+Eligibility scoring throughput: per-record scalar rules vs the vectorized
+rule engine (tools/eligibility.py), plus the chunked CSV CLI end to end.
+
+Usage:
+    python -m benchmarks.bench_eligibility --records 1000000
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import default_output, write_results
+from tools.eligibility import score_batch, score_csv
+
+COLUMNS = ["customer_id", "age", "employment_type", "monthly_income", "monthly_expenses", "tenure_years"]
+
+
+def make_applicants(records: int, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    return {
+        "customer_id": np.arange(records),
+        "age": rng.integers(18, 70, records),
+        "employment_type": rng.choice(np.array(["salaried", "self_employed"]), records),
+        "monthly_income": np.round(rng.uniform(15_000, 500_000, records), 2),
+        "monthly_expenses": np.round(rng.uniform(0, 200_000, records), 2),
+        "tenure_years": rng.integers(5, 31, records),
+    }
+
+
+def legacy_scalar(age, employment_type, income, expenses, tenure):
+    """The former loan_flow._calculate_eligibility rules, one record at a time."""
+    if age < 21 or age > 65:
+        return 0.0
+    if tenure > (65 - age):
+        return 0.0
+    net_income = income - expenses
+    if net_income <= 0:
+        return 0.0
+    income_multiplier = 0.85 if "self" in employment_type.lower() else 1.0
+    eligible_emi = net_income * 0.5 * income_multiplier
+    monthly_rate = 8.75 / (12 * 100)
+    months = tenure * 12
+    return eligible_emi * ((1 + monthly_rate) ** months - 1) / (monthly_rate * (1 + monthly_rate) ** months)
+
+
+def run(records: int, scalar_records: int, csv_records: int):
+    table = make_applicants(records)
+
+    # --- scalar ---
+    scalar_records = min(scalar_records, records)
+    rows = list(zip(*(table[c][:scalar_records].tolist() for c in COLUMNS[1:])))
+    t0 = time.perf_counter()
+    scalar_amounts = [legacy_scalar(*row) for row in rows]
+    scalar_time = time.perf_counter() - t0
+
+    # --- vectorized ---
+    t0 = time.perf_counter()
+    scores = score_batch(table, method="emi_capacity")
+    batch_time = time.perf_counter() - t0
+
+    mismatches = int(np.sum(
+        np.abs(np.asarray(scalar_amounts) - scores["eligible_amount"][:scalar_records]) > 0.01
+    ))
+
+    # --- CSV CLI (chunked streaming) ---
+    csv_records = min(csv_records, records)
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "applicants.csv")
+        dst = os.path.join(tmp, "scored.csv")
+        with open(src, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            writer.writerows(zip(*(table[c][:csv_records].tolist() for c in COLUMNS)))
+
+        t0 = time.perf_counter()
+        score_csv(src, dst, chunk_size=100_000)
+        csv_time = time.perf_counter() - t0
+
+    return {
+        "benchmark": "eligibility",
+        "config": {"records": records, "scalar_records": scalar_records, "csv_records": csv_records},
+        "scalar_records_per_sec": round(scalar_records / scalar_time, 1),
+        "vectorized_records_per_sec": round(records / batch_time, 1),
+        "csv_records_per_sec": round(csv_records / csv_time, 1),
+        "eligible_share": round(float(scores["eligible"].mean()), 4),
+        "mismatches_vs_scalar": mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Eligibility scoring benchmark")
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--scalar-records", type=int, default=200_000)
+    parser.add_argument("--csv-records", type=int, default=200_000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.records, args.scalar_records, args.csv_records)
+    write_results(args.output or default_output("eligibility"), results)
+
+    print(f"Scalar:     {results['scalar_records_per_sec']:>14,.0f} records/sec")
+    print(f"Vectorized: {results['vectorized_records_per_sec']:>14,.0f} records/sec")
+    print(f"CSV CLI:    {results['csv_records_per_sec']:>14,.0f} records/sec")
+    print(f"Mismatches vs scalar rules: {results['mismatches_vs_scalar']}")
+
+
+if __name__ == "__main__":
+    main()
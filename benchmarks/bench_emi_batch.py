@@ -0,0 +1,124 @@
+# benchmarks/bench_emi_batch.py
+"""
+Scalar vs vectorized EMI / amortization throughput.
+
+Generates random loan scenarios, builds full amortization schedules with
+the scalar amortization_schedule() loop and with amortization_matrix(),
+checks that both agree to the paisa and reports rows/sec for each.
+
+The closed form and the scalar loop accumulate floating-point error
+differently, so a value sitting on a half-paisa boundary can round one
+paisa apart; those cells are reported separately as `one_paisa_ties`.
+
+Usage:
+    python -m benchmarks.bench_emi_batch --loans 5000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import default_output, write_results
+from tools.emi import amortization_matrix, amortization_schedule, calculate_emi, calculate_emi_batch
+
+
+def make_scenarios(loans: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    principal = np.round(rng.uniform(1e5, 1e7, loans), 2)
+    rate = np.round(rng.uniform(6.0, 14.0, loans), 2)
+    tenure = rng.integers(12, 361, loans)
+    return principal, rate, tenure
+
+
+def run(loans: int, scalar_loans: int):
+    principal, rate, tenure = make_scenarios(loans)
+
+    # --- scalar loop (subset, it is slow) ---
+    scalar_loans = min(scalar_loans, loans)
+    t0 = time.perf_counter()
+    scalar_rows = 0
+    scalar_schedules = []
+    for p, r, n in zip(principal[:scalar_loans].tolist(), rate[:scalar_loans].tolist(),
+                       tenure[:scalar_loans].tolist()):
+        calculate_emi(p, r, n)
+        schedule = amortization_schedule(p, r, n, rows=n)
+        scalar_rows += len(schedule)
+        scalar_schedules.append(schedule)
+    scalar_time = time.perf_counter() - t0
+
+    # --- vectorized ---
+    t0 = time.perf_counter()
+    totals = calculate_emi_batch(principal, rate, tenure)
+    matrix = amortization_matrix(principal, rate, tenure)
+    batch_time = time.perf_counter() - t0
+    batch_rows = int(matrix["mask"].sum())
+
+    # --- agreement check on the scalar subset ---
+    mismatched_cells = 0
+    one_paisa_ties = 0
+    max_abs_diff = 0.0
+
+    def check(expected, got):
+        nonlocal mismatched_cells, one_paisa_ties, max_abs_diff
+        diff = abs(expected - got)
+        max_abs_diff = max(max_abs_diff, diff)
+        if diff > 0.01 + 1e-9:
+            mismatched_cells += 1
+        elif diff > 0.005:
+            one_paisa_ties += 1
+
+    for i, schedule in enumerate(scalar_schedules):
+        emi, total_payment, total_interest = calculate_emi(
+            float(principal[i]), float(rate[i]), int(tenure[i])
+        )
+        check(emi, totals["emi"][i])
+        check(total_payment, totals["total_payment"][i])
+        check(total_interest, totals["total_interest"][i])
+
+        for row in schedule:
+            m = row["month"] - 1
+            for key in ("opening", "interest", "closing"):
+                check(row[key], matrix[key][i, m])
+
+    return {
+        "benchmark": "emi_batch",
+        "config": {"loans": loans, "scalar_loans": scalar_loans},
+        "scalar": {
+            "rows": scalar_rows,
+            "seconds": round(scalar_time, 4),
+            "rows_per_sec": round(scalar_rows / scalar_time, 1),
+        },
+        "vectorized": {
+            "rows": batch_rows,
+            "seconds": round(batch_time, 4),
+            "rows_per_sec": round(batch_rows / batch_time, 1),
+        },
+        "speedup": round((batch_rows / batch_time) / (scalar_rows / scalar_time), 1),
+        "agreement": {
+            "mismatched_cells": mismatched_cells,
+            "one_paisa_ties": one_paisa_ties,
+            "max_abs_diff": round(float(max_abs_diff), 6),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scalar vs vectorized EMI benchmark")
+    parser.add_argument("--loans", type=int, default=5000)
+    parser.add_argument("--scalar-loans", type=int, default=1000,
+                        help="How many loans to run through the scalar loop")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.loans, args.scalar_loans)
+    write_results(args.output or default_output("emi_batch"), results)
+
+    print(f"Scalar:     {results['scalar']['rows_per_sec']:>14,.0f} rows/sec")
+    print(f"Vectorized: {results['vectorized']['rows_per_sec']:>14,.0f} rows/sec")
+    print(f"Speedup:    {results['speedup']}x")
+    print(f"Cells off by more than a paisa: {results['agreement']['mismatched_cells']} "
+          f"(half-paisa ties: {results['agreement']['one_paisa_ties']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# benchmarks/bench_import_time.py
+"""
+Startup profile: how long importing each entry point takes, and why.
+
+Every target is imported `--repeat` times in a fresh interpreter with
+`python -X importtime`; the per-module report is parsed and aggregated:
+
+  - total import time of the target (median over runs)
+  - self time per top-level package (numpy, fastapi, vertexai, ...)
+  - the slowest individual modules (cumulative)
+  - which heavy SDKs the target pulls in at all
+
+Heavy SDKs should only be loaded on first use, so a non-empty
+`heavy_imports` list for a light module (agent.state, tools.emi, ...)
+is a regression.
+
+Usage:
+    python -m benchmarks.bench_import_time --repeat 5
+    python -m benchmarks.bench_import_time --targets tools.emi backend.app
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from benchmarks.common import default_output, write_results
+
+TARGETS = (
+    "agent.state",
+    "tools.emi",
+    "agent.llm_vertex",
+    "tools.rag",
+    "backend.graph",
+    "backend.app",
+    "cli_app",
+)
+
+HEAVY_PACKAGES = ("vertexai", "chromadb", "langgraph", "langchain_text_splitters", "numpy", "pdfplumber")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def profile_import(module: str):
+    """
+    Import `module` in a fresh interpreter.
+    Returns [(name, self_us, cumulative_us, depth), ...] in report order.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def summarize_target(module: str, repeat: int, top: int):
+    totals = []
+    package_self = defaultdict(list)
+    module_cumulative = defaultdict(list)
+    loaded = set()
+
+    for _ in range(repeat):
+        rows = profile_import(module)
+        totals.append(next(c for name, _, c, depth in rows if name == module and depth == 0))
+
+        per_package = defaultdict(int)
+        for name, self_us, cumulative_us, _ in rows:
+            per_package[name.split(".")[0]] += self_us
+            module_cumulative[name].append(cumulative_us)
+            loaded.add(name)
+        for package, self_us in per_package.items():
+            package_self[package].append(self_us)
+
+    def ms(values):
+        return round(statistics.median(values) / 1000, 2)
+
+    packages = sorted(((p, ms(v)) for p, v in package_self.items()), key=lambda x: -x[1])
+    modules = sorted(
+        ((m, ms(v)) for m, v in module_cumulative.items() if m != module), key=lambda x: -x[1]
+    )
+    return {
+        "total_ms": ms(totals),
+        "modules_loaded": len(loaded),
+        "heavy_imports": sorted(p for p in HEAVY_PACKAGES if p in loaded),
+        "top_packages_self_ms": dict(packages[:top]),
+        "top_modules_cumulative_ms": dict(modules[:top]),
+    }
+
+
+def run(targets, repeat: int, top: int):
+    results = {}
+    for module in targets:
+        try:
+            results[module] = summarize_target(module, repeat, top)
+        except RuntimeError as e:
+            results[module] = {"error": str(e)}
+    return {
+        "benchmark": "import_time",
+        "config": {"repeat": repeat, "top": top, "python": sys.version.split()[0]},
+        "targets": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time (startup) profile")
+    parser.add_argument("--targets", nargs="+", default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.targets, args.repeat, args.top)
+    write_results(args.output or default_output("import_time"), results)
+
+    for module, stats in results["targets"].items():
+        if "error" in stats:
+            print(f"{module:<20} failed: {stats['error']}")
+            continue
+        heavy = ", ".join(stats["heavy_imports"]) or "-"
+        print(f"{module:<20} {stats['total_ms']:>9.1f} ms  {stats['modules_loaded']:>5} modules  heavy: {heavy}")
+        for package, ms in list(stats["top_packages_self_ms"].items())[:5]:
+            print(f"    {package:<28} {ms:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
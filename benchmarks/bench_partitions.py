@@ -0,0 +1,152 @@
+# benchmarks/bench_partitions.py
+"""
+Partition-aware retrieval vs searching the whole collection.
+
+Synthetic corpus: every product family (home loan, personal loan, credit
+card) has chunks on the same shared topics (fees, foreclosure, documents,
+...), plus product-neutral "general" chunks. A chunk vector is its topic
+plus a smaller product component plus noise. A question about one
+product's foreclosure terms is therefore close to every product's
+foreclosure chunks. That is the precision problem partitions fix.
+
+For each query, the whole store is searched and then only the query's
+partitions (its product + general). The benchmark reports:
+
+  precision@k    share of retrieved chunks from the right product (or general)
+  rows_scored    vectors scored per query
+  p50/p95 ms     search latency (CompressedVectorStore, --dtype, no re-scoring)
+
+It also times select_partitions() and checks it against a small set of
+labelled questions.
+
+Usage:
+    python -m benchmarks.bench_partitions --chunks 60000 --k 4
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import default_output, summarize, write_results
+from rag.partitions import GENERAL, PARTITION_KEY, PARTITIONS, select_partitions
+from rag.vector_compression import DTYPES, CompressedVectorStore
+
+PRODUCTS = [p for p in PARTITIONS if p != GENERAL]
+
+# Topic dominates a chunk's vector; the product component is weaker than the noise
+PRODUCT_WEIGHT = 0.15
+NOISE = 0.7
+
+# (question, flow, expected partitions or None for "search everything")
+LABELLED_QUESTIONS = [
+    ("What is the processing fee on a home loan?", None, ("home_loan", GENERAL)),
+    ("Can I transfer my housing loan balance from another bank?", None, ("home_loan", GENERAL)),
+    ("What documents do I need for a personal loan?", None, ("personal_loan", GENERAL)),
+    ("Is there a foreclosure charge on personal loans?", None, ("personal_loan", GENERAL)),
+    ("How is the annual fee on my credit card waived?", None, ("credit_card", GENERAL)),
+    ("What are the late payment charges on credit cards?", None, ("credit_card", GENERAL)),
+    ("How do reward points work?", None, ("credit_card", GENERAL)),
+    ("What are the foreclosure charges?", "LOAN", ("home_loan", GENERAL)),
+    ("Which documents are needed?", "LOAN", ("home_loan", GENERAL)),
+    ("Is a PAN card mandatory?", "LOAN", ("home_loan", GENERAL)),
+    ("Can I pay the processing fee with my credit card?", "LOAN", ("credit_card", "home_loan", GENERAL)),
+    ("Is a PAN card mandatory?", None, None),
+    ("What is a loan against property?", None, None),
+    ("How is EMI calculated?", None, None),
+    ("What is the repo rate?", None, None),
+    ("Compare personal loan and credit card interest rates", None, ("personal_loan", "credit_card", GENERAL)),
+]
+
+
+def synthetic_corpus(n, dim, topics, seed=7):
+    rng = np.random.default_rng(seed)
+    topic_centers = rng.normal(size=(topics, dim))
+    product_centers = {p: rng.normal(size=dim) for p in PARTITIONS}
+
+    families = rng.choice(PARTITIONS, n, p=[0.3, 0.3, 0.3, 0.1])
+    chunk_topics = rng.integers(0, topics, n)
+    vectors = np.stack([product_centers[p] for p in families]) * PRODUCT_WEIGHT
+    vectors += topic_centers[chunk_topics] + NOISE * rng.normal(size=(n, dim))
+    chunks = [{"id": str(i), PARTITION_KEY: str(p)} for i, p in enumerate(families)]
+    return chunks, vectors.astype(np.float32), topic_centers, product_centers
+
+
+def synthetic_queries(count, dim, topic_centers, product_centers, seed=8):
+    rng = np.random.default_rng(seed)
+    families = rng.choice(PRODUCTS, count)
+    topics = rng.integers(0, len(topic_centers), count)
+    vectors = np.stack([product_centers[p] for p in families]) * PRODUCT_WEIGHT
+    vectors += topic_centers[topics] + NOISE * rng.normal(size=(count, dim))
+    return list(families), vectors.astype(np.float32)
+
+
+def evaluate(store, families, queries, k, partitioned):
+    latencies, hits, scored = [], 0, 0
+    for family, query in zip(families, queries):
+        partitions = (family, GENERAL)
+        t0 = time.perf_counter()
+        rows = store.partition_rows(partitions) if partitioned else None
+        results = store.search(query, k=k, rows=rows)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        hits += sum(r[PARTITION_KEY] in partitions for r in results)
+        scored += len(rows) if rows is not None else len(store.chunks)
+    return {
+        f"precision_at_{k}": round(hits / (k * len(queries)), 4),
+        "rows_scored": round(scored / len(queries)),
+        "p50_ms": summarize(latencies)["p50"],
+        "p95_ms": summarize(latencies)["p95"],
+    }
+
+
+def classifier_check(repeat=200):
+    correct = [select_partitions(q, flow) == expected for q, flow, expected in LABELLED_QUESTIONS]
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for q, flow, _ in LABELLED_QUESTIONS:
+            select_partitions(q, flow)
+    per_call_us = (time.perf_counter() - t0) / (repeat * len(LABELLED_QUESTIONS)) * 1e6
+    misses = [q for (q, _, _), ok in zip(LABELLED_QUESTIONS, correct) if not ok]
+    return {"accuracy": round(sum(correct) / len(correct), 3), "per_call_us": round(per_call_us, 1), "misses": misses}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partition-aware retrieval benchmark")
+    parser.add_argument("--chunks", type=int, default=60_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--topics", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--dtype", choices=DTYPES, default="int8")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    chunks, vectors, topic_centers, product_centers = synthetic_corpus(args.chunks, args.dim, args.topics)
+    families, queries = synthetic_queries(args.queries, args.dim, topic_centers, product_centers)
+    store = CompressedVectorStore.build(chunks, vectors, dtype=args.dtype, keep_full=False)
+    store.partition_rows(PARTITIONS)   # build the row lists outside the timed loop
+
+    results = {
+        "whole_collection": evaluate(store, families, queries, args.k, partitioned=False),
+        "partitioned": evaluate(store, families, queries, args.k, partitioned=True),
+        "classifier": classifier_check(),
+    }
+    write_results(args.output or default_output("partitions"), {
+        "benchmark": "partitions",
+        "config": {"chunks": args.chunks, "dim": args.dim, "topics": args.topics,
+                   "queries": args.queries, "k": args.k, "dtype": args.dtype},
+        **results,
+    })
+
+    for name in ("whole_collection", "partitioned"):
+        r = results[name]
+        print(f"{name:>17}  precision@{args.k} {r[f'precision_at_{args.k}']:.3f}  "
+              f"rows {r['rows_scored']:>7,}  p50 {r['p50_ms']:.2f} ms  p95 {r['p95_ms']:.2f} ms")
+    c = results["classifier"]
+    print(f"       classifier  accuracy {c['accuracy']:.0%} on {len(LABELLED_QUESTIONS)} questions, "
+          f"{c['per_call_us']} us / call")
+    for q in c["misses"]:
+        print(f"         miss: {q}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_pdf_extraction.py
+"""
+PDF extraction: table pre-check and per-page cache.
+
+Generates a synthetic PDF (prose pages, a ruled table every
+`--table-every` pages) and times extract_all_pdfs():
+
+  legacy       extract_text + extract_tables on every page, no cache
+  precheck     table extraction only where ruling lines allow a table
+  cold cache   precheck + writing the page cache
+  warm cache   unchanged corpus, every page from the cache
+  edited       `--edit-pct` of the pages changed, the rest cached
+
+Outputs of all runs must be identical to the legacy run (the edited run
+is compared with a fresh extraction of the edited file).
+
+Usage:
+    python -m benchmarks.bench_pdf_extraction --pages 200
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import pdfplumber
+
+from benchmarks.common import default_output, write_results
+from benchmarks.synthetic_pdf import page_content, write_pdf
+from rag.pdf_extraction import extract_all_pdfs, table_to_string
+
+
+def legacy_extract(pdf_folder):
+    """extract_all_pdfs() before the pre-check and cache."""
+    data = []
+    for filename in sorted(os.listdir(pdf_folder)):
+        pages = []
+        with pdfplumber.open(os.path.join(pdf_folder, filename)) as pdf:
+            for i, page in enumerate(pdf.pages, start=1):
+                tables = [table_to_string(t) for t in page.extract_tables() or []]
+                pages.append({"page_num": i, "text": page.extract_text() or "", "tables": tables})
+        data.append({"pdf_name": filename, "pages": pages})
+    return data
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, round(time.perf_counter() - t0, 3)
+
+
+def run(pages: int, table_every: int, edit_pct: float):
+    workdir = tempfile.mkdtemp(prefix="bench_pdf_")
+    try:
+        pdf_folder = os.path.join(workdir, "pdfs")
+        cache_dir = os.path.join(workdir, "cache")
+        os.makedirs(pdf_folder)
+        write_pdf(os.path.join(pdf_folder, "compendium.pdf"), pages, table_every)
+
+        legacy, legacy_s = timed(legacy_extract, pdf_folder)
+        precheck, precheck_s = timed(extract_all_pdfs, pdf_folder, cache_dir=None)
+        cold, cold_s = timed(extract_all_pdfs, pdf_folder, cache_dir=cache_dir)
+        warm, warm_s = timed(extract_all_pdfs, pdf_folder, cache_dir=cache_dir)
+
+        # edit a few pages: same layout, different text
+        edited_pages = set(range(1, pages + 1, max(1, round(100 / edit_pct)))) if edit_pct else set()
+
+        def edited_content(page_num, table_every, seed):
+            return page_content(page_num, table_every, seed + (page_num in edited_pages))
+
+        write_pdf(os.path.join(pdf_folder, "compendium.pdf"), pages, table_every, content=edited_content)
+        edited, edited_s = timed(extract_all_pdfs, pdf_folder, cache_dir=cache_dir)
+        edited_fresh = extract_all_pdfs(pdf_folder, cache_dir=None)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "benchmark": "pdf_extraction",
+        "config": {"pages": pages, "table_every": table_every, "edited_pages": len(edited_pages)},
+        "seconds": {
+            "legacy": legacy_s,
+            "precheck": precheck_s,
+            "cold_cache": cold_s,
+            "warm_cache": warm_s,
+            "edited": edited_s,
+        },
+        "pages_per_sec_legacy": round(pages / legacy_s, 1),
+        "pages_per_sec_precheck": round(pages / precheck_s, 1),
+        "warm_speedup": round(legacy_s / warm_s, 1),
+        "outputs_match": precheck == legacy and cold == legacy and warm == legacy and edited == edited_fresh,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF extraction benchmark")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--table-every", type=int, default=5)
+    parser.add_argument("--edit-pct", type=float, default=5.0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.pages, args.table_every, args.edit_pct)
+    write_results(args.output or default_output("pdf_extraction"), results)
+
+    for name, seconds in results["seconds"].items():
+        print(f"{name:<12} {seconds:>8.2f} s")
+    print(f"Warm cache speedup: x{results['warm_speedup']}   outputs match: {results['outputs_match']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_pdf_memory.py
+"""
+Peak memory of PDF extraction vs page count.
+
+For each size in `--pages`, writes a synthetic PDF and extracts it in a
+fresh process with
+  legacy     every page through pdf.pages, all kept until the file is done
+  streaming  stream_all_pdfs(): one page at a time, caches released, JSONL out
+and records the peak RSS (ru_maxrss) of that process. Streaming should
+stay flat as the page count grows.
+
+Usage:
+    python -m benchmarks.bench_pdf_memory --pages 100 200 400
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import default_output, write_results
+from benchmarks.synthetic_pdf import write_pdf
+
+MODES = ("legacy", "streaming")
+
+
+def child(mode, pdf_folder, output_path):
+    """Runs in the measured process; prints one JSON line."""
+    t0 = time.perf_counter()
+    if mode == "legacy":
+        from benchmarks.bench_pdf_extraction import legacy_extract
+        pages = sum(len(pdf["pages"]) for pdf in legacy_extract(pdf_folder))
+    else:
+        from rag.pdf_extraction import stream_all_pdfs
+        pages = stream_all_pdfs(pdf_folder, output_path, cache_dir=None)
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KB on Linux
+    print(json.dumps({"pages": pages, "peak_rss_mb": round(peak_kb / 1024, 1),
+                      "seconds": round(time.perf_counter() - t0, 2)}))
+
+
+def measure(mode, pdf_folder, output_path):
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_pdf_memory", "--child", mode, pdf_folder, output_path],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(sizes):
+    workdir = tempfile.mkdtemp(prefix="bench_pdf_memory_")
+    results = {mode: {} for mode in MODES}
+    try:
+        for pages in sizes:
+            pdf_folder = os.path.join(workdir, f"pdfs-{pages}")
+            os.makedirs(pdf_folder)
+            write_pdf(os.path.join(pdf_folder, "compendium.pdf"), pages)
+            for mode in MODES:
+                results[mode][pages] = measure(mode, pdf_folder, os.path.join(workdir, "pages.jsonl"))
+            shutil.rmtree(pdf_folder)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    def growth(mode):
+        first, last = results[mode][sizes[0]], results[mode][sizes[-1]]
+        if sizes[-1] == sizes[0]:
+            return 0.0
+        return round((last["peak_rss_mb"] - first["peak_rss_mb"]) / (sizes[-1] - sizes[0]) * 100, 1)
+
+    return {
+        "benchmark": "pdf_memory",
+        "config": {"pages": sizes},
+        "runs": results,
+        "rss_growth_mb_per_100_pages": {mode: growth(mode) for mode in MODES},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF extraction memory benchmark")
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 200, 400])
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "PDF_FOLDER", "OUTPUT"), help=argparse.SUPPRESS)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    results = run(sorted(args.pages))
+    write_results(args.output or default_output("pdf_memory"), results)
+
+    for mode in MODES:
+        for pages, run_ in results["runs"][mode].items():
+            print(f"{mode:<10} {pages:>6} pages  peak RSS {run_['peak_rss_mb']:>8.1f} MB  {run_['seconds']:>7.1f} s")
+    print(f"RSS growth per 100 pages: {results['rss_growth_mb_per_100_pages']}")
+
+
+if __name__ == "__main__":
+    main()
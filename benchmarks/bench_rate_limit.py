@@ -0,0 +1,63 @@
+# benchmarks/bench_rate_limit.py
+"""
+Per-request cost of the rate limiter (backend/rate_limit.py), with a
+small set of active sessions and with a flood of new session_ids
+(LRU-bounded buckets).
+
+Usage:
+    python -m benchmarks.bench_rate_limit --requests 200000
+"""
+import argparse
+import time
+
+from backend.rate_limit import Limit, RateLimited, RateLimiter
+from benchmarks.common import default_output, write_results
+
+# Generous limits: measure the bookkeeping, not rejections
+LIMITS = {scope: Limit(1e9, 1e9) for scope in
+          ("session", "ip", "tenant", "new_session", "llm_ip", "llm_tenant")}
+
+
+def measure(requests: int, sessions: int):
+    limiter = RateLimiter(LIMITS)
+    rejected = 0
+    t0 = time.perf_counter()
+    for i in range(requests):
+        try:
+            limiter.check_request(f"s{i % sessions}", f"10.0.{i % 250}.{i % 7}", "tenant-a",
+                                  new_session=i < sessions)
+            limiter.charge_llm(f"10.0.{i % 250}.{i % 7}", "tenant-a", 2)
+        except RateLimited:
+            rejected += 1
+    elapsed = time.perf_counter() - t0
+    return {
+        "us_per_request": round(elapsed / requests * 1e6, 3),
+        "session_buckets": sum(key.startswith("session:") for key in limiter._store._buckets),
+        "rejected": rejected,
+    }
+
+
+def run(requests: int):
+    return {
+        "benchmark": "rate_limit",
+        "config": {"requests": requests},
+        "active_sessions": measure(requests, 1_000),
+        "session_flood": measure(requests, requests),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rate limiter overhead benchmark")
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.requests)
+    write_results(args.output or default_output("rate_limit"), results)
+    for name in ("active_sessions", "session_flood"):
+        r = results[name]
+        print(f"{name:<16} {r['us_per_request']:.2f} µs/request  session buckets kept: {r['session_buckets']}")
+
+
+if __name__ == "__main__":
+    main()
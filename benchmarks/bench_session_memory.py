@@ -0,0 +1,152 @@
+# benchmarks/bench_session_memory.py
+"""
+Bytes per session and snapshot cost: the slotted ConversationState
+(agent/state.py) against the former dict-based state, copied below.
+
+Every session goes through the same lifecycle without any LLM calls:
+complete an EMI calculation, start a loan flow, get interrupted (pause),
+resume. Memory is measured with tracemalloc over all sessions and with
+deep_sizeof on one session.
+
+Usage:
+    python -m benchmarks.bench_session_memory --sessions 100000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from agent.state import ConversationState
+from benchmarks.common import deep_sizeof, default_output, write_results
+
+
+@dataclass
+class LegacyConversationState:
+    """agent/state.py before slotted state (dict slots, dict snapshots)."""
+
+    active_flow: Optional[str] = None
+    awaiting_field: Optional[str] = None
+    slots: Dict[str, Any] = field(default_factory=dict)
+    paused_flow: Optional[Dict[str, Any]] = None
+    last_completed_flow: Optional[Dict[str, Any]] = None
+
+    def pause_current_flow(self):
+        self.paused_flow = {
+            "flow": self.active_flow,
+            "awaiting_field": self.awaiting_field,
+            "slots": self.slots.copy(),
+        }
+        self.active_flow = None
+        self.awaiting_field = None
+
+    def resume_paused_flow(self):
+        if not self.paused_flow:
+            return
+        self.active_flow = self.paused_flow["flow"]
+        self.awaiting_field = self.paused_flow["awaiting_field"]
+        self.slots = self.paused_flow["slots"]
+        self.paused_flow = None
+
+    # The completion / reopen steps graph.py used to inline
+    def complete_flow(self):
+        self.last_completed_flow = {"flow": self.active_flow, "slots": self.slots.copy()}
+        self.active_flow = None
+        self.awaiting_field = None
+
+    def reopen_completed_flow(self):
+        self.active_flow = self.last_completed_flow["flow"]
+        self.slots = self.last_completed_flow["slots"].copy()
+        self.last_completed_flow = None
+
+
+def lifecycle(state, i: int):
+    """EMI done → loan half filled → interrupted by a question (paused)."""
+    state.active_flow = "EMI"
+    state.slots["principal"] = float(500_000 + i)
+    state.slots["rate"] = 8.75
+    state.slots["tenure_months"] = 240
+    state.complete_flow()
+
+    state.slots.clear()
+    state.active_flow = "LOAN"
+    state.slots["loan_type"] = "fresh"
+    state.slots["age"] = 30 + i % 30
+    state.slots["employment_type"] = "salaried"
+    state.awaiting_field = "monthly_income"
+    state.pause_current_flow()
+    return state
+
+
+def measure_memory(cls, sessions: int):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = {f"session-{i}": lifecycle(cls(), i) for i in range(sessions)}
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    sample = next(iter(store.values()))
+    return {
+        "bytes_per_session": round((after - before) / sessions, 1),
+        "deep_sizeof_bytes": deep_sizeof(sample),
+    }
+
+
+def measure_snapshots(cls, rounds: int):
+    """Time one pause+resume and one complete+reopen round trip."""
+    state = lifecycle(cls(), 0)
+    state.resume_paused_flow()
+
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        state.pause_current_flow()
+        state.resume_paused_flow()
+    pause_resume = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        state.complete_flow()
+        state.reopen_completed_flow()
+    complete_reopen = time.perf_counter() - t0
+
+    return {
+        "pause_resume_us": round(pause_resume / rounds * 1e6, 3),
+        "complete_reopen_us": round(complete_reopen / rounds * 1e6, 3),
+    }
+
+
+def run(sessions: int, rounds: int):
+    results = {"benchmark": "session_memory", "config": {"sessions": sessions, "rounds": rounds}}
+    for name, cls in (("legacy", LegacyConversationState), ("slotted", ConversationState)):
+        results[name] = {**measure_memory(cls, sessions), **measure_snapshots(cls, rounds)}
+
+    results["memory_reduction"] = round(
+        1 - results["slotted"]["bytes_per_session"] / results["legacy"]["bytes_per_session"], 3
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session state memory benchmark")
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=100_000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.sessions, args.rounds)
+    write_results(args.output or default_output("session_memory"), results)
+
+    for name in ("legacy", "slotted"):
+        r = results[name]
+        print(
+            f"{name:<8} {r['bytes_per_session']:>8,.0f} B/session  "
+            f"pause+resume {r['pause_resume_us']:.2f}µs  "
+            f"complete+reopen {r['complete_reopen_us']:.2f}µs"
+        )
+    print(f"Memory reduction: {results['memory_reduction']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/bench_state_codec.py
+"""
+ConversationState serialization: the binary codec (agent/state_codec.py)
+against JSON and pickle — encoded size and encode / decode time.
+
+Usage:
+    python -m benchmarks.bench_state_codec --rounds 20000
+"""
+import argparse
+import json
+import pickle
+import time
+
+from agent.state import ConversationState, FlowSnapshot, Slots
+from agent.state_codec import decode_state, encode_state
+from benchmarks.bench_session_memory import lifecycle
+from benchmarks.common import default_output, write_results
+
+
+def sample_states():
+    """Representative sessions, from fresh to carrying both snapshots."""
+    fresh = ConversationState()
+
+    emi = ConversationState(active_flow="EMI", awaiting_field="tenure_months")
+    emi.slots.update({"principal": 2_500_000.0, "rate": 8.5})
+
+    sweep = ConversationState()
+    sweep.slots.update({
+        "principal": 2_500_000.0,
+        "sweep": {"rates": [8.5, 9.0, 9.5], "tenures_months": [180, 240, 300]},
+    })
+    sweep.active_flow = "EMI"
+    sweep.complete_flow()
+
+    return {"fresh": fresh, "emi_in_progress": emi, "emi_sweep_done": sweep,
+            "loan_paused_after_emi": lifecycle(ConversationState(), 7)}
+
+
+# --- JSON baseline (state -> plain dict) ---
+def _snapshot_to_dict(snapshot):
+    if snapshot is None:
+        return None
+    return {"flow": snapshot.flow, "awaiting_field": snapshot.awaiting_field, "slots": snapshot.slots}
+
+
+def _snapshot_from_dict(data):
+    if data is None:
+        return None
+    return FlowSnapshot(data["flow"], data["awaiting_field"], Slots(data["slots"]).freeze())
+
+
+def json_encode(state):
+    return json.dumps({
+        "active_flow": state.active_flow,
+        "awaiting_field": state.awaiting_field,
+        "slots": dict(state.slots.items()),
+        "paused_flow": _snapshot_to_dict(state.paused_flow),
+        "last_completed_flow": _snapshot_to_dict(state.last_completed_flow),
+    }, separators=(",", ":")).encode("utf-8")
+
+
+def json_decode(data):
+    raw = json.loads(data)
+    return ConversationState(
+        active_flow=raw["active_flow"],
+        awaiting_field=raw["awaiting_field"],
+        slots=Slots(raw["slots"]),
+        paused_flow=_snapshot_from_dict(raw["paused_flow"]),
+        last_completed_flow=_snapshot_from_dict(raw["last_completed_flow"]),
+    )
+
+
+CODECS = {
+    "binary": (encode_state, decode_state),
+    "json": (json_encode, json_decode),
+    "pickle": (lambda s: pickle.dumps(s, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+}
+
+
+def _time_us(fn, arg, rounds):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn(arg)
+    return round((time.perf_counter() - t0) / rounds * 1e6, 3)
+
+
+def run(rounds: int):
+    results = {"benchmark": "state_codec", "config": {"rounds": rounds}, "states": {}}
+
+    for state_name, state in sample_states().items():
+        per_codec = {}
+        for codec_name, (encode, decode) in CODECS.items():
+            data = encode(state)
+            assert repr(decode(data)) == repr(state), f"{codec_name} round trip failed for {state_name}"
+            per_codec[codec_name] = {
+                "bytes": len(data),
+                "encode_us": _time_us(encode, state, rounds),
+                "decode_us": _time_us(decode, data, rounds),
+            }
+        results["states"][state_name] = per_codec
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session state serialization benchmark")
+    parser.add_argument("--rounds", type=int, default=20_000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.rounds)
+    write_results(args.output or default_output("state_codec"), results)
+
+    print(f"{'state':<24}{'codec':<8}{'bytes':>7}{'encode µs':>11}{'decode µs':>11}")
+    for state_name, per_codec in results["states"].items():
+        for codec_name, r in per_codec.items():
+            print(f"{state_name:<24}{codec_name:<8}{r['bytes']:>7}{r['encode_us']:>11.2f}{r['decode_us']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
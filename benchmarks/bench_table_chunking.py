@@ -0,0 +1,96 @@
+# benchmarks/bench_table_chunking.py
+"""
+Table chunking: one chunk per table vs row groups with a repeated header.
+
+Builds synthetic pricing grids (`--rows` rows each, like the pricing-grid
+PDFs), chunks them with rag.chunker.create_chunks and compares the table
+chunks against the old "each table = one chunk" layout:
+
+  - table chunk size (chars): mean / max
+  - context chars sent to the LLM for a top-k retrieval that hits tables
+    (k chunks; the old layout sends whole tables)
+
+Every row group must start with the header and the groups must cover all
+rows exactly once.
+
+Usage:
+    python -m benchmarks.bench_table_chunking --tables 20 --rows 300
+"""
+import argparse
+import random
+
+from benchmarks.common import default_output, summarize, write_results
+from rag.chunker import TABLE_CHUNK_SIZE, create_chunks
+
+PRODUCTS = ("Home Loan", "Home Loan Top-up", "Loan Against Property", "Plot Loan", "Balance Transfer")
+SEGMENTS = ("Salaried", "Self-employed professional", "Self-employed non-professional")
+
+
+def make_table(rows: int, rng: random.Random):
+    lines = ["Product | Segment | CIBIL band | Tenure (yrs) | Rate (% p.a.) | Processing fee"]
+    for _ in range(rows):
+        lines.append(" | ".join([
+            rng.choice(PRODUCTS),
+            rng.choice(SEGMENTS),
+            f"{rng.randrange(600, 900, 25)}+",
+            str(rng.randint(1, 30)),
+            f"{rng.uniform(8.0, 12.5):.2f}",
+            f"{rng.choice((0.25, 0.35, 0.5, 1.0))}% (min Rs {rng.choice((3000, 5000, 10000))})",
+        ]))
+    return "\n".join(lines)
+
+
+def run(tables: int, rows: int, k: int, seed: int = 7):
+    rng = random.Random(seed)
+    table_texts = [make_table(rng.randint(rows // 4, rows), rng) for _ in range(tables)]
+    raw_data = [{
+        "pdf_name": "pricing-grid.pdf",
+        "pages": [{"page_num": i + 1, "text": "", "tables": [t]} for i, t in enumerate(table_texts)],
+    }]
+
+    chunks = create_chunks(raw_data)
+
+    # provenance check: header repeated, rows covered exactly once
+    for t_idx, text in enumerate(table_texts):
+        header = text.split("\n", 1)[0]
+        parts = [c for c in chunks if c["page_num"] == t_idx + 1]
+        assert all(c["content"].startswith(header) for c in parts)
+        covered = [r for c in parts for r in range(c["row_start"], c["row_end"] + 1)]
+        assert covered == list(range(1, text.count("\n") + 1))
+
+    old_sizes = [len(t) for t in table_texts]
+    new_sizes = [len(c["content"]) for c in chunks]
+
+    return {
+        "benchmark": "table_chunking",
+        "config": {"tables": tables, "max_rows": rows, "k": k, "table_chunk_size": TABLE_CHUNK_SIZE},
+        "table_chunks": {"one_per_table": len(old_sizes), "row_groups": len(new_sizes)},
+        "chunk_chars_one_per_table": summarize(old_sizes),
+        "chunk_chars_row_groups": summarize(new_sizes),
+        "context_chars_top_k_one_per_table": round(k * sum(old_sizes) / len(old_sizes)),
+        "context_chars_top_k_row_groups": round(k * sum(new_sizes) / len(new_sizes)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Table chunking benchmark")
+    parser.add_argument("--tables", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=300)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    results = run(args.tables, args.rows, args.k)
+    write_results(args.output or default_output("table_chunking"), results)
+
+    old, new = results["chunk_chars_one_per_table"], results["chunk_chars_row_groups"]
+    print(f"One chunk per table: {results['table_chunks']['one_per_table']:>5} chunks, "
+          f"mean {old['mean']:>8.0f} chars, max {old['max']:>7.0f}")
+    print(f"Row groups:          {results['table_chunks']['row_groups']:>5} chunks, "
+          f"mean {new['mean']:>8.0f} chars, max {new['max']:>7.0f}")
+    print(f"Context chars for top-{args.k}: {results['context_chars_top_k_one_per_table']:,} -> "
+          f"{results['context_chars_top_k_row_groups']:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# benchmarks/bench_vector_compression.py
+"""
+Recall@k vs memory / latency for compressed vector storage.
+
+For every (dim, dtype, rescore) operating point a CompressedVectorStore
+is built and each query is answered; results are compared with exact
+float32 full-dimension search:
+
+  recall@k      share of the exact top-k found
+  memory_mb     in-memory vector bytes (full vectors for re-scoring stay on disk)
+  p50/p95 ms    per-query search latency
+
+Vectors come from
+  --from-chroma           our corpus (the Chroma collection built by rag/embedding.py),
+                          queries sampled from it with noise added
+  --embeddings X.npy      any (n, d) matrix, optional --queries Q.npy
+  (default)               synthetic clustered vectors whose variance decays over the
+                          dimensions, like Matryoshka-trained embeddings
+
+Usage:
+    python -m benchmarks.bench_vector_compression --vectors 20000 --k 4
+    python -m benchmarks.bench_vector_compression --from-chroma
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import default_output, summarize, write_results
+from rag.vector_compression import DTYPES, CompressedVectorStore
+
+
+def synthetic_embeddings(n, dim, queries, clusters=200, seed=7):
+    rng = np.random.default_rng(seed)
+    decay = 1 / np.sqrt(np.arange(1, dim + 1))          # leading dims carry most signal
+    centers = rng.normal(size=(clusters, dim)) * decay
+    labels = rng.integers(0, clusters, n)
+    vectors = centers[labels] + 0.6 * rng.normal(size=(n, dim)) * decay
+    picks = rng.integers(0, n, queries)
+    query_vectors = vectors[picks] + 0.4 * rng.normal(size=(queries, dim)) * decay
+    return vectors.astype(np.float32), query_vectors.astype(np.float32)
+
+
+def corpus_queries(vectors, queries, seed=7):
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(vectors), queries)
+    noise = rng.normal(size=(queries, vectors.shape[1])) * vectors.std(axis=0)
+    return (vectors[picks] + 0.5 * noise).astype(np.float32)
+
+
+def load_vectors(args):
+    if args.from_chroma:
+        from rag.embedding import init_chroma
+        data = init_chroma().get(include=["embeddings"])
+        vectors = np.asarray(data["embeddings"], dtype=np.float32)
+        return vectors, corpus_queries(vectors, args.queries), "chroma"
+    if args.embeddings:
+        vectors = np.load(args.embeddings).astype(np.float32)
+        queries = np.load(args.queries_file) if args.queries_file else corpus_queries(vectors, args.queries)
+        return vectors, queries.astype(np.float32), args.embeddings
+    vectors, queries = synthetic_embeddings(args.vectors, args.dim, args.queries)
+    return vectors, queries, "synthetic"
+
+
+def exact_top_k(vectors, queries, k):
+    v = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    q = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    scores = q @ v.T
+    return [set(np.argsort(-row)[:k].tolist()) for row in scores]
+
+
+def evaluate(store, queries, truth, k, rescore):
+    latencies = []
+    hits = 0
+    for query, expected in zip(queries, truth):
+        t0 = time.perf_counter()
+        results = store.search(query, k=k, rescore=rescore)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        hits += len({int(r["id"]) for r in results} & expected)
+    return round(hits / (k * len(queries)), 4), summarize(latencies)
+
+
+def run(vectors, queries, k, dims, rescore):
+    chunks = [{"id": str(i)} for i in range(len(vectors))]
+    truth = exact_top_k(vectors, queries, k)
+    workdir = tempfile.mkdtemp(prefix="bench_vectors_")
+
+    points = []
+    try:
+        for dim in dims:
+            for dtype in DTYPES:
+                # round-trip through disk so re-scoring reads the memory-mapped full vectors
+                path = os.path.join(workdir, f"{dim}-{dtype}")
+                CompressedVectorStore.build(chunks, vectors, dim, dtype).save(path)
+                store = CompressedVectorStore.load(path)
+
+                for factor in sorted({0, rescore}):
+                    if factor and dim == vectors.shape[1] and dtype == "float32":
+                        continue  # already exact
+                    recall, latency = evaluate(store, queries, truth, k, factor)
+                    points.append({
+                        "dim": dim, "dtype": dtype, "rescore": factor,
+                        f"recall_at_{k}": recall,
+                        "memory_mb": round(store.memory_bytes() / 1e6, 2),
+                        "p50_ms": latency["p50"], "p95_ms": latency["p95"],
+                    })
+                shutil.rmtree(path)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return points
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compressed vector storage benchmark")
+    parser.add_argument("--vectors", type=int, default=20_000, help="synthetic corpus size")
+    parser.add_argument("--dim", type=int, default=3072, help="synthetic vector width")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--from-chroma", action="store_true")
+    parser.add_argument("--embeddings", default=None)
+    parser.add_argument("--queries-file", default=None)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--dims", type=int, nargs="+", default=None)
+    parser.add_argument("--rescore", type=int, default=4)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    vectors, queries, source = load_vectors(args)
+    full_dim = vectors.shape[1]
+    dims = sorted({d for d in (args.dims or [full_dim, full_dim // 2, full_dim // 4, full_dim // 12]) if 0 < d <= full_dim},
+                  reverse=True)
+
+    points = run(vectors, queries, args.k, dims, args.rescore)
+    write_results(args.output or default_output("vector_compression"), {
+        "benchmark": "vector_compression",
+        "config": {"source": source, "vectors": len(vectors), "dim": full_dim,
+                   "queries": len(queries), "k": args.k},
+        "points": points,
+    })
+
+    print(f"{'dim':>5} {'dtype':>8} {'rescore':>7} {'recall@' + str(args.k):>9} {'MB':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for p in points:
+        print(f"{p['dim']:>5} {p['dtype']:>8} {p['rescore']:>7} {p[f'recall_at_{args.k}']:>9.3f} "
+              f"{p['memory_mb']:>9.2f} {p['p50_ms']:>8.3f} {p['p95_ms']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
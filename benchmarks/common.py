@@ -0,0 +1,103 @@
+# benchmarks/common.py
+"""
+Shared helpers for the benchmark scripts:
+latency summaries, result files and object sizing.
+"""
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+# ------------------------------------------------------------
+# Latency statistics
+# ------------------------------------------------------------
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile on an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(values):
+    """count / mean / p50 / p95 / p99 / max for a list of numbers."""
+    ordered = sorted(values)
+    count = len(ordered)
+    return {
+        "count": count,
+        "mean": round(sum(ordered) / count, 4) if count else 0.0,
+        "p50": round(percentile(ordered, 50), 4),
+        "p95": round(percentile(ordered, 95), 4),
+        "p99": round(percentile(ordered, 99), 4),
+        "max": round(ordered[-1], 4) if count else 0.0,
+    }
+
+
+# ------------------------------------------------------------
+# Object sizing
+# ------------------------------------------------------------
+def deep_sizeof(obj, seen=None):
+    """
+    Approximate retained size of `obj` in bytes.
+    Follows dicts, sequences, sets, __dict__ and __slots__.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += deep_sizeof(k, seen) + deep_sizeof(v, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_sizeof(item, seen)
+
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            if hasattr(obj, name):
+                size += deep_sizeof(getattr(obj, name), seen)
+
+    return size
+
+
+# ------------------------------------------------------------
+# Result files
+# ------------------------------------------------------------
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def default_output(name):
+    return os.path.join(RESULTS_DIR, f"{name}-{git_commit()}.json")
+
+
+def write_results(path, results):
+    """Save a results dict as JSON, stamped with commit and time."""
+    results = {
+        "git_commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved results to: {path}")
+    return results
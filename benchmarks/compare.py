@@ -0,0 +1,79 @@
+# benchmarks/compare.py
+"""
+Compare two benchmark result files and flag regressions.
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/chat-abc123.json benchmarks/results/chat-def456.json
+
+Metrics whose name contains "per_sec" are treated as higher-is-better,
+everything else numeric as lower-is-better. Exits with status 1 if any
+metric regressed by more than --threshold percent.
+"""
+import argparse
+import json
+import sys
+
+SKIP_KEYS = {"git_commit", "timestamp", "config", "count", "turns", "sessions"}
+
+
+def flatten(data, prefix=""):
+    """Yield (dotted.key, value) for every numeric leaf."""
+    for key, value in data.items():
+        if key in SKIP_KEYS:
+            continue
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from flatten(value, path)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield path, value
+
+
+def compare(old, new, threshold):
+    old_metrics = dict(flatten(old))
+    new_metrics = dict(flatten(new))
+    regressions = []
+
+    print(f"{'metric':<50} {'old':>12} {'new':>12} {'change':>9}")
+    for key in sorted(old_metrics.keys() & new_metrics.keys()):
+        before, after = old_metrics[key], new_metrics[key]
+        if before == 0:
+            change = 0.0 if after == 0 else float("inf")
+        else:
+            change = (after - before) / abs(before) * 100
+
+        higher_is_better = "per_sec" in key
+        worse = -change if higher_is_better else change
+        flag = ""
+        if worse > threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+
+        print(f"{key:<50} {before:>12} {after:>12} {change:>8.1f}%{flag}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare benchmark results")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Allowed regression in percent (default 10)")
+    args = parser.parse_args()
+
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"Comparing {old.get('git_commit')} -> {new.get('git_commit')}\n")
+    regressions = compare(old, new, args.threshold)
+
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold}%")
+        sys.exit(1)
+    print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# benchmarks/fixtures.py
+"""
+Small in-memory vector store used in place of Chroma + Vertex embeddings.
+
+`install_fixture_rag()` registers a stand-in `rag.rag_query` module
+(load_chroma / embed_query / retrieve_chunks / generate_answer) so that
+`tools.rag` can be imported without a Chroma directory or GCP
+credentials. Embeddings are hashed bag-of-words vectors, so retrieval
+is deterministic and cheap but still does real similarity ranking.
+Chunks are tagged with their product partition like rag/chunker.py does,
+and FixtureCollection.query() accepts Chroma's `where={"product": {"$in": [...]}}`.
+"""
+import hashlib
+import math
+import re
+import sys
+import time
+import types
+
+from rag.partitions import PARTITION_KEY, classify_chunk
+
+EMBEDDING_DIM = 64
+
+# Simulated embedding API round trip (set by install_fixture_rag)
+EMBED_LATENCY_MS = 0.0
+
+FIXTURE_CHUNKS = [
+    ("home-loan-faq.pdf", 1, "Home loan processing fee is 0.5% of the loan amount, subject to a minimum of Rs 10,000."),
+    ("home-loan-faq.pdf", 1, "Home loans are available for tenures of up to 30 years for salaried applicants."),
+    ("home-loan-faq.pdf", 2, "Floating interest rates are linked to the repo rate and reset every quarter."),
+    ("home-loan-faq.pdf", 2, "No foreclosure charges apply on floating rate home loans for individual borrowers."),
+    ("home-loan-faq.pdf", 3, "Part-prepayment can reduce either the EMI or the remaining tenure of the loan."),
+    ("personal-loan.pdf", 1, "Personal loans require PAN, Aadhaar, last 3 months salary slips and bank statements."),
+    ("personal-loan.pdf", 1, "Personal loan interest rates start at 10.99% per annum depending on credit profile."),
+    ("personal-loan.pdf", 2, "Foreclosure of a personal loan is allowed after 12 EMIs with a 4% charge."),
+    ("credit-card.pdf", 1, "Credit card annual fee is waived on spends above Rs 1.5 lakh in a year."),
+    ("credit-card.pdf", 2, "Late payment charges on credit cards range from Rs 100 to Rs 1,300."),
+    ("pricing-grid.pdf", 1, "Product | Rate | Fee\nHome Loan | 8.75% | 0.5%\nPersonal Loan | 10.99% | 2%"),
+    ("pricing-grid.pdf", 2, "EMI is calculated on a reducing balance basis using the monthly rate."),
+]
+
+
+def embed_text(text: str):
+    """Hashed bag-of-words embedding, L2-normalised."""
+    vec = [0.0] * EMBEDDING_DIM
+    for token in re.findall(r"[a-z0-9]+", text.lower()):
+        bucket = int(hashlib.md5(token.encode()).hexdigest(), 16) % EMBEDDING_DIM
+        vec[bucket] += 1.0
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
+
+
+class FixtureCollection:
+    def __init__(self, chunks=FIXTURE_CHUNKS):
+        self.chunks = [
+            {
+                "id": f"{pdf}_page{page}_chunk{i}",
+                "pdf_name": pdf,
+                "page_num": page,
+                "content": content,
+                PARTITION_KEY: classify_chunk(pdf, content),
+            }
+            for i, (pdf, page, content) in enumerate(chunks)
+        ]
+        self.vectors = [embed_text(c["content"]) for c in self.chunks]
+
+    def count(self):
+        return len(self.chunks)
+
+    def query(self, query_embeddings, n_results=4, where=None, include=None):
+        """Subset of chromadb Collection.query: one embedding, `$in` / equality filters."""
+        def matches(chunk):
+            for key, condition in (where or {}).items():
+                allowed = condition["$in"] if isinstance(condition, dict) else [condition]
+                if chunk.get(key) not in allowed:
+                    return False
+            return True
+
+        query = query_embeddings[0]
+        scored = sorted(
+            ((sum(a * b for a, b in zip(query, vec)), chunk)
+             for vec, chunk in zip(self.vectors, self.chunks) if matches(chunk)),
+            key=lambda item: item[0],
+            reverse=True,
+        )[:n_results]
+        return {
+            "ids": [[c["id"] for _, c in scored]],
+            "documents": [[c["content"] for _, c in scored]],
+            "metadatas": [[{k: v for k, v in c.items() if k not in ("id", "content")} for _, c in scored]],
+            "distances": [[1 - score for score, _ in scored]],
+        }
+
+
+# ------------------------------------------------------------
+# rag.rag_query stand-in
+# ------------------------------------------------------------
+def load_chroma():
+    return FixtureCollection()
+
+
+def embed_query(query: str):
+    if EMBED_LATENCY_MS:
+        time.sleep(EMBED_LATENCY_MS / 1000)
+    return embed_text(query)
+
+
+def retrieve_chunks(collection, query_embedding, k=4):
+    scored = [
+        (sum(a * b for a, b in zip(query_embedding, vec)), chunk)
+        for vec, chunk in zip(collection.vectors, collection.chunks)
+    ]
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [chunk for _, chunk in scored[:k]]
+
+
+GENERATE_SYSTEM_PROMPT = """
+Answer the question using ONLY the context below.
+"""
+
+
+def generate_answer(query: str, chunks):
+    from agent.llm_vertex import llm_generate
+
+    context = "\n".join(c["content"] for c in chunks)
+    prompt = f"""
+CONTEXT:
+{context}
+
+QUESTION:
+{query}
+"""
+    return llm_generate(prompt, call_site="rag_generate", system_instruction=GENERATE_SYSTEM_PROMPT)
+
+
+def install_fixture_rag(embed_latency_ms: float = 0.0):
+    """
+    Register this module as `rag.rag_query` (before tools.rag is imported).
+    `embed_latency_ms` simulates the embedding API round trip of embed_query.
+    """
+    global EMBED_LATENCY_MS
+    EMBED_LATENCY_MS = embed_latency_ms
+    module = types.ModuleType("rag.rag_query")
+    module.load_chroma = load_chroma
+    module.embed_query = embed_query
+    module.retrieve_chunks = retrieve_chunks
+    module.generate_answer = generate_answer
+    sys.modules["rag.rag_query"] = module
+    return module
@@ -0,0 +1,71 @@
+# benchmarks/scenarios.py
+"""
+Scripted multi-turn conversations replayed by the benchmarks.
+Each scenario is a name and the list of user messages sent in order.
+"""
+
+SCENARIOS = [
+    (
+        "emi_form_filling",
+        [
+            "I want to calculate my EMI",
+            "500000",
+            "9",
+            "5 years",
+            "what if the rate is 8.5%",
+        ],
+    ),
+    (
+        "emi_single_shot",
+        [
+            "Calculate EMI for 25 lakh at 8.5% for 20 years",
+        ],
+    ),
+    (
+        "emi_rate_tenure_sweep",
+        [
+            "Calculate EMI for 25 lakh at 8.5% vs 9% over 15/20/25 years",
+            "what if 9.5% vs 10% for 20 years",
+        ],
+    ),
+    (
+        "loan_eligibility",
+        [
+            "Check my home loan eligibility",
+            "fresh",
+            "32",
+            "salaried",
+            "120000",
+            "30000",
+            "20",
+        ],
+    ),
+    (
+        "rag_questions",
+        [
+            "What is the processing fee for home loans?",
+            "Which documents are needed for a personal loan?",
+            "Are there foreclosure charges?",
+        ],
+    ),
+    (
+        "emi_interrupted_by_rag",
+        [
+            "I want to calculate my EMI",
+            "1000000",
+            "what is a floating interest rate?",
+            "how does part-prepayment work?",
+            "8.75%",
+            "15 years",
+        ],
+    ),
+    (
+        "loan_then_reset",
+        [
+            "Am I eligible for a home loan?",
+            "balance transfer",
+            "reset",
+            "What is the credit card annual fee?",
+        ],
+    ),
+]
@@ -0,0 +1,189 @@
+# benchmarks/stub_llm.py
+"""
+Deterministic stand-in for Gemini.
+
+Recognises each prompt used by the agent (router, slot extractors,
+answer validation, RAG generation and consolidation) and answers it
+with simple regex rules, so conversations can be replayed without
+network access. An optional fixed latency simulates the API round trip.
+
+Like Gemini, it takes the static instructions as `system_instruction`
+and reports token usage: a system instruction it has seen before counts
+as cached input tokens (an ideal prefix cache, ~4 characters per token).
+
+`json_noise` makes JSON answers untidy the way free-form model output
+is: with that probability a reply is wrapped in code fences or prose, or
+written as a Python dict. Calls that pass a `response_schema` (constrained
+decoding) always get plain JSON.
+"""
+import json
+import math
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+_NUMBER = r"(\d+(?:\.\d+)?)"
+
+# Untidy renderings of a JSON reply (json_noise)
+NOISY_FORMATS = (
+    lambda data: f"```json\n{json.dumps(data, indent=2)}\n```",
+    lambda data: f"Sure! Here is the result:\n{json.dumps(data)}",
+    lambda data: f"{json.dumps(data)}\n\nNote: fields not mentioned are left as {{null}}.",
+    lambda data: repr(data),
+)
+
+
+class StubLLM:
+    def __init__(self, latency_ms: float = 0.0, json_noise: float = 0.0, seed: int = 7):
+        self.latency_ms = latency_ms
+        self.json_noise = json_noise
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._cached_instructions = set()
+        self._rng = random.Random(seed)
+
+    def __call__(self, prompt: str, system_instruction: str = None, response_schema: dict = None):
+        with self._lock:
+            self.calls += 1
+            cached = system_instruction in self._cached_instructions
+            if system_instruction:
+                self._cached_instructions.add(system_instruction)
+
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        full_prompt = f"{system_instruction}\n{prompt}" if system_instruction else prompt
+        usage = SimpleNamespace(
+            prompt_token_count=_tokens(full_prompt),
+            cached_content_token_count=_tokens(system_instruction) if cached else 0,
+        )
+        text = self._answer(full_prompt, constrained=response_schema is not None)
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+    def _json(self, data, constrained):
+        if constrained or not self.json_noise:
+            return json.dumps(data)
+        with self._lock:
+            noisy = self._rng.random() < self.json_noise
+            render = self._rng.choice(NOISY_FORMATS)
+        return render(data) if noisy else json.dumps(data)
+
+    def _answer(self, prompt: str, constrained: bool = False) -> str:
+        message = _user_message(prompt)
+
+        if "intent routing engine" in prompt:
+            return self._json({"action": _route(message)}, constrained)
+
+        if "Extract EMI-related values" in prompt:
+            return self._json(_emi_slots(message), constrained)
+
+        if "Extract loan-related information" in prompt:
+            return self._json(_loan_slots(message), constrained)
+
+        if "validating whether a user message" in prompt:
+            field = re.search(r"Expected field:\s*(\w+)", prompt)
+            return self._json(_validate(field.group(1) if field else "", message), constrained)
+
+        if "banking communication assistant" in prompt:
+            return prompt.split("ANSWER:", 1)[-1].strip()
+
+        if "CONTEXT:" in prompt:
+            context = prompt.split("CONTEXT:", 1)[-1].strip().splitlines()
+            return context[0] if context else "I could not find this in the documents."
+
+        return ""
+
+
+# ------------------------------------------------------------
+# Prompt helpers
+# ------------------------------------------------------------
+def _tokens(text: str) -> int:
+    return math.ceil(len(text) / 4)
+
+
+def _user_message(prompt: str) -> str:
+    match = re.search(r'User message:\s*"(.*)"', prompt, re.S)
+    return match.group(1).strip() if match else ""
+
+
+def _route(message: str) -> str:
+    msg = message.lower()
+    if "eligib" in msg or ("apply" in msg and "loan" in msg):
+        return "START_LOAN"
+    if "emi" in msg and any(w in msg for w in ("calculate", "check", "compute")):
+        return "START_EMI"
+    if re.search(r"\d", msg) and "?" not in msg:
+        return "START_EMI"
+    return "USE_RAG"
+
+
+def _amount(message: str):
+    msg = message.lower().replace(",", "")
+    match = re.search(_NUMBER + r"\s*(lakh|lac|crore|cr)\b", msg)
+    if match:
+        scale = 100000 if match.group(2) in ("lakh", "lac") else 10000000
+        return float(match.group(1)) * scale
+    match = re.search(r"\b(\d{4,})\b", msg)
+    return float(match.group(1)) if match else None
+
+
+def _rate(message: str):
+    match = re.search(_NUMBER + r"\s*(%|percent)", message.lower())
+    return float(match.group(1)) if match else None
+
+
+def _tenure_months(message: str):
+    msg = message.lower()
+    match = re.search(r"(\d+)\s*(year|yr)", msg)
+    if match:
+        return int(match.group(1)) * 12
+    match = re.search(r"(\d+)\s*month", msg)
+    return int(match.group(1)) if match else None
+
+
+def _emi_slots(message: str) -> dict:
+    return {
+        "principal": _amount(message),
+        "rate": _rate(message),
+        "tenure_months": _tenure_months(message),
+    }
+
+
+def _loan_slots(message: str) -> dict:
+    msg = message.lower()
+    age = re.search(r"(\d+)\s*(years old|yrs old)|age\s*(?:is\s*)?(\d+)", msg)
+    loan_type = None
+    if "balance transfer" in msg:
+        loan_type = "balance_transfer"
+    elif "fresh" in msg or "new" in msg:
+        loan_type = "fresh"
+
+    employment = None
+    if "self" in msg:
+        employment = "self_employed"
+    elif "salaried" in msg:
+        employment = "salaried"
+
+    return {
+        "loan_type": loan_type,
+        "age": int(age.group(1) or age.group(3)) if age else None,
+        "employment_type": employment,
+        "monthly_income": None,
+        "monthly_expenses": None,
+        "tenure_years": None,
+    }
+
+
+def _validate(field: str, message: str) -> dict:
+    if field == "tenure_months":
+        value = _tenure_months(message)
+    elif field == "rate":
+        value = _rate(message)
+    else:
+        value = _amount(message)
+
+    if value is None:
+        return {"is_answer": False, "value": None}
+    return {"is_answer": True, "value": value}
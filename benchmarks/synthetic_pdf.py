@@ -0,0 +1,100 @@
+# benchmarks/synthetic_pdf.py
+"""
+Minimal PDF writer for the extraction benchmarks (no PDF library needed).
+
+write_pdf() streams pages straight to disk, so 1,000+ page documents can
+be generated without holding them in memory. Prose pages are lines of
+text; every `table_every`-th page also gets a ruled pricing grid that
+pdfplumber's extract_tables() finds.
+"""
+import random
+
+WORDS = (
+    "loan tenure interest rate processing fee prepayment foreclosure borrower applicant income "
+    "salary property valuation margin collateral repayment instalment floating fixed repo linked "
+    "spread credit score documents branch sanction disbursement insurance penalty schedule account"
+).split()
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _prose(rng, lines, top):
+    ops = ["BT /F1 10 Tf 12 TL", f"50 {top} Td"]
+    for _ in range(lines):
+        line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 14)))
+        ops.append(f"({_escape(line)}) Tj T*")
+    ops.append("ET")
+    return ops
+
+
+def _table(rng, rows, top, cols=4, col_width=120, row_height=16):
+    left = 50
+    bottom = top - rows * row_height
+    ops = ["0.5 w"]
+    for r in range(rows + 1):
+        y = top - r * row_height
+        ops.append(f"{left} {y} m {left + cols * col_width} {y} l S")
+    for c in range(cols + 1):
+        x = left + c * col_width
+        ops.append(f"{x} {top} m {x} {bottom} l S")
+
+    header = ("Product", "Tenure", "Rate", "Fee")
+    for r in range(rows):
+        cells = header if r == 0 else (
+            rng.choice(("Home Loan", "Top-up", "Plot Loan", "LAP")),
+            f"{rng.randint(1, 30)} yrs",
+            f"{rng.uniform(8, 12):.2f}%",
+            f"{rng.choice((0.25, 0.5, 1.0))}%",
+        )
+        y = top - (r + 1) * row_height + 4
+        for c, cell in enumerate(cells):
+            ops.append(f"BT /F1 9 Tf {left + c * col_width + 4} {y} Td ({_escape(cell)}) Tj ET")
+    return ops
+
+
+def page_content(page_num, table_every=5, seed=7):
+    """Content stream (bytes) of one page; deterministic per page number."""
+    rng = random.Random(seed * 100_003 + page_num)
+    if table_every and page_num % table_every == 0:
+        ops = _prose(rng, 12, 740) + _table(rng, 20, 570)
+    else:
+        ops = _prose(rng, 55, 740)
+    ops.append(f"BT /F1 8 Tf 50 30 Td (Page {page_num} | Retail Lending) Tj ET")
+    return "\n".join(ops).encode("latin-1")
+
+
+def write_pdf(path, pages, table_every=5, seed=7, content=page_content):
+    """Write a `pages`-page PDF to `path`. `content(page_num, table_every, seed)` -> bytes."""
+    offsets = []
+
+    with open(path, "wb") as f:
+        def obj(number, body):
+            offsets.append((number, f.tell()))
+            f.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+
+        f.write(b"%PDF-1.4\n")
+        kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(pages))
+        obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        obj(2, f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode())
+        obj(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+        for i in range(pages):
+            page_obj, content_obj = 4 + 2 * i, 5 + 2 * i
+            obj(page_obj, (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_obj} 0 R >>"
+            ).encode())
+            data = content(i + 1, table_every, seed)
+            obj(content_obj, f"<< /Length {len(data)} >>\nstream\n".encode() + data + b"\nendstream")
+
+        xref_at = f.tell()
+        count = 4 + 2 * pages - 1
+        f.write(f"xref\n0 {count + 1}\n0000000000 65535 f \n".encode())
+        for _, offset in sorted(offsets):
+            f.write(f"{offset:010d} 00000 n \n".encode())
+        f.write(f"trailer\n<< /Size {count + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode())
+    return path
@@ -1,18 +1,26 @@
 # cli_app.py
+"""
+Interactive CLI, plus an offline replay mode:
+
+    python cli_app.py --replay conversations.jsonl --output replies.jsonl --workers 8 --stub-llm
+
+Input: one conversation per line, {"conversation_id": "...", "messages": ["...", ...]}
+Output: one line per turn with the reply, latency and LLM call count.
+With --stub-llm no GCP access is needed (stub LLM + fixture vector store),
+so the replay doubles as a local regression and performance harness.
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from agent.llm_vertex import init_vertex
-from agent.state import ConversationState
-from agent.intent_router import route_intent
-from agent.flows.emi_flow import handle_emi_turn, looks_like_answer
-from agent.slot_extraction.emi_slot_extraction import extract_emi_slots
-from agent.slot_extraction.loan_slot_extraction import extract_loan_slots
-from agent.flows.loan_flow import handle_loan_turn
-from tools.rag import rag_tool
-
-from agent.supervisor import handle_turn
 from agent.state import ConversationState
 
+
 def main():
+    from agent.llm_vertex import init_vertex
+    from agent.supervisor import handle_turn
+
     init_vertex()
 
     print("=" * 60)
@@ -176,5 +184,114 @@ def main():
         
         print("\nBOT > I didn’t understand that.")
 """
+# ==================================================
+# OFFLINE REPLAY
+# ==================================================
+def _read_conversations(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            yield data.get("conversation_id", data.get("id", f"line-{line_no}")), data["messages"]
+
+
+def _replay_conversation(conversation_id, messages):
+    """Run one conversation turn by turn on a fresh state."""
+    from agent.llm_vertex import thread_llm_calls
+    from agent.supervisor import handle_turn
+
+    state = ConversationState()
+    turns = []
+
+    for turn, message in enumerate(messages):
+        record = {"conversation_id": conversation_id, "turn": turn, "message": message}
+        calls_before = thread_llm_calls()
+        t0 = time.perf_counter()
+        try:
+            result = handle_turn(state, message)
+            record["reply"] = result["reply"]
+        except Exception as e:
+            record["reply"] = None
+            record["error"] = str(e)
+
+        record["latency_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+        record["llm_calls"] = thread_llm_calls() - calls_before
+        record["active_flow"] = state.active_flow
+        record["awaiting_field"] = state.awaiting_field
+        turns.append(record)
+
+    return turns
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def replay(input_path, output_path, workers=8):
+    """
+    Replay every conversation in `input_path` (conversations run concurrently,
+    turns of one conversation in order) and write one JSON line per turn,
+    in input order. Returns a summary dict.
+    """
+    latencies = []
+    llm_calls = 0
+    conversations = errors = 0
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="replay") as pool, \
+            open(output_path, "w", encoding="utf-8") as out:
+        results = pool.map(lambda item: _replay_conversation(*item), _read_conversations(input_path))
+        for turns in results:
+            conversations += 1
+            for record in turns:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                latencies.append(record["latency_ms"])
+                llm_calls += record["llm_calls"]
+                errors += "error" in record
+    elapsed = time.perf_counter() - started
+
+    return {
+        "conversations": conversations,
+        "turns": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "turns_per_sec": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms_p50": _percentile(latencies, 50) if latencies else 0.0,
+        "latency_ms_p95": _percentile(latencies, 95) if latencies else 0.0,
+        "llm_calls_per_turn": round(llm_calls / len(latencies), 3) if latencies else 0.0,
+    }
+
+
+def _use_stub_llm(latency_ms):
+    from agent.llm_vertex import set_llm_backend
+    from benchmarks.fixtures import install_fixture_rag
+    from benchmarks.stub_llm import StubLLM
+
+    set_llm_backend(StubLLM(latency_ms=latency_ms))
+    install_fixture_rag()
+
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="RAG + EMI agent CLI")
+    parser.add_argument("--replay", help="JSONL file of conversations to replay (non-interactive)")
+    parser.add_argument("--output", default="replay_output.jsonl", help="JSONL file for the replies")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--stub-llm", action="store_true", help="offline: stub LLM + fixture vector store")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="simulated stub LLM latency")
+    args = parser.parse_args()
+
+    if not args.replay:
+        main()
+    else:
+        if args.stub_llm:
+            _use_stub_llm(args.llm_latency_ms)
+        else:
+            from agent.llm_vertex import init_vertex
+            init_vertex()
+
+        summary = replay(args.replay, args.output, args.workers)
+        print(json.dumps(summary, indent=2))
+        print(f"✓ Replies written to {args.output}")
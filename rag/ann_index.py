@@ -0,0 +1,264 @@
+# rag/ann_index.py
+"""
+Approximate nearest-neighbour index (IVF) for large chunk collections.
+
+Brute-force similarity touches every vector on every query. The IVF
+(inverted file) index clusters the vectors with spherical k-means into
+`nlist` lists; a query is scored against the centroids first and then
+only against the vectors of the `nprobe` closest lists:
+
+  nprobe      recall / latency knob: more lists probed -> higher recall,
+              more vectors scored (nprobe = nlist is exact search)
+  nlist       default ~2 * sqrt(n); set at build time
+
+Documents change without a rebuild:
+  add(ids, vectors, chunks)   insert, or replace an id that already exists
+  remove(ids)                 delete; the row is dropped from its list at once
+                              and its storage reclaimed by the next save()
+Centroids are not re-trained by inserts; call train() again after the
+corpus has changed a lot.
+
+search(..., partitions=("home_loan", "general")) only returns chunks of
+those product partitions (chunk["product"], see rag/partitions.py).
+
+Persisted as .npy files + chunks.json (save / load). Built from the
+Chroma collection with `python -m rag.ann_index`, kept up to date by
+rag/embedding.py, and used by tools/rag.py with RAG_RETRIEVER=ivf.
+"""
+import argparse
+import json
+import math
+import os
+
+from rag.partitions import PARTITION_KEY
+
+INDEX_DIR = "data/ann_index"
+DEFAULT_NPROBE = 8
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64
+
+
+def _normalize(vectors):
+    import numpy as np
+
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return (vectors / np.where(norms == 0, 1, norms)).astype(np.float32)
+
+
+def _kmeans(vectors, nlist, iterations=KMEANS_ITERATIONS, seed=7):
+    """Spherical k-means on a sample; returns (nlist, dim) unit centroids."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * KMEANS_SAMPLE_PER_LIST)
+    sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = (sample @ centroids.T).argmax(axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        empty = np.bincount(assignment, minlength=nlist) == 0
+        # re-seed empty lists with random sample points
+        sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids
+
+
+class IVFIndex:
+    def __init__(self, centroids, nprobe=DEFAULT_NPROBE):
+        import numpy as np
+
+        self.centroids = centroids                    # (nlist, dim) float32
+        self.nprobe = nprobe
+        self.dim = centroids.shape[1]
+
+        self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self._size = 0                                # rows used in _vectors
+        self._row_ids = []                            # row -> id (None once deleted)
+        self._row_chunks = []                         # row -> chunk dict
+        self._row_lists = []                          # row -> list it is stored in
+        self._rows = {}                               # id -> row
+        self._row_partitions = np.zeros(0, dtype=np.int16)  # row -> partition code
+        self._partition_codes = {}                    # partition value -> code
+        self._lists = [np.zeros(0, dtype=np.int64) for _ in range(len(centroids))]
+
+    # ---------------------------
+    # Build
+    # ---------------------------
+    @classmethod
+    def build(cls, ids, vectors, chunks=None, nlist=None, nprobe=DEFAULT_NPROBE):
+        vectors = _normalize(vectors)
+        nlist = nlist or max(1, min(len(vectors), int(2 * math.sqrt(len(vectors)))))
+        index = cls(_kmeans(vectors, nlist), nprobe)
+        index.add(ids, vectors, chunks)
+        return index
+
+    @classmethod
+    def from_collection(cls, collection, nlist=None, nprobe=DEFAULT_NPROBE):
+        """Build from a Chroma collection (ids, documents, metadatas, embeddings)."""
+        data = collection.get(include=["embeddings", "documents", "metadatas"])
+        chunks = [
+            {**(metadata or {}), "content": document}
+            for document, metadata in zip(data["documents"], data["metadatas"])
+        ]
+        return cls.build(data["ids"], data["embeddings"], chunks, nlist, nprobe)
+
+    def train(self, nlist=None):
+        """Re-cluster the current vectors (after many inserts / deletes)."""
+        ids, vectors, chunks = self._live()
+        rebuilt = IVFIndex.build(ids, vectors, chunks, nlist or len(self.centroids), self.nprobe)
+        self.__dict__.update(rebuilt.__dict__)
+
+    # ---------------------------
+    # Inserts / deletes
+    # ---------------------------
+    def __len__(self):
+        return len(self._rows)
+
+    def ids(self):
+        return list(self._rows)
+
+    def _reserve(self, extra):
+        import numpy as np
+
+        needed = self._size + extra
+        if needed > len(self._vectors):
+            grown = np.zeros((max(needed, 2 * len(self._vectors), 1024), self.dim), dtype=np.float32)
+            grown[: self._size] = self._vectors[: self._size]
+            self._vectors = grown
+            partitions = np.zeros(len(grown), dtype=np.int16)
+            partitions[: self._size] = self._row_partitions[: self._size]
+            self._row_partitions = partitions
+
+    def add(self, ids, vectors, chunks=None):
+        """Insert vectors; an id that is already indexed is replaced."""
+        import numpy as np
+
+        ids = list(ids)
+        if not ids:
+            return
+        self.remove([i for i in ids if i in self._rows])
+
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        assignment = (vectors @ self.centroids.T).argmax(axis=1)
+
+        self._reserve(len(ids))
+        start = self._size
+        self._vectors[start:start + len(ids)] = vectors
+        self._size += len(ids)
+
+        for offset, chunk_id in enumerate(ids):
+            self._rows[chunk_id] = start + offset
+        self._row_ids.extend(ids)
+        chunks = chunks if chunks is not None else [None] * len(ids)
+        self._row_chunks.extend(chunks)
+        self._row_lists.extend(assignment.tolist())
+        self._row_partitions[start:start + len(ids)] = [
+            self._partition_codes.setdefault((chunk or {}).get(PARTITION_KEY), len(self._partition_codes))
+            for chunk in chunks
+        ]
+
+        rows = np.arange(start, start + len(ids))
+        for list_id in np.unique(assignment):
+            self._lists[list_id] = np.concatenate([self._lists[list_id], rows[assignment == list_id]])
+
+    def remove(self, ids):
+        """Delete ids (unknown ids are ignored). Returns how many were removed."""
+        import numpy as np
+
+        by_list = {}
+        for chunk_id in ids:
+            row = self._rows.pop(chunk_id, None)
+            if row is None:
+                continue
+            self._row_ids[row] = None
+            self._row_chunks[row] = None
+            by_list.setdefault(self._row_lists[row], []).append(row)
+
+        for list_id, rows in by_list.items():
+            self._lists[list_id] = self._lists[list_id][~np.isin(self._lists[list_id], rows)]
+        return sum(len(rows) for rows in by_list.values())
+
+    # ---------------------------
+    # Search
+    # ---------------------------
+    def search(self, query_embedding, k=4, nprobe=None, partitions=None):
+        """
+        Top-k chunks (dicts with "id", chunk fields and "score"), best first.
+        `partitions` restricts the results to chunks of those products.
+        """
+        import numpy as np
+
+        if not self._rows or k <= 0:
+            return []
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32))
+
+        nprobe = min(nprobe or self.nprobe, len(self.centroids))
+        centroid_scores = self.centroids @ query
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        rows = np.concatenate([self._lists[list_id] for list_id in probe])
+        if partitions is not None:
+            codes = [self._partition_codes[p] for p in partitions if p in self._partition_codes]
+            rows = rows[np.isin(self._row_partitions[rows], codes)]
+        if not len(rows):
+            return []
+
+        scores = self._vectors[rows] @ query
+        top = min(k, len(rows))
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+
+        return [
+            {"id": self._row_ids[row], **(self._row_chunks[row] or {}), "score": float(score)}
+            for row, score in zip(rows[best].tolist(), scores[best].tolist())
+        ]
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+    def _live(self):
+        rows = sorted(self._rows.values())
+        return (
+            [self._row_ids[r] for r in rows],
+            self._vectors[rows],
+            [self._row_chunks[r] for r in rows],
+        )
+
+    def save(self, directory=INDEX_DIR):
+        """Write the live rows (deleted rows are dropped) to `directory`."""
+        import numpy as np
+
+        ids, vectors, chunks = self._live()
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "centroids.npy"), self.centroids)
+        np.save(os.path.join(directory, "vectors.npy"), vectors)
+        with open(os.path.join(directory, "chunks.json"), "w", encoding="utf-8") as f:
+            json.dump({"nprobe": self.nprobe, "ids": ids, "chunks": chunks}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory=INDEX_DIR):
+        import numpy as np
+
+        with open(os.path.join(directory, "chunks.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(np.load(os.path.join(directory, "centroids.npy")), meta["nprobe"])
+        index.add(meta["ids"], np.load(os.path.join(directory, "vectors.npy")), meta["chunks"])
+        return index
+
+
+# ------------------------------------------------------------
+# MAIN: build from the Chroma collection
+# ------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the IVF index from Chroma")
+    parser.add_argument("--nlist", type=int, default=None, help="number of lists (default ~2*sqrt(n))")
+    parser.add_argument("--nprobe", type=int, default=DEFAULT_NPROBE)
+    parser.add_argument("--out", default=INDEX_DIR)
+    args = parser.parse_args()
+
+    from rag.embedding import init_chroma
+
+    index = IVFIndex.from_collection(init_chroma(), args.nlist, args.nprobe)
+    index.save(args.out)
+    print(f"✓ Saved IVF index: {len(index)} vectors, {len(index.centroids)} lists, nprobe={index.nprobe} -> {args.out}")
@@ -1,35 +1,101 @@
 # rag/chunker.py
 import json
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from rag.dedupe import dedupe_chunks, dedupe_report
+from rag.partitions import classify_chunk
 
 # ------------------------------------------------------------
 # CONFIG
 # ------------------------------------------------------------
 RAW_DATA_FILE = "./data/pdf_extraction/raw_data.json"
+# (or "./data/pdf_extraction/raw_pages.jsonl" from `pdf_extraction.py --stream`)
 OUTPUT_CHUNKS_FILE = "./data/chunks/chunks.json"
 
 CHUNK_SIZE = 800
 CHUNK_OVERLAP = 200
 
+# Collapse near-duplicate chunks (repeated T&C, footers, overlaps) before embedding
+DEDUPE = True
+
+# Tables longer than this (characters) are split into row groups,
+# each starting with the table's header row
+TABLE_CHUNK_SIZE = 1200
+
 
 # ------------------------------------------------------------
 # Load raw extracted data
 # ------------------------------------------------------------ 
 def load_raw_data(path):
+    if path.endswith(".jsonl"):
+        return iter_raw_pages(path)
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
+def iter_raw_pages(path):
+    """
+    Read the streaming extraction output (one page per line, see
+    pdf_extraction.stream_all_pdfs) in the raw_data shape create_chunks
+    expects: one {"pdf_name", "pages": [page]} record per page.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                page = json.loads(line)
+                yield {"pdf_name": page.pop("pdf_name"), "pages": [page]}
+
+
 # ------------------------------------------------------------
 # Create text splitter
 # ------------------------------------------------------------
 def get_splitter():
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
     return RecursiveCharacterTextSplitter(
         chunk_size=CHUNK_SIZE,
         chunk_overlap=CHUNK_OVERLAP
     )
 
 
+# ------------------------------------------------------------
+# Table chunking (row groups with repeated header)
+# ------------------------------------------------------------
+def split_table(table_text, max_chars=TABLE_CHUNK_SIZE):
+    """
+    Split a table from table_to_string() ("col | col" lines, header first)
+    into row groups of at most `max_chars` characters.
+
+    Every group starts with the header row so it can be read on its own.
+    Returns [(content, row_start, row_end), ...] with 1-based data-row
+    numbers (the header is row 0). A single row longer than the budget
+    becomes its own group. A table without data rows is returned as is.
+    """
+    lines = [line for line in table_text.split("\n") if line.strip()]
+    if len(lines) < 2:
+        return [(table_text, 0, 0)] if table_text.strip() else []
+
+    header, rows = lines[0], lines[1:]
+    if len(table_text) <= max_chars:
+        return [("\n".join(lines), 1, len(rows))]
+
+    groups = []
+    group = []
+    size = len(header)
+    row_start = 1
+
+    for row_num, row in enumerate(rows, start=1):
+        if group and size + 1 + len(row) > max_chars:
+            groups.append(("\n".join([header] + group), row_start, row_num - 1))
+            group = []
+            size = len(header)
+            row_start = row_num
+        group.append(row)
+        size += 1 + len(row)
+
+    groups.append(("\n".join([header] + group), row_start, len(rows)))
+    return groups
+
+
 # ------------------------------------------------------------
 # Chunk logic
 # ------------------------------------------------------------
@@ -56,19 +122,31 @@ def create_chunks(raw_data):
                         "id": f"{pdf_name}_page{page_num}_chunk{idx}",
                         "pdf_name": pdf_name,
                         "page_num": page_num,
-                        "content": chunk_text
+                        "content": chunk_text,
+                        "product": classify_chunk(pdf_name, chunk_text),
                     })
 
             # ------------------------------------------------
-            # 2. CHUNK TABLES (each table = ONE chunk)
+            # 2. CHUNK TABLES (row groups, header repeated)
             # ------------------------------------------------
             for t_idx, table_text in enumerate(tables):
-                chunks.append({
-                    "id": f"{pdf_name}_page{page_num}_table{t_idx}",
-                    "pdf_name": pdf_name,
-                    "page_num": page_num,
-                    "content": table_text
-                })
+                groups = split_table(table_text)
+
+                for g_idx, (content, row_start, row_end) in enumerate(groups):
+                    chunk_id = f"{pdf_name}_page{page_num}_table{t_idx}"
+                    if len(groups) > 1:
+                        chunk_id += f"_rows{row_start}-{row_end}"
+
+                    chunks.append({
+                        "id": chunk_id,
+                        "pdf_name": pdf_name,
+                        "page_num": page_num,
+                        "content": content,
+                        "product": classify_chunk(pdf_name, content),
+                        "table_index": t_idx,
+                        "row_start": row_start,
+                        "row_end": row_end,
+                    })
 
     return chunks
 
@@ -86,7 +164,7 @@ def save_chunks(chunks, output_path):
 # MAIN
 # ------------------------------------------------------------
 if __name__ == "__main__":
-    print("Loading raw_data.json ...")
+    print(f"Loading {RAW_DATA_FILE} ...")
     raw_data = load_raw_data(RAW_DATA_FILE)
 
     print("Creating chunks (this may take a moment)...")
@@ -94,4 +172,14 @@ if __name__ == "__main__":
 
     print(f"Total chunks created: {len(chunks)}")
 
+    if DEDUPE:
+        print("Removing near-duplicate chunks (MinHash) ...")
+        deduped = dedupe_chunks(chunks)
+        report = dedupe_report(chunks, deduped)
+        print(f"  {report['chunks_before']} -> {report['chunks_after']} chunks "
+              f"({report['removed_pct']}% removed), "
+              f"{report['embedding_calls_saved']} embedding calls and "
+              f"~{report['index_bytes_saved'] / 1e6:.1f} MB of index saved")
+        chunks = deduped
+
     save_chunks(chunks, OUTPUT_CHUNKS_FILE)
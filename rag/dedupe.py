@@ -0,0 +1,204 @@
+# rag/dedupe.py
+"""
+Near-duplicate chunk elimination (MinHash + LSH), run between
+create_chunks() and store_embeddings().
+
+Bank PDFs repeat the same T&C paragraphs, footers and disclaimers on
+every page, and CHUNK_OVERLAP makes neighbouring chunks overlap. Each
+copy costs an embedding call, a vector in Chroma and, when retrieved,
+redundant context in the prompt.
+
+  1. Each chunk is shingled into word n-grams (lowercased, whitespace
+     collapsed) and summarised by a MinHash signature of NUM_PERM values.
+  2. LSH: the signature is cut into BANDS bands; chunks sharing any band
+     bucket become candidate pairs.
+  3. Candidates whose estimated Jaccard similarity is >= THRESHOLD are
+     merged (union-find). Since that is transitive (A~B and B~C join A
+     and C), each group is then split so every member's exact Jaccard
+     with the group's canonical chunk is >= THRESHOLD.
+  4. Each group is collapsed into its canonical chunk (the longest text,
+     so nothing a shorter copy says is lost) that lists every page it
+     came from in "source_pages" and the ids it replaced in "duplicate_ids".
+
+Only chunks of the same kind are compared (text with text, table rows
+with table rows).
+"""
+import hashlib
+import math
+import re
+from collections import defaultdict
+
+from rag.partitions import GENERAL, PARTITION_KEY
+
+NUM_PERM = 128
+BANDS = 32            # 32 bands x 4 rows: candidates from ~0.5 Jaccard
+SHINGLE_WORDS = 5
+THRESHOLD = 0.85      # Jaccard needed to merge two chunks
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD = re.compile(r"\w+")
+
+
+# ------------------------------------------------------------
+# MinHash
+# ------------------------------------------------------------
+def shingles(text, size=SHINGLE_WORDS):
+    """Set of word n-grams of the normalised text (whole text if shorter)."""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _permutations(num_perm, seed=1):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    b = rng.integers(0, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash(shingle_set, permutations):
+    """MinHash signature: per permutation, the minimum hash over all shingles."""
+    import numpy as np
+
+    a, b = permutations
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+         for s in shingle_set),
+        dtype=np.uint64,
+        count=len(shingle_set),
+    )
+
+    # (a*x + b) mod p, truncated to 32 bits (uint64 wrap-around is part of the hash)
+    with np.errstate(over="ignore"):
+        mixed = (a[:, None] * hashes[None, :] + b[:, None]) % np.uint64(_MERSENNE_PRIME)
+    return (mixed & np.uint64(_MAX_HASH)).min(axis=1)
+
+
+def estimated_jaccard(sig_a, sig_b):
+    return float((sig_a == sig_b).mean())
+
+
+def jaccard(a, b):
+    """Exact Jaccard similarity of two shingle sets."""
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+# ------------------------------------------------------------
+# LSH grouping
+# ------------------------------------------------------------
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _kind(chunk):
+    return "table" if chunk.get("table_index") is not None else "text"
+
+
+def find_duplicate_groups(chunks, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """Indices of near-duplicate chunks, grouped: [[i, j, ...], ...] (singletons included)."""
+    permutations = _permutations(num_perm)
+    shingle_sets = [shingles(c["content"]) for c in chunks]
+    signatures = [minhash(s, permutations) for s in shingle_sets]
+    rows = num_perm // bands
+
+    buckets = defaultdict(list)
+    for i, (chunk, sig) in enumerate(zip(chunks, signatures)):
+        kind = _kind(chunk)
+        for band in range(bands):
+            buckets[(kind, band, sig[band * rows:(band + 1) * rows].tobytes())].append(i)
+
+    parent = list(range(len(chunks)))
+    checked = set()
+    for members in buckets.values():
+        for j in members[1:]:
+            i = members[0]
+            root_i, root_j = _find(parent, i), _find(parent, j)
+            if root_i == root_j or (i, j) in checked:
+                continue
+            checked.add((i, j))
+            if estimated_jaccard(signatures[i], signatures[j]) >= threshold:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    candidates = defaultdict(list)
+    for i in range(len(chunks)):
+        candidates[_find(parent, i)].append(i)
+
+    # Union-find is transitive (A~B, B~C joins A and C). Split each
+    # candidate group so every member is within `threshold` (exact
+    # Jaccard) of the group's canonical chunk, the one dedupe_chunks() keeps.
+    groups = []
+    for members in candidates.values():
+        remaining = sorted(members, key=lambda i: _canonical_order(chunks, i))
+        while remaining:
+            canonical = remaining[0]
+            group = [canonical] + [
+                i for i in remaining[1:]
+                if jaccard(shingle_sets[canonical], shingle_sets[i]) >= threshold
+            ]
+            groups.append(sorted(group))
+            remaining = [i for i in remaining if i not in group]
+    return groups
+
+
+def _canonical_order(chunks, i):
+    # longest content first, then earliest
+    return (-len(chunks[i]["content"]), i)
+
+
+# ------------------------------------------------------------
+# Collapse
+# ------------------------------------------------------------
+def dedupe_chunks(chunks, threshold=THRESHOLD):
+    """
+    Collapse near-duplicate chunks. Returns a new list in document order;
+    every chunk gets "source_pages" ([{"pdf_name", "page_num"}, ...]) and
+    canonical chunks of a group also "duplicate_ids". A group spanning
+    several products is tagged with the "general" partition.
+    """
+    result = []
+    for group in sorted(find_duplicate_groups(chunks, threshold), key=min):
+        canonical = min(group, key=lambda i: _canonical_order(chunks, i))
+        chunk = dict(chunks[canonical])
+
+        pages = []
+        for i in sorted(group):
+            page = {"pdf_name": chunks[i]["pdf_name"], "page_num": chunks[i]["page_num"]}
+            if page not in pages:
+                pages.append(page)
+        chunk["source_pages"] = pages
+
+        products = {chunks[i].get(PARTITION_KEY) for i in group}
+        if len(products) > 1:
+            chunk[PARTITION_KEY] = GENERAL
+
+        duplicates = [chunks[i]["id"] for i in sorted(group) if i != canonical]
+        if duplicates:
+            chunk["duplicate_ids"] = duplicates
+        result.append(chunk)
+
+    return result
+
+
+def dedupe_report(before, after, batch_size=32, embedding_dim=3072):
+    """Embedding calls and index size saved by dedupe_chunks()."""
+    removed = len(before) - len(after)
+    chars_before = sum(len(c["content"]) for c in before)
+    chars_after = sum(len(c["content"]) for c in after)
+    vector_bytes = embedding_dim * 4  # float32
+
+    return {
+        "chunks_before": len(before),
+        "chunks_after": len(after),
+        "chunks_removed": removed,
+        "removed_pct": round(100 * removed / len(before), 1) if before else 0.0,
+        "embedding_calls_saved": math.ceil(len(before) / batch_size) - math.ceil(len(after) / batch_size),
+        "embedded_chars_saved": chars_before - chars_after,
+        "index_bytes_saved": removed * vector_bytes + (chars_before - chars_after),
+    }
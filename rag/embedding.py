@@ -1,11 +1,12 @@
 # rag/embedding.py
 import os
 import json
-import chromadb
-from chromadb.config import Settings
 from dotenv import load_dotenv
-import vertexai
-from vertexai.preview.language_models import TextEmbeddingModel
+
+from rag.partitions import PARTITION_KEY, classify_chunk
+
+# chromadb and the Vertex AI SDK are imported inside the functions that use
+# them: both take seconds to import and most importers need neither.
 
 load_dotenv()
 
@@ -22,6 +23,12 @@ EMBEDDING_MODEL_NAME = "gemini-embedding-001"   # Gemini Embedding
 # How many chunks to embed in a single API call
 BATCH_SIZE = 32
 
+# Approximate nearest-neighbour index kept in sync with Chroma (rag/ann_index.py)
+ANN_INDEX_DIR = "data/ann_index"
+
+# Extra metadata kept for table chunks (see rag/chunker.py)
+TABLE_METADATA_KEYS = ("table_index", "row_start", "row_end")
+
 
 # ============================================================
 # Vertex AI Setup
@@ -60,6 +67,7 @@ def init_vertex_ai():
         )
 
     # Initialize Vertex AI client
+    import vertexai
     vertexai.init(project=project_id, location=region)
     print(f"✓ Vertex AI initialized (project={project_id}, region={region})")
 
@@ -69,6 +77,8 @@ def get_embedding_model():
     Load the Vertex AI embedding model.
     Called once and reused for all batches.
     """
+    from vertexai.preview.language_models import TextEmbeddingModel
+
     model = TextEmbeddingModel.from_pretrained(EMBEDDING_MODEL_NAME)
     print(f"✓ Loaded embedding model: {EMBEDDING_MODEL_NAME}")
     return model
@@ -109,6 +119,9 @@ def init_chroma():
     Initialize ChromaDB persistent client and collection.
     Creates the collection if it does not exist.
     """
+    import chromadb
+    from chromadb.config import Settings
+
     os.makedirs(CHROMA_DB_DIR, exist_ok=True)
 
     client = chromadb.PersistentClient(
@@ -145,14 +158,17 @@ def embed_batch(model, texts):
         raise
 
 
-def store_embeddings(chunks, collection, model):
+def store_embeddings(chunks, collection, model, ann_index=None):
     """
-    Embed all chunks in batches and store them in Chroma DB.
+    Embed all chunks in batches and store them in Chroma DB
+    (and in `ann_index`, an IVFIndex, when given).
 
     Each chunk is stored with:
       - id        -> chunk["id"]
       - document  -> chunk["content"]
-      - metadata  -> { pdf_name, page_num }
+      - metadata  -> { pdf_name, page_num, product }
+                     + { table_index, row_start, row_end } for table chunks
+                     + source_pages (JSON list) for deduplicated chunks
       - embedding -> vector from Vertex AI
     """
     total = len(chunks)
@@ -171,7 +187,16 @@ def store_embeddings(chunks, collection, model):
         metadata = {
             "pdf_name": chunk.get("pdf_name", ""),
             "page_num": chunk.get("page_num", None),
+            # Retrieval partition (chunks files written before tagging are classified here)
+            PARTITION_KEY: chunk.get(PARTITION_KEY) or classify_chunk(chunk.get("pdf_name"), text),
         }
+        # Table provenance (Chroma metadata values cannot be None)
+        for key in TABLE_METADATA_KEYS:
+            if chunk.get(key) is not None:
+                metadata[key] = chunk[key]
+        # Every page a deduplicated chunk appeared on (metadata values must be scalars)
+        if chunk.get("source_pages"):
+            metadata["source_pages"] = json.dumps(chunk["source_pages"])
 
         batch_ids.append(chunk_id)
         batch_texts.append(text)
@@ -190,6 +215,11 @@ def store_embeddings(chunks, collection, model):
                     embeddings=vectors,
                     metadatas=batch_metadatas,
                 )
+                if ann_index is not None:
+                    ann_index.add(batch_ids, vectors, [
+                        {**metadata, "content": text}
+                        for metadata, text in zip(batch_metadatas, batch_texts)
+                    ])
 
                 embedded_count += len(batch_texts)
                 print(f"  ✓ Embedded {embedded_count}/{total} chunks")
@@ -228,23 +258,38 @@ if __name__ == "__main__":
     print("=" * 60)
 
     try:
-        print("\n[1/5] Initializing Vertex AI...")
+        print("\n[1/6] Initializing Vertex AI...")
         init_vertex_ai()
 
-        print("\n[2/5] Loading embedding model...")
+        print("\n[2/6] Loading embedding model...")
         model = get_embedding_model()
 
-        print("\n[3/5] Loading chunks from JSON...")
+        print("\n[3/6] Loading chunks from JSON...")
         chunks = load_chunks(CHUNKS_FILE)
 
-        print("\n[4/5] Initializing Chroma DB...")
+        print("\n[4/6] Initializing Chroma DB...")
         collection = init_chroma()
 
-        print("\n[5/5] Embedding chunks and storing in Chroma...")
-        success, failed = store_embeddings(chunks, collection, model)
+        # Existing ANN index: updated in place (inserts / replacements below,
+        # chunks that no longer exist are deleted in step 6)
+        from rag.ann_index import IVFIndex
+        ann_index = IVFIndex.load(ANN_INDEX_DIR) if os.path.exists(ANN_INDEX_DIR) else None
+
+        print("\n[5/6] Embedding chunks and storing in Chroma...")
+        success, failed = store_embeddings(chunks, collection, model, ann_index)
 
         verify_chroma(collection)
 
+        print("\n[6/6] Updating the ANN index...")
+        if ann_index is None:
+            ann_index = IVFIndex.from_collection(collection)
+        else:
+            current = {chunk["id"] for chunk in chunks}
+            removed = ann_index.remove([i for i in ann_index.ids() if i not in current])
+            print(f"  Removed {removed} stale vectors")
+        ann_index.save(ANN_INDEX_DIR)
+        print(f"✓ ANN index: {len(ann_index)} vectors in {len(ann_index.centroids)} lists ({ANN_INDEX_DIR})")
+
         print("\n" + "=" * 60)
         print("✓ EMBEDDING COMPLETE")
         print("=" * 60)
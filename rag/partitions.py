@@ -0,0 +1,94 @@
+# rag/partitions.py
+"""
+Product-family partitions for retrieval.
+
+Every chunk is tagged at ingestion with the product it belongs to
+(chunk["product"], stored as Chroma metadata):
+
+  home_loan      personal_loan      credit_card      general
+
+"general" holds chunks that are not about one product (pricing grids
+covering several products, EMI basics, bank-wide policies).
+
+At query time select_partitions() picks the families to search from
+keywords in the question plus the flow the conversation is in (a
+question asked during the home-loan eligibility flow is about home
+loans). "general" is always searched alongside them. None means the
+question names no product and the whole collection is searched.
+"""
+import re
+
+PARTITION_KEY = "product"
+GENERAL = "general"
+
+# Keywords per family, matched on word boundaries (lower-cased text).
+# No bare "card" (PAN / Aadhaar / debit card) or "property" (loan against property).
+PRODUCT_KEYWORDS = {
+    "home_loan": (
+        "home loan", "housing loan", "home loans", "housing finance", "mortgage",
+        "balance transfer", "plot loan", "top-up", "top up", "construction",
+    ),
+    "personal_loan": ("personal loan", "personal loans"),
+    "credit_card": (
+        "credit card", "credit cards", "annual fee", "joining fee",
+        "reward points", "cashback", "card limit", "minimum amount due",
+    ),
+}
+PARTITIONS = tuple(PRODUCT_KEYWORDS) + (GENERAL,)
+
+# File name fragments that fix a document's family outright
+PDF_NAME_KEYWORDS = {
+    "home_loan": ("home-loan", "home_loan", "homeloan", "housing"),
+    "personal_loan": ("personal-loan", "personal_loan", "personalloan"),
+    "credit_card": ("credit-card", "credit_card", "creditcard"),
+}
+
+# Conversation flow -> family its questions are about
+FLOW_PARTITIONS = {
+    "LOAN": ("home_loan",),
+}
+
+# A chunk is tagged with a family only when it clearly dominates
+DOMINANCE = 2.0
+
+_PATTERNS = {
+    family: re.compile(r"\b(" + "|".join(re.escape(k) for k in keywords) + r")\b")
+    for family, keywords in PRODUCT_KEYWORDS.items()
+}
+
+
+def _keyword_counts(text):
+    text = (text or "").lower()
+    return {family: len(pattern.findall(text)) for family, pattern in _PATTERNS.items()}
+
+
+def classify_chunk(pdf_name, content):
+    """Product family of a chunk: from the file name, else from its text."""
+    name = (pdf_name or "").lower()
+    for family, fragments in PDF_NAME_KEYWORDS.items():
+        if any(fragment in name for fragment in fragments):
+            return family
+
+    counts = sorted(_keyword_counts(content).items(), key=lambda item: item[1], reverse=True)
+    (best, best_count), (_, runner_up) = counts[0], counts[1]
+    if best_count and best_count >= DOMINANCE * runner_up:
+        return best
+    return GENERAL
+
+
+def classify_query(query):
+    """Families named in a question (empty when it names none)."""
+    return [family for family, count in _keyword_counts(query).items() if count]
+
+
+def select_partitions(query, flow=None):
+    """
+    Partitions to search for `query`, or None to search everything.
+    `flow` is the conversation's active (or paused) flow, e.g. "LOAN".
+    """
+    # The flow's family is kept even when the question names another one
+    families = classify_query(query)
+    families += [f for f in FLOW_PARTITIONS.get(flow, ()) if f not in families]
+    if not families:
+        return None
+    return tuple(families) + (GENERAL,)
@@ -1,7 +1,14 @@
 # rag/pdf_extraction.py
 import os
 import json
+import hashlib
+import weakref
+import argparse
 import pdfplumber
+from pdfplumber.page import Page
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
+from pdfminer.psparser import LIT
 
 
 # with pdfplumber.open("data/pdfs/pricing-grid.pdf") as pdf: #(Me trying to learn)
@@ -16,6 +23,19 @@ import pdfplumber
 # ------------------------------------------------------------
 PDF_FOLDER = "data/pdfs"
 OUTPUT_JSON = "data/pdf_extraction/raw_data.json"
+# Streaming mode: one JSON line per page, written as pages are extracted
+OUTPUT_JSONL = "data/pdf_extraction/raw_pages.jsonl"
+
+# Per-page extraction results, keyed by a hash of the page's content.
+# Bump CACHE_VERSION when the extraction output format changes.
+CACHE_DIR = "data/pdf_extraction/cache"
+CACHE_VERSION = 1
+
+# pdfplumber's default table settings find tables from ruling lines only;
+# edges shorter than this are ignored by its table finder
+MIN_EDGE_LENGTH = 3
+
+LIT_IMAGE = LIT("Image")
 
 # ------------------------------------------------------------
 # Helper to clean table format
@@ -26,16 +46,197 @@ def table_to_string(table):
     lines = []
     for row in table:
         # Replace None with empty string and join columns with ' | '
-        clean_row = [col if col is not None else "" for col in row]
+        # (line breaks inside a cell are flattened: one table row = one line,
+        # the chunker splits tables on row boundaries)
+        clean_row = [col.replace("\n", " ") if col is not None else "" for col in row]
         line = " | ".join(clean_row)
         lines.append(line)
     return "\n".join(lines)
 
 
+# ------------------------------------------------------------
+# Cheap table pre-check
+# ------------------------------------------------------------
+def may_contain_table(page):
+    """
+    False when the page cannot contain a table for extract_tables().
+
+    With the default "lines" strategy a table needs at least two horizontal
+    and two vertical ruling edges (from lines, rects or curves). Counting
+    them is cheap; TableFinder (edge merging, intersections, cells) is not,
+    and prose pages usually have no ruling at all.
+    """
+    horizontal = vertical = 0
+    for edge in page.edges:
+        if edge["orientation"] == "h":
+            horizontal += edge["x1"] - edge["x0"] >= MIN_EDGE_LENGTH
+        else:
+            vertical += edge["bottom"] - edge["top"] >= MIN_EDGE_LENGTH
+        if horizontal >= 2 and vertical >= 2:
+            return True
+    return False
+
+
+# ------------------------------------------------------------
+# Per-page cache
+# ------------------------------------------------------------
+# Keys never followed while hashing (back-pointers into the page tree)
+_SKIP_KEYS = {"Parent", "P"}
+
+# Per-document memo: objid -> digest of that object (fonts and XObjects
+# are shared by many pages, so each is hashed once)
+_OBJECT_DIGESTS = weakref.WeakKeyDictionary()
+
+
+def _object_digest(obj, memo, visiting):
+    """
+    Digest of a PDF object and everything it references: dicts and arrays
+    recursively, streams with their data (so Form XObjects, ToUnicode
+    CMaps and embedded font programs are covered), image data excepted.
+    """
+    if isinstance(obj, PDFObjRef):
+        if obj.objid in memo:
+            return memo[obj.objid]
+        if obj.objid in visiting:           # reference cycle
+            return f"ref{obj.objid}".encode()
+        visiting.add(obj.objid)
+        digest = _object_digest(obj.resolve(), memo, visiting)
+        visiting.discard(obj.objid)
+        memo[obj.objid] = digest
+        return digest
+
+    h = hashlib.sha256()
+    if isinstance(obj, PDFStream):
+        h.update(b"stream" + _object_digest(obj.attrs, memo, visiting))
+        if obj.attrs.get("Subtype") != LIT_IMAGE:
+            h.update(obj.get_data() or b"")
+    elif isinstance(obj, dict):
+        for key in sorted(obj, key=str):
+            if key not in _SKIP_KEYS:
+                h.update(f"/{key}".encode() + _object_digest(obj[key], memo, visiting))
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[")
+        for item in obj:
+            h.update(_object_digest(item, memo, visiting))
+    else:
+        h.update(repr(obj).encode())
+    return h.digest()
+
+
+def page_fingerprint(page):
+    """
+    Hash of everything extraction depends on: the page's content streams,
+    its boxes / rotation and all resources it references, recursively
+    (fonts with their ToUnicode maps and descriptors, Form XObjects and
+    their own resources).
+    """
+    page_obj = page.page_obj
+    memo = _OBJECT_DIGESTS.setdefault(page_obj.doc, {})
+    digest = hashlib.sha256(
+        f"v{CACHE_VERSION}|{page_obj.mediabox}|{page_obj.cropbox}|{page_obj.rotate}".encode()
+    )
+
+    for stream in page_obj.contents:
+        digest.update(resolve1(stream).get_data())
+
+    digest.update(_object_digest(page_obj.resources or {}, memo, set()))
+    return digest.hexdigest()
+
+
+class PageCache:
+    """One JSON file per page fingerprint: {"text": ..., "tables": [...]}."""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, record):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, path)  # atomic: readers never see half a file
+
+
+# ------------------------------------------------------------
+# Page extraction
+# ------------------------------------------------------------
+def extract_page(page, cache=None, stats=None):
+    """
+    {"text": ..., "tables": [...]} for one page, from the cache when the
+    page content is unchanged. `stats` (dict) counts cache hits / misses
+    and table extractions skipped by the pre-check.
+    """
+    stats = stats if stats is not None else {}
+    key = page_fingerprint(page) if cache is not None else None
+
+    if key is not None:
+        record = cache.get(key)
+        if record is not None:
+            stats["cache_hits"] = stats.get("cache_hits", 0) + 1
+            return record
+        stats["cache_misses"] = stats.get("cache_misses", 0) + 1
+
+    text = page.extract_text() or ""  # Sometimes None
+
+    tables_as_text = []
+    if may_contain_table(page):
+        for table in page.extract_tables() or []:
+            tables_as_text.append(table_to_string(table))
+    else:
+        stats["tables_skipped"] = stats.get("tables_skipped", 0) + 1
+
+    record = {"text": text, "tables": tables_as_text}
+    if key is not None:
+        cache.put(key, record)
+    return record
+
+
+# ------------------------------------------------------------
+# Bounded-memory page iterator
+# ------------------------------------------------------------
+def iter_pdf_pages(pdf_path, cache=None, stats=None):
+    """
+    Yield {"page_num", "text", "tables"} one page at a time.
+
+    Memory stays flat regardless of page count:
+      - pages are created one by one instead of through pdf.pages,
+        which keeps every Page object (and its caches) for the whole file
+      - each page's parsed objects / layout are released (page.close())
+        as soon as it has been extracted
+      - pdfminer's document-level object cache is off, so decoded content
+        streams are not kept either (fonts stay cached in the resource manager)
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        pdf.doc.caching = False
+        doctop = 0
+
+        for page_num, page_obj in enumerate(PDFPage.create_pages(pdf.doc), start=1):
+            page = Page(pdf, page_obj, page_number=page_num, initial_doctop=doctop)
+            doctop += page.height
+            try:
+                record = extract_page(page, cache, stats)
+            finally:
+                page.close()
+
+            yield {"page_num": page_num, "text": record["text"], "tables": record["tables"]}
+
+
 # ------------------------------------------------------------
 # Main extraction function
 # ------------------------------------------------------------
-def extract_all_pdfs(pdf_folder):
+def extract_all_pdfs(pdf_folder, cache_dir=CACHE_DIR):
     """
     Loops through all PDFs in the folder
     Extracts text and tables page-by-page
@@ -47,8 +248,11 @@ def extract_all_pdfs(pdf_folder):
           ...
       ]
     }
+    Pages whose content is unchanged since a previous run are read from
+    the on-disk cache in `cache_dir` (None disables it).
     """
     all_pdfs_data = []
+    cache = PageCache(cache_dir) if cache_dir else None
 
     for filename in os.listdir(pdf_folder):
         if not filename.lower().endswith(".pdf"):
@@ -61,24 +265,14 @@ def extract_all_pdfs(pdf_folder):
             "pdf_name": filename,
             "pages": []
         }
+        stats = {}
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for i, page in enumerate(pdf.pages, start=1):
-                    text = page.extract_text() or ""  # Sometimes None
-                    
-                    raw_tables = page.extract_tables()
-                    tables_as_text = []
-
-                    if raw_tables:
-                        for table in raw_tables:
-                            table_text = table_to_string(table)
-                            tables_as_text.append(table_text)
-
-                    pdf_data["pages"].append({
-                        "page_num": i,
-                        "text": text,
-                        "tables": tables_as_text
-                    })
+            for page in iter_pdf_pages(pdf_path, cache, stats):
+                pdf_data["pages"].append(page)
+            if stats:
+                print(f"  cache hits: {stats.get('cache_hits', 0)}, "
+                      f"misses: {stats.get('cache_misses', 0)}, "
+                      f"table extraction skipped: {stats.get('tables_skipped', 0)} pages")
         except Exception as e:
             print(f"Error processing {filename}: {e}")
             continue
@@ -88,6 +282,34 @@ def extract_all_pdfs(pdf_folder):
     return all_pdfs_data
 
 
+def stream_all_pdfs(pdf_folder, output_path, cache_dir=CACHE_DIR):
+    """
+    Like extract_all_pdfs(), but writes each page as one JSON line
+    ({"pdf_name", "page_num", "text", "tables"}) as soon as it is extracted,
+    so nothing accumulates in memory. Returns the number of pages written.
+    """
+    cache = PageCache(cache_dir) if cache_dir else None
+    written = 0
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+    with open(output_path, "w", encoding="utf-8") as out:
+        for filename in sorted(os.listdir(pdf_folder)):
+            if not filename.lower().endswith(".pdf"):
+                continue
+
+            print(f"Processing: {filename}")
+            try:
+                for page in iter_pdf_pages(os.path.join(pdf_folder, filename), cache):
+                    out.write(json.dumps({"pdf_name": filename, **page}, ensure_ascii=False) + "\n")
+                    written += 1
+            except Exception as e:
+                print(f"Error processing {filename}: {e}")
+                continue
+
+    print(f"\nStreamed {written} pages to: {output_path}")
+    return written
+
+
 # ------------------------------------------------------------
 # Save extracted data into JSON
 # ------------------------------------------------------------
@@ -101,6 +323,14 @@ def save_json(data, output_path):
 # Main Script Execution
 # ------------------------------------------------------------
 if __name__ == "__main__":
-    extracted = extract_all_pdfs(PDF_FOLDER)
-    save_json(extracted, OUTPUT_JSON)
+    parser = argparse.ArgumentParser(description="Extract text and tables from PDFs")
+    parser.add_argument("--stream", action="store_true",
+                        help=f"write pages to {OUTPUT_JSONL} as they are extracted (bounded memory)")
+    args = parser.parse_args()
+
+    if args.stream:
+        stream_all_pdfs(PDF_FOLDER, OUTPUT_JSONL)
+    else:
+        extracted = extract_all_pdfs(PDF_FOLDER)
+        save_json(extracted, OUTPUT_JSON)
 
@@ -0,0 +1,218 @@
+# rag/vector_compression.py
+"""
+Compressed vector storage for retrieval.
+
+Chroma keeps every gemini-embedding-001 vector as 3072 float32 values
+(12 KB per chunk), in every worker. CompressedVectorStore keeps
+
+  - only the first `dim` dimensions (Matryoshka truncation: the model is
+    trained so that prefixes are usable embeddings), re-normalised
+  - as float32, float16 (2 bytes / value) or int8 (1 byte / value,
+    symmetric per-dimension scale); int8 is also the faster of the two
+    to score, NumPy's float16 -> float32 conversion is slow on most CPUs
+
+and scores queries directly on that form. With `rescore` > 0 the
+top k * rescore candidates are re-scored against the full-precision
+vectors, which live in a memory-mapped .npy file on disk (only the rows
+touched are paged in), so recall comes back at almost no memory cost.
+
+Build from the Chroma collection filled by rag/embedding.py:
+
+    python -m rag.vector_compression --dim 768 --dtype int8
+
+and select it in tools/rag.py with RAG_RETRIEVER=compressed.
+"""
+import argparse
+import json
+import os
+
+from rag.partitions import PARTITION_KEY
+
+DTYPES = ("float32", "float16", "int8")
+INDEX_DIR = "data/vector_index"
+
+# Compressed rows are widened to float32 one cache-sized block at a time
+_BLOCK_BYTES = 1 << 20
+
+
+def _normalize(vectors):
+    import numpy as np
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class CompressedVectorStore:
+    """
+    chunks[i] (dict with id / pdf_name / page_num / content / metadata)
+    belongs to row i of the vector matrix. search() returns chunk dicts
+    like rag_query.retrieve_chunks, best first, each with a "score".
+    """
+
+    def __init__(self, chunks, vectors, scales=None, full_vectors=None, dim=None, dtype="float32"):
+        if dtype not in DTYPES:
+            raise ValueError(f"dtype must be one of {DTYPES}")
+        self.chunks = chunks
+        self.vectors = vectors            # (n, dim) float32 / float16 / int8
+        self.scales = scales              # (dim,) float32 for int8, else None
+        self.full_vectors = full_vectors  # (n, full_dim) float32, usually memory-mapped
+        self.dim = dim or vectors.shape[1]
+        self.dtype = dtype
+        self._partition_rows = None       # partition value (or tuple of them) -> row indices, built on first use
+
+    # ---------------------------
+    # Build
+    # ---------------------------
+    @classmethod
+    def build(cls, chunks, embeddings, dim=None, dtype="int8", keep_full=True):
+        import numpy as np
+        full = _normalize(np.asarray(embeddings, dtype=np.float32))
+        dim = dim or full.shape[1]
+        truncated = _normalize(full[:, :dim])
+
+        scales = None
+        if dtype == "int8":
+            scales = np.abs(truncated).max(axis=0) / 127
+            scales[scales == 0] = 1
+            vectors = np.round(truncated / scales).astype(np.int8)
+            scales = scales.astype(np.float32)
+        else:
+            vectors = truncated.astype(dtype)
+
+        return cls(list(chunks), vectors, scales, full if keep_full else None, dim, dtype)
+
+    @classmethod
+    def from_collection(cls, collection, dim=None, dtype="int8", keep_full=True):
+        """Build from a Chroma collection (ids, documents, metadatas, embeddings)."""
+        data = collection.get(include=["embeddings", "documents", "metadatas"])
+        chunks = [
+            {"id": chunk_id, **(metadata or {}), "content": document}
+            for chunk_id, document, metadata in zip(data["ids"], data["documents"], data["metadatas"])
+        ]
+        return cls.build(chunks, data["embeddings"], dim, dtype, keep_full)
+
+    # ---------------------------
+    # Search
+    # ---------------------------
+    def _query(self, query_embedding):
+        import numpy as np
+        query = np.asarray(query_embedding, dtype=np.float32)
+        return _normalize(query[: self.dim]), _normalize(query)
+
+    def partition_rows(self, partitions):
+        """Sorted row indices of the chunks in `partitions` (for search(rows=...))."""
+        import numpy as np
+        if self._partition_rows is None:
+            by_partition = {}
+            for row, chunk in enumerate(self.chunks):
+                by_partition.setdefault(chunk.get(PARTITION_KEY), []).append(row)
+            self._partition_rows = {p: np.asarray(rows, dtype=np.int64) for p, rows in by_partition.items()}
+        key = tuple(partitions)
+        if key not in self._partition_rows:
+            selected = [self._partition_rows[p] for p in partitions if p in self._partition_rows]
+            self._partition_rows[key] = np.sort(np.concatenate(selected)) if selected else np.zeros(0, dtype=np.int64)
+        return self._partition_rows[key]
+
+    def score(self, query, rows=None):
+        """Compressed-form scores (dot products) for `rows` (default: all)."""
+        import numpy as np
+        if self.scales is not None:
+            query = query * self.scales   # int8: dequantize via the query
+        if self.vectors.dtype == np.float32:
+            if rows is None:
+                return self.vectors @ query
+            if len(rows) * 4 > len(self.vectors):
+                # a large subset: one contiguous matmul beats gathering the rows
+                return (self.vectors @ query)[rows]
+
+        # rows are gathered (and widened) block by block, so the copy stays in cache
+        count = len(self.vectors) if rows is None else len(rows)
+        scores = np.empty(count, dtype=np.float32)
+        block = max(64, _BLOCK_BYTES // (4 * self.vectors.shape[1]))
+        for start in range(0, count, block):
+            chunk = self.vectors[start:start + block] if rows is None else self.vectors[rows[start:start + block]]
+            scores[start:start + block] = chunk.astype(np.float32, copy=False) @ query
+        return scores
+
+    def search(self, query_embedding, k=4, rescore=0, rows=None):
+        """
+        Top-k chunks. `rescore` > 0 re-ranks the best k * rescore candidates
+        with the full-precision vectors. `rows` restricts the search to a
+        subset of row indices (e.g. one partition).
+        """
+        import numpy as np
+        if not len(self.chunks) or k <= 0 or (rows is not None and not len(rows)):
+            return []
+        query, full_query = self._query(query_embedding)
+
+        scores = self.score(query, rows)
+        candidates = min(len(scores), k * rescore if rescore and self.full_vectors is not None else k)
+        top = np.argpartition(-scores, candidates - 1)[:candidates]
+        top = top[np.argsort(-scores[top])]
+        row_ids = top if rows is None else np.asarray(rows)[top]
+        top_scores = scores[top]
+
+        if rescore and self.full_vectors is not None:
+            order = np.argsort(row_ids)             # sorted reads from the memory map
+            exact = np.empty(len(row_ids), dtype=np.float32)
+            exact[order] = self.full_vectors[row_ids[order]] @ full_query
+            best = np.argsort(-exact)[:k]
+            row_ids, top_scores = row_ids[best], exact[best]
+
+        return [
+            {**self.chunks[i], "score": float(s)}
+            for i, s in zip(row_ids[:k].tolist(), top_scores[:k].tolist())
+        ]
+
+    # ---------------------------
+    # Size / persistence
+    # ---------------------------
+    def memory_bytes(self):
+        """Resident bytes of the vectors searched in memory (excludes the full-precision file)."""
+        return self.vectors.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def save(self, directory=INDEX_DIR):
+        import numpy as np
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "vectors.npy"), self.vectors)
+        if self.scales is not None:
+            np.save(os.path.join(directory, "scales.npy"), self.scales)
+        if self.full_vectors is not None:
+            np.save(os.path.join(directory, "full.npy"), np.asarray(self.full_vectors, dtype=np.float32))
+        with open(os.path.join(directory, "chunks.json"), "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "dtype": self.dtype, "chunks": self.chunks}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory=INDEX_DIR):
+        import numpy as np
+
+        with open(os.path.join(directory, "chunks.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        scales_path = os.path.join(directory, "scales.npy")
+        full_path = os.path.join(directory, "full.npy")
+        return cls(
+            meta["chunks"],
+            np.load(os.path.join(directory, "vectors.npy")),
+            np.load(scales_path) if os.path.exists(scales_path) else None,
+            np.load(full_path, mmap_mode="r") if os.path.exists(full_path) else None,
+            meta["dim"],
+            meta["dtype"],
+        )
+
+
+# ------------------------------------------------------------
+# MAIN: build from the Chroma collection
+# ------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a compressed vector store from Chroma")
+    parser.add_argument("--dim", type=int, default=768, help="keep the first N dimensions")
+    parser.add_argument("--dtype", choices=DTYPES, default="int8")
+    parser.add_argument("--no-full", action="store_true", help="do not keep full vectors for re-scoring")
+    parser.add_argument("--out", default=INDEX_DIR)
+    args = parser.parse_args()
+
+    from rag.embedding import init_chroma
+
+    store = CompressedVectorStore.from_collection(init_chroma(), args.dim, args.dtype, not args.no_full)
+    store.save(args.out)
+    print(f"✓ Saved {len(store.chunks)} vectors ({args.dim} dims, {args.dtype}, "
+          f"{store.memory_bytes() / 1e6:.1f} MB in memory) to {args.out}")
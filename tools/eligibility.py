@@ -0,0 +1,277 @@
+#eligibility.py
+"""
+Home loan eligibility rule engine.
+
+One set of rules shared by:
+- the chat loan flow (agent/flows/loan_flow.py)  -> method "emi_capacity"
+- the single-turn loan_tool (tools/loan.py)      -> method "multiplier"
+- overnight batch scoring (CLI at the bottom of this file)
+
+Rules are evaluated column-wise with NumPy over an applicant table
+(dict of columns, pandas DataFrame or pyarrow Table). A single applicant
+is simply a one-row table.
+
+No LLM. Deterministic behavior.
+"""
+import argparse
+import csv
+import time
+from itertools import islice
+
+import numpy as np
+
+from tools.eligibility_policy import SALARIED, SELF_EMPLOYED, get_policy
+
+# ---------------------------
+# 1. Methods and reason codes
+# ---------------------------
+# Rates, FOIR, multipliers and age bands live in config/eligibility_policy.json
+# and are compiled into lookup tables by tools/eligibility_policy.py.
+
+METHODS = ("emi_capacity", "multiplier")
+
+# Reason codes (first failing rule wins, in this priority order)
+OK = 0
+AGE_NOT_ELIGIBLE = 1
+TENURE_EXCEEDS_RETIREMENT = 2
+INSUFFICIENT_INCOME = 3
+INVALID_INPUT = 4  # batch CLI only: row could not be parsed
+
+REASONS = {
+    OK: "Eligible",
+    AGE_NOT_ELIGIBLE: "Age not eligible",
+    TENURE_EXCEEDS_RETIREMENT: "Tenure exceeds retirement age",
+    INSUFFICIENT_INCOME: "Insufficient income",
+    INVALID_INPUT: "Invalid input",
+}
+
+
+# ---------------------------
+# 2. Batch scoring
+# ---------------------------
+def _column(table, name, dtype):
+    values = table[name]
+    if hasattr(values, "to_numpy"):  # pandas Series / pyarrow (Chunked)Array
+        values = values.to_numpy()
+    return np.asarray(values, dtype=dtype)
+
+
+def _has_column(table, name):
+    try:
+        return name in table.column_names  # pyarrow Table
+    except AttributeError:
+        return name in table
+
+
+# Labels that get salaried terms (after strip + lower-casing); anything
+# else gets the conservative self-employed terms
+SALARIED_LABELS = ("salaried", "salary")
+
+
+def is_self_employed(employment_type):
+    """
+    Boolean array: applicant gets self-employed terms.
+    Only known salaried labels ("salaried", "Salary ", ...) are salaried;
+    every other label ("self-employed", "business", "freelancer", "") is
+    self-employed. The canonical labels from slot extraction are matched
+    with a fast equality test; only other spellings are normalised.
+    """
+    employment = np.asarray(employment_type)
+    if employment.dtype.kind != "U":
+        employment = employment.astype(str)
+
+    salaried = employment == "salaried"
+    other = ~salaried & (employment != "self_employed")
+    if other.any():
+        salaried[other] = np.isin(np.char.lower(np.char.strip(employment[other])), SALARIED_LABELS)
+    return ~salaried
+
+
+def score_batch(table, method="emi_capacity", policy=None):
+    """
+    Score every applicant in `table`.
+
+    Required columns: age, employment_type, monthly_income, monthly_expenses
+    plus tenure_years for method "emi_capacity" (optional for "multiplier").
+
+    `policy` defaults to the active policy table; it is read once, so a
+    hot reload never changes the rules halfway through a batch.
+
+    Returns a dict of arrays (one entry per applicant):
+    {"eligible", "reason_code", "net_income", "eligible_emi",
+     "eligible_amount", "multiplier"}
+    Amounts are 0 for ineligible applicants.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}")
+
+    policy = policy or get_policy()
+
+    age = _column(table, "age", np.float64)
+    income = _column(table, "monthly_income", np.float64)
+    expenses = _column(table, "monthly_expenses", np.float64)
+    employment = np.where(
+        is_self_employed(_column(table, "employment_type", None)), SELF_EMPLOYED, SALARIED
+    )
+    band = policy.age_band(age)
+
+    has_tenure = _has_column(table, "tenure_years")
+    if method == "emi_capacity" and not has_tenure:
+        raise ValueError("tenure_years is required for the emi_capacity method")
+    tenure = _column(table, "tenure_years", np.float64) if has_tenure else None
+
+    net_income = income - expenses
+
+    # Reason codes, lowest priority first so higher priorities overwrite
+    reason = np.where(net_income <= 0, INSUFFICIENT_INCOME, OK)
+    if tenure is not None:
+        reason = np.where(tenure > (policy.retirement_age - age), TENURE_EXCEEDS_RETIREMENT, reason)
+    reason = np.where(policy.age_eligible[band], reason, AGE_NOT_ELIGIBLE)
+    reason = reason.astype(np.int8)
+    eligible = reason == OK
+
+    if method == "emi_capacity":
+        eligible_emi = net_income * policy.foir[employment] * policy.income_factor[employment]
+        amount = eligible_emi * policy.annuity(np.where(eligible, tenure, 0))
+        multiplier = np.zeros_like(net_income)
+    else:
+        multiplier = policy.multiplier[employment, band]
+        amount = net_income * multiplier
+        eligible_emi = np.zeros_like(net_income)
+
+    return {
+        "eligible": eligible,
+        "reason_code": reason,
+        "net_income": net_income,
+        "eligible_emi": np.where(eligible, eligible_emi, 0.0),
+        "eligible_amount": np.where(eligible, amount, 0.0),
+        "multiplier": multiplier,
+    }
+
+
+def evaluate(applicant, method="emi_capacity"):
+    """
+    Score one applicant (dict with the columns above).
+    Returns plain Python values plus the human-readable "reason".
+    """
+    policy = get_policy()
+    table = {name: [value] for name, value in applicant.items()}
+    scores = score_batch(table, method, policy)
+    result = {name: values[0].item() for name, values in scores.items()}
+    result["reason"] = REASONS[result["reason_code"]]
+    result["policy_version"] = policy.version
+    return result
+
+
+# ---------------------------
+# 3. CLI: stream a CSV in chunks
+# ---------------------------
+OUTPUT_COLUMNS = ["eligible", "reason_code", "reason", "net_income", "eligible_emi", "eligible_amount"]
+
+
+def _read_chunks(reader, chunk_size):
+    while True:
+        chunk = list(islice(reader, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+NUMERIC_COLUMNS = ("age", "monthly_income", "monthly_expenses", "tenure_years")
+
+
+def _row_is_valid(row, width, numeric):
+    if len(row) != width:
+        return False
+    try:
+        return all(np.isfinite(float(row[i])) for i in numeric)
+    except ValueError:
+        return False
+
+
+def _score_chunk(header, chunk, method, policy):
+    """
+    Score one chunk; returns (valid, scores) where valid flags the rows
+    that were scored (None = all of them). The whole chunk is scored in
+    one go; only when that fails are rows checked one by one.
+    """
+    width = len(header)
+    if all(len(row) == width for row in chunk):
+        table = dict(zip(header, zip(*chunk)))
+        try:
+            for name in NUMERIC_COLUMNS:
+                if name in table:
+                    table[name] = np.asarray(table[name], dtype=np.float64)
+            if all(np.isfinite(table[name]).all() for name in NUMERIC_COLUMNS if name in table):
+                return None, score_batch(table, method, policy)
+        except ValueError:
+            pass
+
+    numeric = [i for i, name in enumerate(header) if name in NUMERIC_COLUMNS]
+    valid = [_row_is_valid(row, width, numeric) for row in chunk]
+    rows = [row for row, ok in zip(chunk, valid) if ok]
+    if not rows:
+        return valid, None
+    return valid, score_batch(dict(zip(header, zip(*rows))), method, policy)
+
+
+def score_csv(input_path, output_path, method="emi_capacity", chunk_size=100_000):
+    """
+    Score a CSV of applicants chunk by chunk (memory bounded by chunk_size).
+    Output = input columns + eligibility columns. Returns the record count.
+    Rows with a missing or non-numeric value get reason INVALID_INPUT
+    instead of aborting the batch.
+    """
+    policy = get_policy()
+    invalid_columns = [False, INVALID_INPUT, REASONS[INVALID_INPUT], "", 0.0, 0.0]
+    total = 0
+    invalid = 0
+    with open(input_path, newline="", encoding="utf-8") as src, \
+            open(output_path, "w", newline="", encoding="utf-8") as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        header = next(reader)
+        writer.writerow(header + OUTPUT_COLUMNS)
+
+        for chunk in _read_chunks(reader, chunk_size):
+            valid, scores = _score_chunk(header, chunk, method, policy)
+            scored = iter(())
+            if scores is not None:
+                scored = (
+                    [eligible, code, REASONS[code], net_income, emi, amount]
+                    for eligible, code, net_income, emi, amount in zip(
+                        scores["eligible"].tolist(),
+                        scores["reason_code"].tolist(),
+                        np.round(scores["net_income"], 2).tolist(),
+                        np.round(scores["eligible_emi"]).tolist(),
+                        np.round(scores["eligible_amount"]).tolist(),
+                    )
+                )
+
+            if valid is None:
+                writer.writerows(row + columns for row, columns in zip(chunk, scored))
+            else:
+                writer.writerows(
+                    row + (next(scored) if ok else invalid_columns)
+                    for row, ok in zip(chunk, valid)
+                )
+                invalid += valid.count(False)
+            total += len(chunk)
+            print(f"  ✓ Scored {total} records")
+
+    if invalid:
+        print(f"  ✗ {invalid} records with invalid input (reason_code {INVALID_INPUT})")
+    return total
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch home loan eligibility scoring")
+    parser.add_argument("input_csv")
+    parser.add_argument("output_csv")
+    parser.add_argument("--method", choices=METHODS, default="emi_capacity")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = score_csv(args.input_csv, args.output_csv, args.method, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(f"Scored {count} records in {elapsed:.1f}s ({count / elapsed:,.0f} records/sec)")
@@ -0,0 +1,168 @@
+#eligibility_policy.py
+"""
+Compiled, hot-reloadable eligibility policy.
+
+The policy file (config/eligibility_policy.json, or ELIGIBILITY_POLICY_FILE)
+is compiled into lookup arrays:
+  - age band edges            → np.searchsorted gives the band index
+  - age_eligible[band]
+  - multiplier[employment, band]
+  - foir[employment], income_factor[employment]
+  - annuity_factor[tenure_years]  (loan amount per rupee of EMI)
+
+so evaluating an applicant is a handful of array lookups.
+
+get_policy() returns the active table and re-reads the file when its
+mtime changes (checked at most every POLICY_CHECK_INTERVAL seconds).
+A reload builds a complete new table and then swaps one module-level
+reference, so requests already holding the old table finish with it.
+A broken file is reported and the previous table stays active.
+"""
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from agent.telemetry import describe, inc
+
+POLICY_FILE = os.getenv(
+    "ELIGIBILITY_POLICY_FILE",
+    os.path.join(os.path.dirname(__file__), "..", "config", "eligibility_policy.json"),
+)
+POLICY_CHECK_INTERVAL = float(os.getenv("ELIGIBILITY_POLICY_CHECK_INTERVAL", "5"))
+
+# Row order of the per-employment lookup arrays
+EMPLOYMENT_TYPES = ("salaried", "self_employed")
+SALARIED, SELF_EMPLOYED = 0, 1
+
+describe("eligibility_policy_reloads_total", "Eligibility policy reload attempts")
+
+
+@dataclass(frozen=True)
+class PolicyTable:
+    version: str
+    annual_rate: float
+    retirement_age: float
+    age_band_edges: np.ndarray      # ascending lower bounds (inclusive)
+    age_eligible: np.ndarray        # [band] -> bool
+    multiplier: np.ndarray          # [employment, band] -> loan multiplier
+    foir: np.ndarray                # [employment]
+    income_factor: np.ndarray       # [employment]
+    annuity_factor: np.ndarray      # [tenure_years] -> amount per rupee of EMI
+
+    def age_band(self, age):
+        """Band index for each age."""
+        return np.searchsorted(self.age_band_edges, age, side="right") - 1
+
+    def annuity(self, tenure_years):
+        """Loan amount per rupee of EMI; table lookup for whole years."""
+        tenure_years = np.asarray(tenure_years, dtype=np.float64)
+        whole = (tenure_years == np.floor(tenure_years)) & (tenure_years >= 0) & (
+            tenure_years < len(self.annuity_factor)
+        )
+        if whole.all():
+            return self.annuity_factor[tenure_years.astype(np.int64)]
+        return _annuity_factor(self.annual_rate, tenure_years)
+
+
+def _annuity_factor(annual_rate, tenure_years):
+    monthly_rate = annual_rate / (12 * 100)
+    growth = (1 + monthly_rate) ** (np.asarray(tenure_years, dtype=np.float64) * 12)
+    return (growth - 1) / (monthly_rate * growth)
+
+
+def compile_policy(spec: dict) -> PolicyTable:
+    """Validate a policy dict and build the lookup arrays."""
+    bands = sorted(spec["age_bands"], key=lambda b: b["min_age"])
+    if not bands:
+        raise ValueError("Policy needs at least one age band")
+
+    employment = spec["employment_types"]
+    missing = [name for name in EMPLOYMENT_TYPES if name not in employment]
+    if missing:
+        raise ValueError(f"Policy is missing employment types: {missing}")
+
+    annual_rate = float(spec["annual_rate"])
+    retirement_age = float(spec["retirement_age"])
+    if annual_rate <= 0:
+        raise ValueError("annual_rate must be greater than zero")
+
+    adjustments = np.array([float(b["multiplier_adjustment"]) for b in bands])
+    base = np.array([float(employment[name]["base_multiplier"]) for name in EMPLOYMENT_TYPES])
+
+    max_tenure = int(retirement_age) + 1
+
+    return PolicyTable(
+        version=str(spec.get("version", "unversioned")),
+        annual_rate=annual_rate,
+        retirement_age=retirement_age,
+        age_band_edges=np.array([float(b["min_age"]) for b in bands]),
+        age_eligible=np.array([bool(b["eligible"]) for b in bands]),
+        multiplier=base[:, None] * adjustments[None, :],
+        foir=np.array([float(employment[name]["foir"]) for name in EMPLOYMENT_TYPES]),
+        income_factor=np.array([float(employment[name]["income_factor"]) for name in EMPLOYMENT_TYPES]),
+        annuity_factor=np.concatenate(
+            ([0.0], _annuity_factor(annual_rate, np.arange(1, max_tenure + 1)))
+        ),
+    )
+
+
+def load_policy(path: str = POLICY_FILE) -> PolicyTable:
+    with open(path, "r", encoding="utf-8") as f:
+        return compile_policy(json.load(f))
+
+
+# ---------------------------
+# Active policy + hot reload
+# ---------------------------
+_active = None
+_active_mtime = None
+_failed_mtime = None
+_last_check = 0.0
+_reload_lock = threading.Lock()
+
+
+def reload_policy(path: str = POLICY_FILE) -> PolicyTable:
+    """
+    Compile the policy file and make it active.
+    On error the current table stays active and the error is re-raised.
+    """
+    global _active, _active_mtime
+
+    with _reload_lock:
+        try:
+            mtime = os.path.getmtime(path)
+            table = load_policy(path)
+        except Exception:
+            inc("eligibility_policy_reloads_total", status="error")
+            raise
+
+        _active, _active_mtime = table, mtime   # atomic reference swap
+        inc("eligibility_policy_reloads_total", status="ok")
+        print(f"✓ Eligibility policy loaded (version={table.version})")
+        return table
+
+
+def get_policy() -> PolicyTable:
+    """Active policy table; picks up file changes without a restart."""
+    global _last_check, _failed_mtime
+
+    if _active is None:
+        return reload_policy()
+
+    now = time.monotonic()
+    if now - _last_check >= POLICY_CHECK_INTERVAL:
+        _last_check = now
+        mtime = None
+        try:
+            mtime = os.path.getmtime(POLICY_FILE)
+            if mtime not in (_active_mtime, _failed_mtime):
+                reload_policy()
+        except Exception as e:
+            _failed_mtime = mtime   # don't retry until the file changes again
+            print("[ELIGIBILITY POLICY RELOAD FAILED]", e)
+
+    return _active
@@ -6,8 +6,18 @@ validate inputs, and calculate EMI + amortization.
 
 This does NOT use LLM — this ensures deterministic behavior.
 """
+import csv
+import io
 import math
 
+# NumPy is imported inside the vectorized helpers (section 3) only: the
+# chat path (emi_tool, iter_amortization) is pure Python and this module
+# should import in milliseconds.
+
+# Bounds for what-if inputs (sweeps, full schedules)
+MAX_RATE_PCT = 50
+MAX_TENURE_MONTHS = 480
+
 # ------------------------------------
 # 1. EMI core formulas
 # ------------------------------------
@@ -82,3 +92,343 @@ def emi_tool(principal, rate, tenure_months):
         "total_interest": total_interest,
         "schedule_preview": schedule,  # LLM decides how much to show
     }
+
+
+# ------------------------------------
+# 3. Batch EMI (vectorized, offline jobs)
+# ------------------------------------
+def _round2(values):
+    """
+    Round an array to 2 decimals with the same result as Python's round().
+    np.round scales by 100 first, which can flip exact .xx5 ties, so
+    those (rare) entries are rounded one by one.
+    """
+    import numpy as np
+
+    scaled = values * 100
+    rounded = np.round(scaled) / 100
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if ties.any():
+        rounded[ties] = [round(v, 2) for v in values[ties].tolist()]
+    return rounded
+
+
+def calculate_emi_batch(principal, annual_rate_pct, tenure_months):
+    """
+    Vectorized calculate_emi().
+    Inputs are arrays (or scalars, broadcast against each other).
+
+    Returns a dict of float64 arrays:
+    {"emi", "total_payment", "total_interest"}
+    rounded to 2 decimals exactly like the scalar function.
+    """
+    import numpy as np
+
+    p, annual, n = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(principal, dtype=np.float64)),
+        np.atleast_1d(np.asarray(annual_rate_pct, dtype=np.float64)),
+        np.atleast_1d(np.asarray(tenure_months, dtype=np.int64)),
+    )
+    monthly_rate = (annual / 100) / 12
+    growth = (1 + monthly_rate) ** n
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        emi = np.where(
+            monthly_rate > 0,
+            p * monthly_rate * growth / (growth - 1),
+            p / n,
+        )
+
+    total_payment = emi * n
+    total_interest = total_payment - p
+
+    return {
+        "emi": _round2(emi),
+        "total_payment": _round2(total_payment),
+        "total_interest": _round2(total_interest),
+    }
+
+
+def amortization_matrix(principal, annual_rate_pct, tenure_months, months=None):
+    """
+    Vectorized amortization_schedule() for many loans at once.
+
+    Uses the closed-form balance after k payments of the (rounded) EMI E:
+        B_k = P * g^k - E * (g^k - 1) / r,   g = 1 + r
+    so no per-month Python loop is needed.
+
+    Returns a dict of (loans x months) arrays:
+    {"month", "opening", "emi", "interest", "principal", "closing", "mask"}
+    `months` defaults to the longest tenure; cells past a loan's own tenure
+    are 0 and False in "mask".
+    """
+    import numpy as np
+
+    p, annual, n = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(principal, dtype=np.float64)),
+        np.atleast_1d(np.asarray(annual_rate_pct, dtype=np.float64)),
+        np.atleast_1d(np.asarray(tenure_months, dtype=np.int64)),
+    )
+    emi = calculate_emi_batch(p, annual, n)["emi"]
+
+    if months is None:
+        months = int(n.max()) if n.size else 0
+
+    month = np.arange(1, months + 1)
+    r = ((annual / 100) / 12)[:, None]
+    k = (month - 1)[None, :]
+
+    growth = (1 + r) ** k
+    with np.errstate(divide="ignore", invalid="ignore"):
+        paid_factor = np.where(r > 0, (growth - 1) / r, k)
+    opening = p[:, None] * growth - emi[:, None] * paid_factor
+    interest = opening * r
+    principal_comp = emi[:, None] - interest
+    closing = opening - principal_comp
+
+    mask = month[None, :] <= n[:, None]
+
+    def masked(values):
+        return np.where(mask, _round2(values), 0.0)
+
+    return {
+        "month": month,
+        "opening": masked(opening),
+        "emi": np.where(mask, emi[:, None], 0.0),
+        "interest": masked(interest),
+        "principal": masked(principal_comp),
+        "closing": masked(closing),
+        "mask": mask,
+    }
+
+
+def emi_sweep(principal, rates, tenures_months):
+    """
+    EMI comparison grid: every (rate, tenure) pair for one principal,
+    computed in a single vectorized call.
+
+    Returns structured data (or {"error": ...} like emi_tool):
+    {
+        "principal", "rates", "tenures_months",
+        "grid": [{"rate", "tenure_months", "emi", "total_interest", "total_payment"}, ...]
+    }
+    Grid rows are ordered tenure-major (all rates for the first tenure, ...).
+    """
+    rates = sorted({float(r) for r in rates})
+    tenures_months = sorted({int(t) for t in tenures_months})
+
+    if principal <= 0:
+        return {"error": "Principal must be greater than zero."}
+
+    if not rates or any(r <= 0 for r in rates):
+        return {"error": "Rate must be greater than zero."}
+
+    if any(r > MAX_RATE_PCT for r in rates):
+        return {"error": f"Rate cannot exceed {MAX_RATE_PCT}%."}
+
+    if not tenures_months or any(t <= 0 for t in tenures_months):
+        return {"error": "Tenure must be greater than zero."}
+
+    if any(t > MAX_TENURE_MONTHS for t in tenures_months):
+        return {"error": f"Tenure cannot exceed {MAX_TENURE_MONTHS} months."}
+
+    import numpy as np
+
+    tenure_grid, rate_grid = np.meshgrid(tenures_months, rates, indexing="ij")
+    result = calculate_emi_batch(principal, rate_grid.ravel(), tenure_grid.ravel())
+
+    grid = [
+        {
+            "rate": rate,
+            "tenure_months": tenure,
+            "emi": emi,
+            "total_interest": total_interest,
+            "total_payment": total_payment,
+        }
+        for rate, tenure, emi, total_interest, total_payment in zip(
+            rate_grid.ravel().tolist(),
+            tenure_grid.ravel().tolist(),
+            result["emi"].tolist(),
+            result["total_interest"].tolist(),
+            result["total_payment"].tolist(),
+        )
+    ]
+
+    return {
+        "principal": round(principal, 2),
+        "rates": rates,
+        "tenures_months": tenures_months,
+        "grid": grid,
+    }
+
+
+# ------------------------------------
+# 4. Full schedule with what-if scenarios (streaming)
+# ------------------------------------
+SCHEDULE_COLUMNS = [
+    "month", "opening", "rate", "emi", "interest",
+    "principal", "prepayment", "closing",
+]
+
+
+def _months_to_repay(balance, annual_rate_pct, emi):
+    """Months needed to clear `balance` paying `emi` at the given rate."""
+    monthly_rate = (annual_rate_pct / 100) / 12
+    return math.ceil(
+        -math.log(1 - balance * monthly_rate / emi) / math.log(1 + monthly_rate) - 1e-9
+    )
+
+
+def iter_amortization(
+    principal,
+    annual_rate_pct,
+    tenure_months,
+    prepayments=None,
+    rate_changes=None,
+    reduce="tenure",
+):
+    """
+    Full amortization schedule, yielded one month at a time.
+
+    prepayments:  {month: amount}  part-prepayment made after that month's EMI
+    rate_changes: {month: annual_rate_pct}  new rate applied from that month
+    reduce:       what a prepayment / rate change adjusts
+                  "tenure" -> keep the EMI, the loan closes earlier (or later,
+                              up to MAX_TENURE_MONTHS in total)
+                  "emi"    -> keep the remaining tenure, recompute the EMI
+
+    Each row: {"month", "opening", "rate", "emi", "interest",
+               "principal", "prepayment", "closing"}
+    The last instalment absorbs any rounding residue so the loan closes at 0.
+
+    Inputs are validated immediately (ValueError), rows are produced lazily.
+    """
+    prepayments = {int(m): float(a) for m, a in (prepayments or {}).items()}
+    rate_changes = {int(m): float(r) for m, r in (rate_changes or {}).items()}
+
+    if principal <= 0:
+        raise ValueError("Principal must be greater than zero.")
+    if annual_rate_pct <= 0 or any(r <= 0 for r in rate_changes.values()):
+        raise ValueError("Rate must be greater than zero.")
+    if tenure_months <= 0:
+        raise ValueError("Tenure must be greater than zero.")
+    if tenure_months > MAX_TENURE_MONTHS:
+        raise ValueError(f"Tenure cannot exceed {MAX_TENURE_MONTHS} months.")
+    if any(a < 0 for a in prepayments.values()):
+        raise ValueError("Prepayment cannot be negative.")
+    if reduce not in ("tenure", "emi"):
+        raise ValueError('reduce must be "tenure" or "emi".')
+
+    return _amortization_rows(
+        float(principal), float(annual_rate_pct), int(tenure_months),
+        prepayments, rate_changes, reduce,
+    )
+
+
+def _amortization_rows(balance, rate, remaining, prepayments, rate_changes, reduce):
+    emi, _, _ = calculate_emi(balance, rate, remaining)
+    month = 0
+
+    while balance > 0.005:
+        month += 1
+
+        # Floating-rate reset
+        if month in rate_changes:
+            rate = rate_changes[month]
+            if reduce == "emi":
+                emi, _, _ = calculate_emi(balance, rate, remaining)
+
+        monthly_rate = (rate / 100) / 12
+        interest = balance * monthly_rate
+
+        # EMI no longer covers the interest → re-price over what is left
+        # (the rounded EMI then runs exactly `remaining` months, the last one
+        # absorbing the residue, so the tenure is not re-derived from it)
+        repriced = emi <= interest
+        if repriced:
+            emi, _, _ = calculate_emi(balance, rate, max(remaining, 1))
+        if month in rate_changes and reduce == "tenure" and not repriced:
+            remaining = _months_to_repay(balance, rate, emi)
+            # a rate hike never stretches the loan past MAX_TENURE_MONTHS
+            if month - 1 + remaining > MAX_TENURE_MONTHS:
+                remaining = max(MAX_TENURE_MONTHS - (month - 1), 1)
+                emi, _, _ = calculate_emi(balance, rate, remaining)
+
+        payment = emi
+        if remaining <= 1 or balance + interest <= emi:
+            payment = balance + interest  # final instalment
+
+        principal_comp = payment - interest
+        closing = balance - principal_comp
+
+        prepayment = max(0.0, min(prepayments.get(month, 0.0), closing))
+        closing -= prepayment
+        remaining -= 1
+
+        yield {
+            "month": month,
+            "opening": round(balance, 2),
+            "rate": rate,
+            "emi": round(payment, 2),
+            "interest": round(interest, 2),
+            "principal": round(principal_comp, 2),
+            "prepayment": round(prepayment, 2),
+            "closing": round(closing, 2),
+        }
+
+        balance = closing
+
+        if prepayment and balance > 0.005:
+            if reduce == "emi":
+                emi, _, _ = calculate_emi(balance, rate, remaining)
+            else:
+                remaining = _months_to_repay(balance, rate, emi)
+
+
+def summarize_schedule(rows):
+    """
+    Consume a row iterator and return totals only
+    (months, total_interest, total_prepaid, total_paid).
+    """
+    months = 0
+    total_interest = 0.0
+    total_prepaid = 0.0
+    total_paid = 0.0
+
+    for row in rows:
+        months = row["month"]
+        total_interest += row["interest"]
+        total_prepaid += row["prepayment"]
+        total_paid += row["emi"] + row["prepayment"]
+
+    return {
+        "months": months,
+        "total_interest": round(total_interest, 2),
+        "total_prepaid": round(total_prepaid, 2),
+        "total_paid": round(total_paid, 2),
+    }
+
+
+def iter_schedule_csv(rows):
+    """
+    Yield the schedule as CSV text, one line at a time
+    (header first). Suitable for streaming responses.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=SCHEDULE_COLUMNS)
+
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # header only (no rows)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def write_schedule_csv(rows, fileobj):
+    """Write the schedule to an open text file without building it in memory."""
+    for line in iter_schedule_csv(rows):
+        fileobj.write(line)
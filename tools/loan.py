@@ -27,21 +27,16 @@ def calculate_age(dob: str):
 # ---------------------------
 def determine_multiplier(employment: str, age: int):
     """
-    Employment-based + age-based multiplier adjustments.
+    Employment-based + age-based multiplier adjustments
+    (rules live in tools/eligibility.py).
     """
-    # base
-    if employment == "salaried":
-        multiplier = 60
-    else:
-        multiplier = 50
+    from tools.eligibility import evaluate  # NumPy: load only when scoring
 
-    # age adjustment
-    if age < 30:
-        multiplier *= 1.10   # +10%
-    elif age > 45:
-        multiplier *= 0.80   # -20%
-
-    return multiplier
+    decision = evaluate(
+        {"age": age, "employment_type": employment, "monthly_income": 1, "monthly_expenses": 0},
+        method="multiplier",
+    )
+    return decision["multiplier"]
 
 
 # ---------------------------
@@ -79,11 +74,23 @@ def loan_tool(
     if net_income <= 0:
         return {"error": "Net income is insufficient for eligibility."}
 
-    # Multiplier
-    multiplier = determine_multiplier(employment, age)
-
-    # Eligible amount
-    eligible_amount = net_income * multiplier
+    # Shared eligibility rules (age band, employment multiplier)
+    from tools.eligibility import evaluate  # NumPy: load only when scoring
+
+    decision = evaluate(
+        {
+            "age": age,
+            "employment_type": employment,
+            "monthly_income": income,
+            "monthly_expenses": obligations,
+        },
+        method="multiplier",
+    )
+    if not decision["eligible"]:
+        return {"error": decision["reason"]}
+
+    multiplier = decision["multiplier"]
+    eligible_amount = decision["eligible_amount"]
 
     return {
         "loan_type": loan_type,
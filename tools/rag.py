@@ -1,31 +1,38 @@
-from rag.rag_query import load_chroma
-from rag.rag_query import embed_query, retrieve_chunks, generate_answer
+import contextvars
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from agent.llm_vertex import llm_generate
+from agent.telemetry import describe, inc, span
+from rag.partitions import GENERAL, PARTITION_KEY, select_partitions
 
-# Load DB once
-collection = load_chroma()
+# rag.rag_query (Chroma + Vertex embeddings) is imported on first use.
 
-def rag_tool(query: str):
-    # 1. Embed
-    query_embedding = embed_query(query)
+# Where chunks are retrieved from:
+#   chroma      the Chroma collection (rag_query.retrieve_chunks)
+#   compressed  rag/vector_compression.py store in RAG_INDEX_DIR
+#               (truncated / quantized vectors, full-precision re-scoring)
+#   ivf         rag/ann_index.py approximate nearest-neighbour index in RAG_INDEX_DIR
+RAG_RETRIEVER = os.getenv("RAG_RETRIEVER", "chroma")
+RAG_INDEX_DIR = os.getenv("RAG_INDEX_DIR")          # default: the module's INDEX_DIR
+RAG_RESCORE = int(os.getenv("RAG_RESCORE", "4"))   # re-score k * RAG_RESCORE candidates (0 = off)
+RAG_NPROBE = int(os.getenv("RAG_NPROBE", "0"))     # IVF lists probed (0 = the index's default)
+RAG_TOP_K = 4
 
-    # 2. Retrieve chunks
-    retrieved_chunks = retrieve_chunks(collection, query_embedding, k=4)
+# Search only the product partitions a question is about (rag/partitions.py)
+RAG_PARTITIONS = os.getenv("RAG_PARTITIONS", "1") == "1"
 
-    # 3. Generate strict grounded answer
-    answer = generate_answer(query, retrieved_chunks)
-    con_answer = consolidate_answer(answer)
-    # 4. Return structured dict
-    return {
-        "answer": con_answer,
-        "sources": [
-            {"pdf_name": c["pdf_name"], "page_num": c["page_num"]}
-            for c in retrieved_chunks
-        ]
-    }
+# Threads for speculative retrieval (prefetch) started while the router runs.
+# One per turn admission lets run at once, so prefetches never queue behind
+# each other; beyond that prefetch() declines and retrieval happens inline.
+RAG_SPECULATION_WORKERS = int(os.getenv("RAG_SPECULATION_WORKERS", os.getenv("ADMISSION_MAX_IN_FLIGHT", "16")))
+_prefetch_pool = None
+_prefetch_lock = threading.Lock()
+_prefetch_pending = 0       # submitted and not finished
 
-def consolidate_answer(answer: str) -> str:
-    system_prompt = """
+CONSOLIDATE_SYSTEM_PROMPT = """
 You are a banking communication assistant.
 
 Your task is to rewrite the text below so it is clear, concise, and easy for the general public to understand.
@@ -39,15 +46,165 @@ Guidelines:
 Return only the improved answer text.
 """
 
-    prompt = f"""
-{system_prompt}
+describe("rag_partition_queries_total", "RAG retrievals per searched product partition set")
+describe("rag_partition_fallbacks_total", "Partitioned retrievals that found nothing and searched everything")
+
+# Load DB once (on first use, or during startup warm-up)
+_collection = None
+_collection_lock = threading.Lock()
+
+
+def _load_collection():
+    if RAG_RETRIEVER == "compressed":
+        from rag.vector_compression import INDEX_DIR, CompressedVectorStore
+        return CompressedVectorStore.load(RAG_INDEX_DIR or INDEX_DIR)
+    if RAG_RETRIEVER == "ivf":
+        from rag.ann_index import INDEX_DIR, IVFIndex
+        return IVFIndex.load(RAG_INDEX_DIR or INDEX_DIR)
+    if RAG_RETRIEVER != "chroma":
+        raise ValueError(f"Unknown RAG_RETRIEVER: {RAG_RETRIEVER}")
+
+    from rag.rag_query import load_chroma
+    return load_chroma()
+
+
+def get_collection():
+    global _collection
+    if _collection is None:
+        with _collection_lock:
+            if _collection is None:
+                _collection = _load_collection()
+    return _collection
+
+
+def _query_chroma(collection, query_embedding, k, where):
+    """Chroma query with a metadata filter, as chunk dicts like retrieve_chunks."""
+    result = collection.query(
+        query_embeddings=[query_embedding],
+        n_results=k,
+        where=where,
+        include=["documents", "metadatas", "distances"],
+    )
+    return [
+        {"id": chunk_id, **(metadata or {}), "content": document, "distance": distance}
+        for chunk_id, document, metadata, distance in zip(
+            result["ids"][0], result["documents"][0], result["metadatas"][0], result["distances"][0]
+        )
+    ]
+
+
+def retrieve(query_embedding, k=RAG_TOP_K, partitions=None):
+    """
+    Top-k chunks for the query embedding from the configured retriever.
+    `partitions` (product families) restricts the search to those chunks.
+    """
+    collection = get_collection()
+    if RAG_RETRIEVER == "chroma":
+        if partitions is not None:
+            return _query_chroma(collection, query_embedding, k, {PARTITION_KEY: {"$in": list(partitions)}})
+        from rag.rag_query import retrieve_chunks
+        return retrieve_chunks(collection, query_embedding, k=k)
+    if RAG_RETRIEVER == "ivf":
+        return collection.search(query_embedding, k=k, nprobe=RAG_NPROBE or None, partitions=partitions)
+    rows = collection.partition_rows(partitions) if partitions is not None else None
+    return collection.search(query_embedding, k=k, rescore=RAG_RESCORE, rows=rows)
+
+
+def rag_retrieve(query: str, flow: str | None = None):
+    """
+    Embed `query` and retrieve its chunks (steps 1-2 of rag_tool). `flow` is
+    the conversation's active or paused flow; it picks the product partition
+    when the question names no product.
+    """
+    from rag.rag_query import embed_query
+
+    # 1. Embed
+    with span("rag.embed", query_chars=len(query)):
+        query_embedding = embed_query(query)
+
+    # 2. Retrieve chunks (from the question's product partitions when known)
+    partitions = select_partitions(query, flow) if RAG_PARTITIONS else None
+    label = "+".join(p for p in partitions if p != GENERAL) if partitions else "all"
+    with span("rag.retrieve", k=RAG_TOP_K, retriever=RAG_RETRIEVER, partitions=label) as s:
+        retrieved_chunks = retrieve(query_embedding, partitions=partitions)
+        if partitions is not None and not retrieved_chunks:
+            # collection built before chunks were tagged
+            inc("rag_partition_fallbacks_total")
+            retrieved_chunks = retrieve(query_embedding)
+        s.set("results", len(retrieved_chunks))
+    inc("rag_partition_queries_total", partitions=label)
+    return retrieved_chunks
+
+
+def prefetch(query: str, flow: str | None = None):
+    """
+    Start rag_retrieve(query, flow) on a background thread (speculatively,
+    while the intent router runs). Returns a Future of the chunks, or None
+    when every prefetch thread is busy (it would only queue).
+    """
+    global _prefetch_pool, _prefetch_pending
+    with _prefetch_lock:
+        if _prefetch_pending >= RAG_SPECULATION_WORKERS:
+            return None
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(RAG_SPECULATION_WORKERS, thread_name_prefix="rag-prefetch")
+        _prefetch_pending += 1
+
+    # copy the context so the prefetch's spans join the current trace
+    future = _prefetch_pool.submit(contextvars.copy_context().run, rag_retrieve, query, flow)
+    future.add_done_callback(_prefetch_finished)
+    return future
+
+
+def _prefetch_finished(_future):
+    global _prefetch_pending
+    with _prefetch_lock:
+        _prefetch_pending -= 1
+
+
+def rag_answer(query: str, retrieved_chunks):
+    """Grounded answer and sources for `query` from retrieved chunks (steps 3-4 of rag_tool)."""
+    from rag.rag_query import generate_answer
+
+    # 3. Generate strict grounded answer
+    with span("rag.generate", context_chunks=len(retrieved_chunks)):
+        answer = generate_answer(query, retrieved_chunks)
 
+    with span("rag.consolidate", answer_chars=len(answer)):
+        con_answer = consolidate_answer(answer)
+    # 4. Return structured dict
+    return {
+        "answer": con_answer,
+        "sources": [_source(c) for c in retrieved_chunks]
+    }
+
+
+def rag_tool(query: str, flow: str | None = None):
+    """Answer `query` from the documents: rag_retrieve() then rag_answer()."""
+    return rag_answer(query, rag_retrieve(query, flow))
+
+
+def _source(chunk):
+    source = {"pdf_name": chunk["pdf_name"], "page_num": chunk["page_num"]}
+    # table chunks also carry the table / row range they cover
+    for key in ("table_index", "row_start", "row_end"):
+        if chunk.get(key) is not None:
+            source[key] = chunk[key]
+    # deduplicated chunks list every page the same text appeared on
+    pages = chunk.get("source_pages")
+    if pages:
+        source["source_pages"] = json.loads(pages) if isinstance(pages, str) else pages
+    return source
+
+def consolidate_answer(answer: str) -> str:
+    prompt = f"""
 ANSWER:
 {answer}
 """
 
     try:
-        condensed = llm_generate(prompt).strip()
+        condensed = llm_generate(prompt, call_site="rag_consolidate",
+                                 system_instruction=CONSOLIDATE_SYSTEM_PROMPT).strip()
         # Safety fallback
         return condensed if condensed else answer
     except Exception: